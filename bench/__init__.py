@@ -0,0 +1 @@
+# Benchmarks for the Game of Life application
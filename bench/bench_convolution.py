@@ -0,0 +1,60 @@
+"""Convolution crossover benchmark.
+
+Times the direct (``convolve2d``) and FFT convolution paths of the simulation
+for a range of grid and kernel sizes, and reports which one is faster. The
+output is used to tune ``FFT_CROSSOVER`` in ``sim/sim_convolution.py``.
+
+Run from the project root:
+
+    python -m bench.bench_convolution
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sim.sim_convolution import Convolver  # pylint: disable=C0413
+
+GRID_SIZES = [32, 64, 128, 256, 512, 1024]
+KERNEL_SIZES = [3, 5, 9, 15, 26]
+
+
+def time_call(fct, repeat: int = 5) -> float:
+    """Return the best wall-clock time of several calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fct()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Print a table of direct vs FFT convolution times."""
+    rng = np.random.default_rng(0)
+    direct = Convolver('direct')
+    fft = Convolver('fft')
+    auto = Convolver('auto')
+
+    print(f"{'grid':>6} {'kernel':>6} {'direct ms':>10} {'fft ms':>10} "
+          f"{'faster':>7} {'auto':>7} {'K/log2N':>8}")
+    for n in GRID_SIZES:
+        grid = rng.random((n, n))
+        for k in KERNEL_SIZES:
+            if k > n:
+                continue
+            kernel = rng.random((k, k))
+            t_direct = time_call(lambda: direct.convolve(grid, kernel, 'bench'))
+            t_fft = time_call(lambda: fft.convolve(grid, kernel, 'bench'))
+            faster = 'fft' if t_fft < t_direct else 'direct'
+            chosen = 'fft' if auto.use_fft(grid.shape, kernel.shape) else 'direct'
+            ratio = kernel.size / np.log2(grid.size)
+            print(f"{n:>6} {k:>6} {t_direct * 1e3:>10.3f} {t_fft * 1e3:>10.3f} "
+                  f"{faster:>7} {chosen:>7} {ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Ensemble stepping benchmark.
+
+Compares stepping B independent Lenia worlds one SimModel at a time with
+stepping them together in an EnsembleModel (one batched FFT per generation),
+for several ensemble sizes and grid sizes.
+
+Run from the project root:
+
+    python -m bench.bench_ensemble
+    python -m bench.bench_ensemble --members 16 256 --sizes 64
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sim.sim_ensemble import EnsembleModel  # pylint: disable=C0413
+from src.sim.sim_model import SimModel  # pylint: disable=C0413
+from src.fi.fi_model import FiModel  # pylint: disable=C0413
+
+DEFAULT_MEMBERS = [16, 64, 256]
+DEFAULT_SIZES = [64, 128]
+
+
+def time_generations(step, generations: int) -> float:
+    """Return the seconds per generation of a step function, after one warm-up call."""
+    step()
+    start = time.perf_counter()
+    for _ in range(generations):
+        step()
+    return (time.perf_counter() - start) / generations
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print a table of member generations per second for both approaches."""
+    parser = argparse.ArgumentParser(description="Benchmark batched ensemble stepping.")
+    parser.add_argument('--members', type=int, nargs='+', default=DEFAULT_MEMBERS)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--generations', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    fi_model = FiModel()
+    nhood, nhood_key = fi_model.get_con_nhood(), fi_model.get_con_nhood_key()
+    rng = np.random.default_rng(0)
+    print(f"{'members':>8} {'grid':>6} {'models gen/s':>14} {'ensemble gen/s':>15} {'speedup':>8}")
+    for size in args.sizes:
+        for members in args.members:
+            grids = rng.random((members, size, size)) * 0.5
+            growth_mu = rng.uniform(0.1, 0.2, members)
+            growth_sigma = rng.uniform(0.01, 0.03, members)
+
+            models = []
+            for grid in grids:
+                model = SimModel(conv_method='fft')
+                model.grid = grid.copy()
+                models.append(model)
+            rules = [FiModel(growth_mu=mu, growth_sigma=sigma).growth_lenia
+                     for mu, sigma in zip(growth_mu, growth_sigma)]
+
+            def step_models() -> None:
+                for model, fct in zip(models, rules):
+                    model.update(fct, nhood, 0.1, nhood_key)
+
+            ensemble = EnsembleModel(grids, growth_mu, growth_sigma, conv_method='fft', death_mass=-1)
+            t_models = time_generations(step_models, args.generations)
+            t_ensemble = time_generations(lambda: ensemble.step(nhood, nhood_key), args.generations)
+            print(f"{members:>8} {size:>6} {members / t_models:>14.1f} "
+                  f"{members / t_ensemble:>15.1f} {t_models / t_ensemble:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
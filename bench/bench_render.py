@@ -0,0 +1,122 @@
+"""Grid rendering benchmark.
+
+Compares the frames per second of the SimView rendering paths for a range of
+grid sizes drawn on a fixed canvas:
+
+- matplotlib: ``set_array`` and a full figure draw, the previous SimView path
+- blit: ``set_array``, background restore and redraw of the image artist only
+- raster: colormap lookup table into an RGB buffer and PPM encoding, with
+  grids larger than the canvas pooled down to it first (level of detail)
+
+The figure is rendered with the Agg backend, so the numbers exclude the final
+copy into the Tk window, which every path pays.
+
+Run from the project root:
+
+    python -m bench.bench_render
+    python -m bench.bench_render --sizes 100 1024 --canvas 1000
+    python -m bench.bench_render --sizes 512 8192 --paths raster
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # pylint: disable=C0413
+import numpy as np  # pylint: disable=C0413
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sim.sim_render import RasterRenderer, to_ppm  # pylint: disable=C0413
+
+DEFAULT_SIZES = [100, 256, 512, 1024, 2048]
+PATHS = ['matplotlib', 'blit', 'raster']
+
+
+def frames_per_second(draw: Callable[[np.ndarray], None], grids: List[np.ndarray],
+                      min_time: float) -> float:
+    """Draw the grids in turn for at least min_time seconds.
+
+    Returns:
+        float: Frames drawn per second
+    """
+    draw(grids[0])
+    frames = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        draw(grids[frames % len(grids)])
+        frames += 1
+        elapsed = time.perf_counter() - start
+    return frames / elapsed
+
+
+def make_drawer(path: str, size: int, canvas: int) -> Callable[[np.ndarray], None]:
+    """Create the draw function of a rendering path.
+
+    Args:
+        path (str): One of PATHS
+        size (int): Grid side in cells
+        canvas (int): Canvas side in pixels
+
+    Returns:
+        function: Draws one grid
+    """
+    if path == 'raster':
+        renderer = RasterRenderer('inferno', vmin=0, vmax=1)
+        return lambda grid: to_ppm(renderer.render(grid, (canvas, canvas)))
+
+    # Same figure setup as SimView
+    fig = plt.figure(figsize=(canvas / 100, canvas / 100), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.set_position([0, 0, 1, 1])
+    ax.set_axis_off()
+    image = ax.imshow(np.zeros((size, size)), cmap='inferno', interpolation='nearest',
+                      aspect='equal', vmin=0, vmax=1, animated=path == 'blit')
+    ax.set_xlim(-0.5, size - 0.5)
+    ax.set_ylim(-0.5, size - 0.5)
+    fig.canvas.draw()
+
+    if path == 'blit':
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+
+        def draw(grid: np.ndarray) -> None:
+            image.set_array(grid)
+            fig.canvas.restore_region(background)
+            ax.draw_artist(image)
+            fig.canvas.blit(fig.bbox)
+        return draw
+
+    def draw_full(grid: np.ndarray) -> None:
+        image.set_array(grid)
+        fig.canvas.draw()
+    return draw_full
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print a table of frames per second for each path and grid size."""
+    parser = argparse.ArgumentParser(description="Benchmark the grid rendering paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--canvas', type=int, default=800, help="canvas side in pixels")
+    parser.add_argument('--min-time', type=float, default=1.0)
+    parser.add_argument('--paths', nargs='+', choices=PATHS, default=PATHS)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    speedup = args.paths[0] != args.paths[-1]
+    print(f"{'grid':>6} " + " ".join(f"{path + ' fps':>15}" for path in args.paths)
+          + (f" {'speedup':>8}" if speedup else ""))
+    for size in args.sizes:
+        grids = [rng.random((size, size)) for _ in range(4)]
+        rates = [frames_per_second(make_drawer(path, size, args.canvas), grids, args.min_time)
+                 for path in args.paths]
+        plt.close('all')
+        print(f"{size:>6} " + " ".join(f"{rate:>15.1f}" for rate in rates)
+              + (f" {rates[-1] / rates[0]:>7.1f}x" if speedup else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""SimModel.update benchmark suite.
+
+Times ``SimModel.update`` for discrete and continuous modes, grid sizes from
+100x100 to 4096x4096 and every available engine and convolution method. For
+each case it reports generations per second, cell updates per second and the
+bytes allocated per generation (peak traced by tracemalloc), and writes the
+results as JSON so that runs on different commits can be compared.
+When a baseline file is given, cases slower than the baseline by more than the
+tolerance are flagged and the script exits with status 1.
+
+Run from the project root:
+
+    python -m bench.bench_update --output bench_results.json
+    python -m bench.bench_update --sizes 100 256 --baseline bench_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+import numpy as np
+import scipy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sim.sim_model import SimModel  # pylint: disable=C0413
+from src.fi.fi_model import FiModel  # pylint: disable=C0413
+
+DEFAULT_SIZES = [100, 256, 512, 1024, 2048, 4096]
+
+# (mode, engine, convolution method)
+CASES = [
+    ('discrete', 'convolution', 'direct'),
+    ('discrete', 'convolution', 'fft'),
+    ('discrete', 'bitboard', 'auto'),
+    ('discrete', 'hashlife', 'auto'),
+    ('discrete', 'sparse', 'auto'),
+    ('discrete', 'tiled', 'auto'),
+    ('discrete', 'buffered', 'fft'),
+    ('discrete', 'parallel', 'direct'),
+    ('discrete', 'multiprocess', 'direct'),
+    ('continuous', 'convolution', 'direct'),
+    ('continuous', 'convolution', 'fft'),
+    ('continuous', 'tiled', 'auto'),
+    ('continuous', 'buffered', 'fft'),
+    ('continuous', 'parallel', 'fft'),
+    ('continuous', 'multiprocess', 'fft'),
+]
+
+# Generations traced with tracemalloc after the timed ones
+ALLOC_GENERATIONS = 3
+
+
+def case_name(mode: str, engine: str, method: str) -> str:
+    """Return the identifier of a benchmark case."""
+    return f"{mode}/{engine}/{method}"
+
+
+def initial_grid(mode: str, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Create the initial grid of a case.
+
+    Args:
+        mode (str): 'discrete' or 'continuous'
+        size (int): Grid side in cells
+        rng (numpy.random.Generator): Random generator
+
+    Returns:
+        numpy.ndarray: Random soup, 0/1 cells for discrete mode
+    """
+    if mode == 'discrete':
+        return (rng.random((size, size)) < 0.2).astype(np.int8)
+    return rng.random((size, size))
+
+
+def run_case(mode: str,
+             engine: str,
+             method: str,
+             size: int,
+             min_time: float,
+             max_generations: int) -> Dict[str, Any]:
+    """Time one case.
+
+    One untimed generation warms up the caches, then generations are timed
+    until min_time seconds have elapsed or max_generations are done. A few more
+    generations are then traced to measure the memory allocated per step.
+
+    Returns:
+        dict: Case description and measured rates
+    """
+    fi_model = FiModel()
+    if mode == 'discrete':
+        rule = (fi_model.growth_gol, fi_model.get_dis_nhood(), 1,
+                fi_model.get_dis_nhood_key(), ('gol',))
+    else:
+        rule = (fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                fi_model.get_con_nhood_key(), ('lenia',) + fi_model.get_growth_key())
+
+    model = SimModel(size, size, conv_method=method)
+    model.set_engine(engine)
+    model.grid = initial_grid(mode, size, np.random.default_rng(0))
+    model.update(*rule)
+
+    generations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while generations < max_generations and elapsed < min_time:
+        model.update(*rule)
+        generations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    alloc_peak = 0
+    for _ in range(ALLOC_GENERATIONS):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        model.update(*rule)
+        alloc_peak = max(alloc_peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    model.close()
+
+    return {
+        'case': case_name(mode, engine, method),
+        'mode': mode,
+        'engine': engine,
+        'method': method,
+        'size': size,
+        'generations': generations,
+        'seconds': elapsed,
+        'gens_per_sec': generations / elapsed,
+        'cells_per_sec': generations * size * size / elapsed,
+        'alloc_bytes_per_step': alloc_peak,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int],
+              cases: List[tuple],
+              min_time: float,
+              max_generations: int,
+              max_step_time: float) -> Dict[str, Any]:
+    """Run all cases for all sizes.
+
+    A case is skipped for larger sizes once one of its generations takes more
+    than max_step_time seconds, since it scales at least linearly with the area.
+
+    Returns:
+        dict: 'meta' (environment) and 'results' (one entry per timed case)
+    """
+    results = []
+    for mode, engine, method in cases:
+        for size in sorted(sizes):
+            result = run_case(mode, engine, method, size, min_time, max_generations)
+            results.append(result)
+            print(f"{result['case']:<32} {size:>5}  {result['gens_per_sec']:>10.2f} gen/s "
+                  f"{result['cells_per_sec'] / 1e6:>10.2f} Mcell/s "
+                  f"{result['alloc_bytes_per_step'] / 2**20:>9.2f} MiB/step", flush=True)
+            if result['seconds'] / result['generations'] > max_step_time:
+                break
+
+    meta = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Compare a run against a baseline.
+
+    Args:
+        current (dict): Results of this run
+        baseline (dict): Results of a previous run
+        tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list: One message per regressed case
+    """
+    reference = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        previous = reference.get((result['case'], result['size']))
+        if previous is None:
+            continue
+        ratio = result['gens_per_sec'] / previous['gens_per_sec']
+        if ratio < 1 - tolerance:
+            regressions.append(f"{result['case']} {result['size']}: "
+                               f"{previous['gens_per_sec']:.2f} -> {result['gens_per_sec']:.2f} gen/s "
+                               f"({(ratio - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the benchmark suite.
+
+    Returns:
+        int: 1 if a regression was found against the baseline, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Benchmark SimModel.update.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help="case identifiers mode/engine/method, default all")
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help="seconds of timed generations per case")
+    parser.add_argument('--max-generations', type=int, default=200)
+    parser.add_argument('--max-step-time', type=float, default=2.0,
+                        help="skip larger sizes once a generation takes longer than this")
+    parser.add_argument('--output', default=None, help="JSON file for the results")
+    parser.add_argument('--baseline', default=None, help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.cases:
+        cases = [case for case in CASES if case_name(*case) in args.cases]
+
+    results = run_suite(args.sizes, cases, args.min_time, args.max_generations, args.max_step_time)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regression against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,21 @@ used in cellular automata, including growth functions and neighborhood kernels.
 
 __all__ = ['FiModel', 'FiView', 'FiController']
 
-# Import classes when accessed, not at module load time
-from .fi_model import FiModel
-from .fi_view import FiView
-from .fi_controller import FiController
+# Import classes when accessed, not at module load time, so that the models
+# can be used without loading tkinter and matplotlib (see headless.py)
+import importlib
+from typing import Any
+
+_MODULES = {
+    'FiModel': '.fi_model',
+    'FiView': '.fi_view',
+    'FiController': '.fi_controller',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the requested class from its submodule on first access."""
+    if name in _MODULES:
+        module = importlib.import_module(_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,7 +6,7 @@ and handles communications with the user settings controller. It manages updates
 to neighborhood and growth function parameters based on user interactions.
 """
 
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Optional, Tuple
 import numpy as np
 from .fi_model import FiModel
 
@@ -57,6 +57,28 @@ class FiController:
             return self.model.get_con_nhood()
         return self.model.get_dis_nhood()
 
+    def get_nhood_key(self) -> Tuple:
+        """Get the key of the neighborhood kernel returned by get_nhood.
+        
+        Returns:
+            tuple: Key identifying the kernel parameters for the current mode
+        """
+        if self.us_controller.is_mode_continuous():
+            return self.model.get_con_nhood_key()
+        return self.model.get_dis_nhood_key()
+    
+    def get_nhood_with_key(self) -> Tuple[np.ndarray, Tuple]:
+        """Get the neighborhood kernel and its key, read together.
+        
+        Use it from the stepping thread: the kernel and key read by get_nhood
+        and get_nhood_key may differ if a slider moves between the two calls.
+        
+        Returns:
+            tuple: (kernel, key) for the current mode
+        """
+        if self.us_controller.is_mode_continuous():
+            return self.model.get_con_nhood_with_key()
+        return self.model.get_dis_nhood(), self.model.get_dis_nhood_key()
     
     def get_growth_fct(self) -> Callable[[np.ndarray], np.ndarray]:
         """Get the appropriate growth function based on current mode.
@@ -68,6 +90,16 @@ class FiController:
             return self.model.growth_lenia
         return self.model.growth_gol
 
+    def get_growth_key(self) -> Tuple:
+        """Get the key of the growth function returned by get_growth_fct.
+        
+        Returns:
+            tuple: Key identifying the growth function and its parameters
+        """
+        if self.us_controller.is_mode_continuous():
+            return ('lenia',) + self.model.get_growth_key()
+        return ('gol',)
+
     def get_step(self) -> float:
         """Get the appropriate simulation step value based on current mode.
         
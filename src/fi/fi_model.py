@@ -3,11 +3,41 @@
 This module provides the implementation of the growth and neighborhood functions
 used in the cellular automata simulation. It handles both discrete (Game of Life)
 and continuous (Lenia) function implementations.
+
+The growth functions can be evaluated through lookup tables: integer neighbor
+counts index the Game of Life table directly, and the Lenia table samples the
+growth function over the window where it differs from -1, read with linear
+interpolation. The tables are rebuilt only when the growth parameters change.
+
+The continuous kernels of the recently used (mu, sigma, radius) are kept in a
+bounded LRU cache, so dragging a slider over visited values rebuilds nothing.
+The kernel is stored with its key and both are read together by
+get_con_nhood_with_key, so a stepping thread never pairs a kernel with the key
+of another while a slider moves.
 """
 
-from typing import Optional, Union
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
 import numpy as np
 
+# Game of Life growth of each neighbor count: birth (+1) at 3, survival (0) at 2,
+# death (-1) otherwise. 256 entries so that any int8/uint8 count is a valid index.
+GOL_GROWTH_LUT = np.full(256, -1, dtype=np.int8)
+GOL_GROWTH_LUT[2] = 0
+GOL_GROWTH_LUT[3] = 1
+
+# Lenia table: LENIA_LUT_SIZE intervals over growth_mu +/- LENIA_LUT_WIDTH * growth_sigma.
+# Outside the window the growth is within 2*exp(-18) of -1. Linear interpolation
+# error is at most h^2/8 * max|g''| = 36 / LENIA_LUT_SIZE^2 for the 12-sigma window.
+LENIA_LUT_SIZE = 4096
+LENIA_LUT_WIDTH = 6.0
+LENIA_LUT_ERROR = (2 * LENIA_LUT_WIDTH) ** 2 / 4 / LENIA_LUT_SIZE ** 2 \
+    + 2 * np.exp(-LENIA_LUT_WIDTH ** 2 / 2)
+
+# Number of continuous kernels kept (about 5 KiB each for radius 13)
+KERNEL_CACHE_SIZE = 64
+
 
 class FiModel:
     """Functional inputs model component.
@@ -22,7 +52,9 @@ class FiModel:
     def __init__(self,  mu: float = 0.5, 
                         sigma: float = 0.15, 
                         growth_mu: float = 0.15, 
-                        growth_sigma: float = 0.015) -> None:
+                        growth_sigma: float = 0.015,
+                        lenia_lut: bool = False,
+                        kernel_cache_size: int = KERNEL_CACHE_SIZE) -> None:
         
         """Initialize the functional input model.
         
@@ -31,13 +63,32 @@ class FiModel:
             sigma (float): Width of the kernel ring. Default is 0.15.
             growth_mu (float): Center parameter for growth function. Default is 0.15.
             growth_sigma (float): Width parameter for growth function. Default is 0.015.
+            lenia_lut (bool): Evaluate growth_lenia on arrays through the lookup
+                table (error below LENIA_LUT_ERROR). Off by default: with the
+                SIMD exp of NumPy 2 the exact function is faster.
+            kernel_cache_size (int): Number of continuous kernels kept for
+                reuse when the neighborhood parameters come back to a value.
         """
         self.mu = mu        # Center of the ring
         self.sigma = sigma  # Width of the ring
         self.growth_mu = growth_mu
         self.growth_sigma = growth_sigma
+        self.radius = 13    # Radius of the continuous kernel in cells
+        self.lenia_lut = lenia_lut
+        
+        # Lenia growth table (table, slope, (low, scale)), replaced as a whole
+        # by _update_growth_lut so that a stepping thread never mixes two tables
+        self._lenia_lut = None
+        self.growth_lut_builds = 0
+        self._lut_local = threading.local()     # Scratch arrays of each stepping thread
+        self._update_growth_lut()
         
         self.con_nhood = None
+        self.con_nhood_key = None       # Key of con_nhood, see get_con_nhood_key
+        self._nhood_lock = threading.Lock()
+        self.kernel_cache_size = max(1, kernel_cache_size)
+        self._kernels = OrderedDict()   # (mu, sigma, radius) -> kernel, oldest first
+        self.kernel_builds = 0          # Number of kernels computed, for diagnostics
         
         self.dis_nhood = np.array([ [0, 0, 0, 0, 0],
                                     [0, 1, 1, 1, 0],
@@ -45,7 +96,38 @@ class FiModel:
                                     [0, 1, 1, 1, 0],
                                     [0, 0, 0, 0, 0]], dtype=np.int8)
         self._update_con_nhood()
-        
+
+    def __getstate__(self) -> dict:
+        """Return the state to pickle, without the kernel lock and the table scratch.
+
+        The growth functions are pickled with the model by the 'multiprocess'
+        engine of SimModel.
+        """
+        state = self.__dict__.copy()
+        del state['_nhood_lock']
+        del state['_lut_local']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled model with a new kernel lock and table scratch."""
+        self.__dict__.update(state)
+        self._nhood_lock = threading.Lock()
+        self._lut_local = threading.local()
+
+    @property
+    def lenia_table(self) -> Optional[np.ndarray]:
+        """Lenia growth samples, None when the growth width is zero."""
+        return None if self._lenia_lut is None else self._lenia_lut[0]
+
+    @property
+    def lenia_slope(self) -> Optional[np.ndarray]:
+        """Slope of each interval of the Lenia table."""
+        return None if self._lenia_lut is None else self._lenia_lut[1]
+
+    @property
+    def lenia_range(self) -> Optional[Tuple[float, float]]:
+        """(low, scale): potential of the first sample and samples per unit."""
+        return None if self._lenia_lut is None else self._lenia_lut[2]
     
     def _gauss(self, 
                x: Union[float, np.ndarray], 
@@ -66,7 +148,9 @@ class FiModel:
         """
         return np.exp(-0.5 * ((x-mu)/sigma)**2)
 
-    def growth_lenia(self, u: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    def growth_lenia(self, 
+                     u: Union[float, np.ndarray], 
+                     out: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
         """Compute the Lenia growth function.
         
         The Lenia growth function is a continuous function based on a Gaussian.
@@ -74,14 +158,83 @@ class FiModel:
         
         Args:
             u (float or numpy.ndarray): Input value(s), represents the potential
+            out (numpy.ndarray, optional): Float array receiving the result, 
+                computed in place without temporary arrays. May be u itself.
             
         Returns:
             float or numpy.ndarray: Growth values ranging from -1 to 1
         """
+        if self.lenia_lut and isinstance(u, np.ndarray) and self._lenia_lut is not None:
+            return self.growth_lenia_lut(u, out)
+        if out is not None:
+            np.subtract(u, self.growth_mu, out=out)
+            out /= self.growth_sigma
+            np.square(out, out=out)
+            out *= -0.5
+            np.exp(out, out=out)
+            out *= 2
+            out -= 1
+            return out
         # Baseline -1, peak +1
         return -1 + 2 * self._gauss(u, self.growth_mu, self.growth_sigma)
+
+    def growth_lenia_lut(self, u: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Compute the Lenia growth function through the lookup table.
+        
+        The result differs from the exact function by at most LENIA_LUT_ERROR.
+        The table is read once per call and each thread uses its own scratch
+        arrays, so the engines may call it from several threads.
+        
+        Args:
+            u (numpy.ndarray): Potentials
+            out (numpy.ndarray, optional): Float array receiving the result. May be u itself.
+            
+        Returns:
+            numpy.ndarray: Growth values ranging from -1 to 1
+        """
+        lut = self._lenia_lut
+        if lut is None:
+            # Zero width: no table, the exact function handles the limit
+            return -1 + 2 * self._gauss(u, self.growth_mu, self.growth_sigma)
+        table, slopes, (low, scale) = lut
+        buffers = getattr(self._lut_local, 'buffers', None)
+        if buffers is None or buffers[0].shape != u.shape:
+            buffers = (np.empty(u.shape), np.empty(u.shape, dtype=np.intp), np.empty(u.shape))
+            self._lut_local.buffers = buffers
+        position, index, slope = buffers
+        if out is None:
+            # Same precision as the potentials, see the SimModel precision policy
+            out = np.empty(u.shape, dtype=u.dtype if u.dtype.kind == 'f' else np.float64)
+        
+        # Fractional table position, clamped to the window
+        np.subtract(u, low, out=position)
+        position *= scale
+        np.clip(position, 0, LENIA_LUT_SIZE, out=position)
+        np.copyto(index, position, casting='unsafe')
+        position -= index
+        
+        # table[i] + (position - i) * (table[i + 1] - table[i])
+        np.take(slopes, index, out=slope)
+        position *= slope
+        np.take(table, index, out=out)
+        out += position
+        return out
+
+    def _update_growth_lut(self) -> None:
+        """Rebuild the Lenia growth table for the current growth parameters."""
+        if self.growth_sigma <= 0:
+            self._lenia_lut = None
+            return
+        half_width = LENIA_LUT_WIDTH * self.growth_sigma
+        low = self.growth_mu - half_width
+        samples = low + np.arange(LENIA_LUT_SIZE + 1) * (2 * half_width / LENIA_LUT_SIZE)
+        table = -1 + 2 * self._gauss(samples, self.growth_mu, self.growth_sigma)
+        # Slope of each interval, 0 past the last sample so that u above the window reads it
+        slope = np.append(np.diff(table), 0.0)
+        self._lenia_lut = (table, slope, (low, LENIA_LUT_SIZE / (2 * half_width)))
+        self.growth_lut_builds += 1
         
-    def growth_gol(self,u : np.ndarray) -> np.ndarray:
+    def growth_gol(self, u: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
 
         """Compute the Game of Life growth function.
         
@@ -90,6 +243,8 @@ class FiModel:
         
         Args:
             u (float or numpy.ndarray): Input value(s), represents the number of neighbors
+            out (numpy.ndarray, optional): Float array receiving the result, 
+                computed in place without temporary arrays. May be u itself.
             
         Returns:
             float or numpy.ndarray: Growth values where:
@@ -97,6 +252,18 @@ class FiModel:
                 - Negative values indicate death
                 - Value magnitude indicates the strength of the change
         """
+        if isinstance(u, np.ndarray) and u.dtype in (np.int8, np.uint8):
+            # Integer counts: a single gather, no masks
+            return np.take(GOL_GROWTH_LUT, u.view(np.uint8), out=out)
+        if out is not None:
+            # Same values for integer counts without boolean masks:
+            # clip(1.5 - 2|u - 2.75|) is 1 for u = 3, 0 for u = 2, -1 otherwise
+            np.subtract(u, 2.75, out=out)
+            np.abs(out, out=out)
+            out *= -2
+            out += 1.5
+            np.clip(out, -1, 1, out=out)
+            return out
         
         mask_birth = u == 3
         mask_survive = (u == 2) | (u == 3)
@@ -113,15 +280,31 @@ class FiModel:
         """Update the continuous neighborhood kernel.
         
         Generates a 2D Gaussian ring pattern based on the current mu and sigma values.
-        The kernel is normalized so the sum of all elements equals 1.
+        The kernel is normalized so the sum of all elements equals 1. Kernels
+        are shared through the cache, so the array is read-only. The key of the
+        kernel is stored with it.
         """
-        r = 13
+        key = (self.mu, self.sigma, self.radius)
+        kernel = self._kernels.get(key)
+        if kernel is not None:
+            self._kernels.move_to_end(key)
+            self.con_nhood, self.con_nhood_key = kernel, ('continuous',) + key
+            return
+
+        r = self.radius
         y, x = np.ogrid[-r:r, -r:r]
         distance = np.sqrt((1+x)**2 + (1+y)**2) / r
 
-        self.con_nhood = self._gauss(distance, self.mu, self.sigma)
-        self.con_nhood[distance > 1] = 0               # Cut at d=1
-        self.con_nhood = self.con_nhood / np.sum(self.con_nhood)     # Normalize
+        kernel = self._gauss(distance, self.mu, self.sigma)
+        kernel[distance > 1] = 0               # Cut at d=1
+        kernel = kernel / np.sum(kernel)       # Normalize
+        kernel.flags.writeable = False
+        self.kernel_builds += 1
+
+        self._kernels[key] = kernel
+        if len(self._kernels) > self.kernel_cache_size:
+            self._kernels.popitem(last=False)
+        self.con_nhood, self.con_nhood_key = kernel, ('continuous',) + key
 
 
     def get_con_nhood(self) -> np.ndarray:
@@ -132,6 +315,28 @@ class FiModel:
         """
         return self.con_nhood
     
+    def get_con_nhood_key(self) -> Tuple[str, float, float, int]:
+        """Get a key identifying the current continuous neighborhood kernel.
+        
+        The key changes exactly when the kernel is rebuilt, so it can be used
+        to cache data derived from the kernel (e.g. its Fourier transform).
+        Read from another thread than set_nhood_params, use
+        get_con_nhood_with_key so that the key matches the kernel.
+        
+        Returns:
+            tuple: ('continuous', mu, sigma, radius)
+        """
+        return self.con_nhood_key
+
+    def get_con_nhood_with_key(self) -> Tuple[np.ndarray, Tuple[str, float, float, int]]:
+        """Get the continuous kernel and its key, read together.
+        
+        Returns:
+            tuple: (kernel, key), see get_con_nhood and get_con_nhood_key
+        """
+        with self._nhood_lock:
+            return self.con_nhood, self.con_nhood_key
+
     def get_dis_nhood(self) -> np.ndarray:
         """Get the discrete neighborhood kernel.
         
@@ -140,6 +345,14 @@ class FiModel:
         """
         return self.dis_nhood
 
+    def get_dis_nhood_key(self) -> Tuple[str]:
+        """Get a key identifying the discrete neighborhood kernel.
+        
+        Returns:
+            tuple: ('discrete',), the discrete kernel never changes
+        """
+        return ('discrete',)
+
     def set_nhood_params(self, mu: Optional[float] = None, sigma: Optional[float] = None) -> None:
         """Set the parameters for the continuous neighborhood.
         
@@ -150,12 +363,21 @@ class FiModel:
             mu (float, optional): New center value for the ring. If None, keeps current value.
             sigma (float, optional): New width value for the ring. If None, keeps current value.
         """
-        if mu is not None:
-            self.mu = float(mu)
-            
-        if sigma is not None:
-            self.sigma = float(sigma)
-        self._update_con_nhood()
+        with self._nhood_lock:
+            if mu is not None:
+                self.mu = float(mu)
+
+            if sigma is not None:
+                self.sigma = float(sigma)
+            self._update_con_nhood()
+
+    def get_growth_key(self) -> Tuple[float, float]:
+        """Get a key identifying the current growth function parameters.
+        
+        Returns:
+            tuple: (growth_mu, growth_sigma)
+        """
+        return (self.growth_mu, self.growth_sigma)
 
     def set_growth_params(self, 
                           g_mu: Optional[float] = None, 
@@ -174,6 +396,7 @@ class FiModel:
             
         if g_sigma is not None:
             self.growth_sigma = float(g_sigma)
+        self._update_growth_lut()
         
         
 
@@ -6,7 +6,7 @@ UI representation and user interaction with both discrete (Game of Life) and
 continuous (Lenia) functions.
 """
 
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -21,7 +21,7 @@ class FiView:
     This class represents the view component for the functional input module.
     It manages the visualization of neighborhood kernels and growth functions.
     """
-    def __init__(self, master: Any) -> None:
+    def __init__(self, master: Any, metrics: Optional[Any] = None) -> None:
         """Initialize the functional input view.
         
         Creates a frame with two visualization plots:
@@ -30,6 +30,8 @@ class FiView:
         
         Args:
             master: The parent tkinter container widget
+            metrics (Metrics, optional): Timings of the 'fi_draw' phase, the
+                canvas redraws, most of them triggered by the slider callbacks
         """
         # Main frame
         self.frame = ttk.Frame(master)
@@ -58,6 +60,9 @@ class FiView:
         # Single canvas for both graphs
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky='nsew')
+        if metrics is not None:
+            # draw_idle only schedules a redraw: time the redraw itself
+            self.canvas.draw = metrics.timed('fi_draw', self.canvas.draw)
         
         # Initialize kernel graph
         empty_kernel = np.zeros((26, 26))
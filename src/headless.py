@@ -0,0 +1,324 @@
+"""Game of Life headless runner module.
+
+This is the entry point for running simulations without a display. It builds
+the simulation from SimModel and FiModel only, advances it as fast as the
+selected engine allows, and writes the final state and per-generation
+statistics to disk. The whole trajectory can also be recorded into a
+memory-mapped file and played back later with replay.py. Neither tkinter nor
+matplotlib is imported on this path.
+
+Example:
+    python headless.py --mode continuous --pattern 1 --generations 500 --output runs/orbium
+    python headless.py --generations 10000 --record runs/gol.traj --record-every 10
+    python headless.py --width 1024 --height 1024 --generations 500 --profile 50
+"""
+
+import argparse
+import csv
+import functools
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from sim.sim_model import SimModel
+from fi.fi_model import FiModel
+from sim.sim_patterns import PatternLibrary, parse_pattern
+from sim.sim_metrics import Metrics
+from sim.sim_profile import ProfileCapture, capture_name
+
+STAT_FIELDS = ['generation', 'mass', 'alive', 'step_time', 'active_tiles']
+
+
+def build_models(width: int = 100,
+                 height: int = 100,
+                 continuous: bool = False,
+                 pattern: Union[int, str] = 0,
+                 alive_prob: float = 0.2,
+                 mu: float = 0.5,
+                 sigma: float = 0.15,
+                 growth_mu: float = 0.15,
+                 growth_sigma: float = 0.015,
+                 engine: Optional[str] = None,
+                 workers: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 precision: str = 'float64') -> Dict[str, Any]:
+    """Create and initialize the models of a headless run.
+
+    Args:
+        width (int): Grid width in cells (discrete patterns only)
+        height (int): Grid height in cells (discrete patterns only)
+        continuous (bool): True for Lenia, False for the Game of Life
+        pattern (int or str): Pattern selector passed to reset_discrete/reset_continuous,
+            or name of a pattern of the library
+        alive_prob (float): Initial probability for a cell to be alive
+        mu (float): Center of the kernel ring
+        sigma (float): Width of the kernel ring
+        growth_mu (float): Center of the growth function
+        growth_sigma (float): Width of the growth function
+        engine (str, optional): SimModel engine, defaults to 'bitboard' in
+            discrete mode and 'convolution' in continuous mode
+        workers (int, optional): Threads of the 'parallel' engine and
+            processes of the 'multiprocess' engine
+        seed (int, optional): Seed of the random initial grid
+        precision (str): Precision of continuous grids, see SimModel.PRECISIONS
+
+    Returns:
+        dict: The 'sim' and 'fi' models
+    """
+    if seed is not None:
+        np.random.seed(seed)
+
+    fi_model = FiModel(mu, sigma, growth_mu, growth_sigma)
+    sim_model = SimModel(width, height, alive_prob, workers=workers, precision=precision)
+    if engine is None:
+        engine = 'convolution' if continuous else 'bitboard'
+    sim_model.set_engine(engine)
+
+    if continuous:
+        sim_model.reset_continuous(pattern)
+    else:
+        sim_model.reset_discrete(pattern)
+    if sim_model.get_grid() is None:
+        raise ValueError(f"Unknown pattern: {pattern}")
+    return {'sim': sim_model, 'fi': fi_model}
+
+
+def run(generations: int,
+        continuous: bool = False,
+        output_dir: Optional[str] = None,
+        record: Optional[str] = None,
+        record_every: int = 1,
+        metrics: Optional[str] = None,
+        metrics_every: int = 100,
+        profile: Optional[int] = None,
+        profile_dir: Optional[str] = None,
+        **kwargs: Any) -> Dict[str, Any]:
+    """Run a simulation without display.
+
+    Args:
+        generations (int): Number of generations to compute
+        continuous (bool): True for Lenia, False for the Game of Life
+        output_dir (str, optional): Directory where the results are written
+        record (str, optional): Trajectory file recording the run, see sim_record
+        record_every (int): Record one generation out of record_every
+        metrics (str, optional): JSON-lines file the phase timings are appended
+            to, see sim_metrics
+        metrics_every (int): Generations between two metrics lines, a last
+            line is written at the end of the run
+        profile (int, optional): Number of first generations captured with
+            cProfile and tracemalloc, see sim_profile
+        profile_dir (str, optional): Directory of the profile capture files,
+            output_dir by default, else the current directory
+        **kwargs: Model settings, see build_models
+
+    Returns:
+        dict: 'grid' (final state), 'stats' (one dict per generation),
+            'config' (run settings), 'elapsed' (seconds spent stepping) and
+            'worker_times' (per-worker compute and wait seconds of the
+            'multiprocess' engine, empty otherwise), plus 'profile' (paths of
+            the capture files) with a profile
+    """
+    models = build_models(continuous=continuous, **kwargs)
+    sim_model = models['sim']
+    fi_model = models['fi']
+
+    # Same rule selection as FiController, without the user settings controller
+    if continuous:
+        fct = fi_model.growth_lenia
+        nhood, nhood_key = fi_model.get_con_nhood_with_key()
+        growth_key = ('lenia',) + fi_model.get_growth_key()
+        step = 0.1
+    else:
+        fct = fi_model.growth_gol
+        nhood = fi_model.get_dis_nhood()
+        nhood_key = fi_model.get_dis_nhood_key()
+        growth_key = ('gol',)
+        step = 1
+
+    if record is not None:
+        metadata = {
+            'mode': 'continuous' if continuous else 'discrete',
+            'engine': sim_model.engine,
+            'fi': {'mu': fi_model.mu, 'sigma': fi_model.sigma,
+                   'growth_mu': fi_model.growth_mu, 'growth_sigma': fi_model.growth_sigma},
+        }
+        metadata['precision'] = sim_model.precision
+        # Cells stored in the grid dtype: uint8 or the storage dtype of the precision
+        sim_model.start_recording(record, record_every, metadata)
+
+    timings = sim_model.metrics = Metrics(enabled=metrics is not None)
+    metrics_file = open(metrics, 'a', encoding='utf-8') if metrics is not None else None  # pylint: disable=R1732
+    context = {'mode': 'continuous' if continuous else 'discrete', 'engine': sim_model.engine}
+
+    update = sim_model.update
+    capture = None
+    if profile is not None:
+        name = capture_name(context['mode'], sim_model.get_grid().shape,
+                            {'mu': fi_model.mu, 'sigma': fi_model.sigma,
+                             'gmu': fi_model.growth_mu, 'gsigma': fi_model.growth_sigma})
+        capture = ProfileCapture(profile, profile_dir or output_dir or '.', name)
+        update = functools.partial(capture.call, sim_model.update)
+
+    stats: List[Dict[str, Any]] = []
+    worker_times: List[Dict[str, Any]] = []
+    elapsed = 0.0
+    for generation in range(1, generations + 1):
+        start = time.perf_counter()
+        with timings.phase('step'):
+            update(fct, nhood, step, nhood_key, growth_key)
+        step_time = time.perf_counter() - start
+        elapsed += step_time
+        timings.count_generations(1)
+        if metrics_file is not None and (generation % metrics_every == 0 or generation == generations):
+            timings.export(metrics_file, generation=generation,
+                           shape=list(sim_model.get_grid().shape), **context)
+
+        grid = sim_model.get_grid()
+        stats.append({
+            'generation': generation,
+            'mass': float(grid.sum()),
+            'alive': int(np.count_nonzero(grid)),
+            'step_time': step_time,
+            'active_tiles': sim_model.get_active_tiles()[0] if sim_model.engine == 'tiled' else '',
+        })
+        if sim_model.engine == 'multiprocess':
+            step_times = sim_model.get_worker_times()
+            if not worker_times:
+                worker_times = [dict(times, compute=0.0, wait=0.0) for times in step_times]
+            for total, times in zip(worker_times, step_times):
+                total['compute'] += times['compute']
+                total['wait'] += times['wait']
+    sim_model.close()
+    if metrics_file is not None:
+        metrics_file.close()
+    profile_paths = None
+    if capture is not None:
+        # A run shorter than the capture is saved as is
+        capture.finish()
+        profile_paths = capture.save()
+
+    config = dict(kwargs, generations=generations, continuous=continuous,
+                  engine=sim_model.engine)
+    result = {'grid': sim_model.get_grid(), 'stats': stats, 'config': config, 'elapsed': elapsed,
+              'worker_times': worker_times}
+    if profile_paths is not None:
+        result['profile'] = profile_paths
+    if output_dir is not None:
+        save_results(result, output_dir)
+    return result
+
+
+def save_results(result: Dict[str, Any], output_dir: str) -> None:
+    """Write the results of a run to a directory.
+
+    Creates 'final_state.npy', 'stats.csv' and 'run.json'.
+
+    Args:
+        result (dict): Result returned by run
+        output_dir (str): Destination directory, created if needed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, 'final_state.npy'), result['grid'])
+
+    with open(os.path.join(output_dir, 'stats.csv'), 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=STAT_FIELDS)
+        writer.writeheader()
+        writer.writerows(result['stats'])
+
+    summary = {
+        'config': result['config'],
+        'elapsed': result['elapsed'],
+        'generations_per_second': len(result['stats']) / result['elapsed'] if result['elapsed'] else None,
+        'worker_times': result.get('worker_times', []),
+    }
+    with open(os.path.join(output_dir, 'run.json'), 'w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=2)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run a Game of Life / Lenia simulation without display.")
+    parser.add_argument('--width', type=int, default=100, help="grid width in cells")
+    parser.add_argument('--height', type=int, default=100, help="grid height in cells")
+    parser.add_argument('--mode', choices=['discrete', 'continuous'], default='discrete')
+    parser.add_argument('--pattern', type=parse_pattern, default=0,
+                        help="discrete: 0 random, 1 planner; continuous: 0 stain, 1 orbium; "
+                             "or a pattern name, see --list-patterns")
+    parser.add_argument('--list-patterns', action='store_true',
+                        help="list the patterns of the library and exit")
+    parser.add_argument('--alive-prob', type=float, default=0.2)
+    parser.add_argument('--mu', type=float, default=0.5)
+    parser.add_argument('--sigma', type=float, default=0.15)
+    parser.add_argument('--growth-mu', type=float, default=0.15)
+    parser.add_argument('--growth-sigma', type=float, default=0.015)
+    parser.add_argument('--generations', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--engine', choices=SimModel.ENGINES, default=None)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="threads or processes of the parallel and multiprocess engines, "
+                             "default the number of CPUs")
+    parser.add_argument('--precision', choices=list(SimModel.PRECISIONS), default='float64',
+                        help="storage precision of continuous grids")
+    parser.add_argument('--output', default='headless_output', help="output directory")
+    parser.add_argument('--record', default=None, help="trajectory file recording the run")
+    parser.add_argument('--record-every', type=int, default=1,
+                        help="record one generation out of RECORD_EVERY")
+    parser.add_argument('--metrics', default=None,
+                        help="JSON-lines file the phase timings are appended to")
+    parser.add_argument('--metrics-every', type=int, default=100,
+                        help="generations between two metrics lines")
+    parser.add_argument('--profile', type=int, default=None, metavar='N',
+                        help="capture the first N generations with cProfile and tracemalloc")
+    parser.add_argument('--profile-dir', default=None,
+                        help="directory of the profile capture files, the output directory by default")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the headless runner."""
+    args = parse_args(argv)
+    if args.list_patterns:
+        library = PatternLibrary()
+        for name in library.names():
+            info = library.info(name)
+            period = f", period {info['period']}" if info['period'] else ""
+            print(f"{name}: {info['kind']}, {info['width']}x{info['height']}{period}")
+        return
+    result = run(args.generations,
+                 continuous=args.mode == 'continuous',
+                 output_dir=args.output,
+                 width=args.width,
+                 height=args.height,
+                 pattern=args.pattern,
+                 alive_prob=args.alive_prob,
+                 mu=args.mu,
+                 sigma=args.sigma,
+                 growth_mu=args.growth_mu,
+                 growth_sigma=args.growth_sigma,
+                 engine=args.engine,
+                 workers=args.workers,
+                 seed=args.seed,
+                 precision=args.precision,
+                 record=args.record,
+                 record_every=args.record_every,
+                 metrics=args.metrics,
+                 metrics_every=args.metrics_every,
+                 profile=args.profile,
+                 profile_dir=args.profile_dir)
+    rate = args.generations / result['elapsed'] if result['elapsed'] else float('inf')
+    print(f"{args.generations} generations in {result['elapsed']:.3f} s "
+          f"({rate:.1f} gen/s), results in {args.output}")
+    if 'profile' in result:
+        print(f"Profile in {result['profile']['pstats']} and {result['profile']['tracemalloc']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Lenia (continuous) cellular automata with a configurable user interface.
 
 import tkinter as tk
 from sim import SimView, SimController
+from sim.sim_metrics import Metrics
 from fi import FiView, FiController
 from us import UsView, UsController
 from wm import WindowManager
@@ -19,6 +20,9 @@ def main() -> None:
     grid_size = 100  # Grid size in cells
     panel_width = 300  # Control panel width in pixels
     
+    # Phase timings, recorded while the metrics overlay is shown
+    metrics = Metrics()
+    
     # Creation of the main window
     root = tk.Tk()
     window_manager = WindowManager(root, grid_size, panel_width)
@@ -28,12 +32,13 @@ def main() -> None:
     us_controller = UsController(us_view)
     
     # Initialization of the influence functions MVC
-    fi_view = FiView(window_manager.get_control_frame())
+    fi_view = FiView(window_manager.get_control_frame(), metrics)
     fi_controller = FiController(fi_view, us_controller)
     
     # Initialization of the simulation MVC
-    sim_view = SimView(root, grid_size, grid_size)
-    sim_controller = SimController(sim_view, root, us_controller, fi_controller)
+    sim_view = SimView(root, grid_size, grid_size, metrics=metrics)
+    sim_controller = SimController(sim_view, root, us_controller, fi_controller,
+                                   discrete_engine='bitboard', metrics=metrics)
     
     # Placement of views in the interface
     window_manager.place_views(sim_view, us_view, fi_view)
@@ -43,6 +48,7 @@ def main() -> None:
     
     # Configuration for proper application closure
     def on_closing() -> None:
+        sim_controller.stop()
         root.quit()
         root.destroy()
     
@@ -0,0 +1,83 @@
+"""Game of Life trajectory replay module.
+
+This is the entry point for playing back a run recorded with
+``headless.py --record`` (see sim_record). The file is memory-mapped, so runs
+larger than the memory can be replayed, at any frame rate and stride.
+
+Keys: space pauses, Left/Right step one frame back/forward, Home/End jump to
+the first/last frame, Up/Down double/halve the frame rate.
+
+Example:
+    python replay.py runs/gol.traj --fps 60 --stride 10 --loop
+"""
+
+import argparse
+import tkinter as tk
+from typing import List, Optional
+from sim.sim_view import SimView
+from sim.sim_record import TrajectoryReplayer
+from sim.sim_replay import ReplayController
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Replay a recorded Game of Life / Lenia run.")
+    parser.add_argument('path', help="trajectory file written by headless.py --record")
+    parser.add_argument('--fps', type=float, default=30.0, help="frames displayed per second")
+    parser.add_argument('--stride', type=int, default=1,
+                        help="frame increment, e.g. 10 to skip 9 frames out of 10")
+    parser.add_argument('--start', type=int, default=0, help="first frame index")
+    parser.add_argument('--loop', action='store_true', help="restart after the last frame")
+    parser.add_argument('--size', type=int, default=800, help="window side in pixels")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the replay window."""
+    args = parse_args(argv)
+    replayer = TrajectoryReplayer(args.path)
+
+    root = tk.Tk()
+    root.geometry(f"{args.size}x{args.size}")
+    root.grid_columnconfigure(0, weight=1)
+    root.grid_rowconfigure(0, weight=1)
+    view = SimView(root, args.size, args.size)
+    view.get_canvas().grid(row=0, column=0, sticky='nsew')
+
+    controller = ReplayController(view, root, replayer, args.fps, args.stride, args.loop)
+    controller.index = min(max(args.start, 0), max(len(replayer) - 1, 0))
+
+    def show_title() -> None:
+        root.title(f"Replay {args.path} - generation {replayer.generation(controller.index)}"
+                   f" ({controller.index + 1}/{len(replayer)}, {controller.fps:g} fps)")
+        root.after(250, show_title)
+
+    root.bind('<space>', lambda event: controller.toggle_pause())
+    root.bind('<Left>', lambda event: controller.seek(controller.index - 1))
+    root.bind('<Right>', lambda event: controller.seek(controller.index + 1))
+    root.bind('<Home>', lambda event: controller.seek(0))
+    root.bind('<End>', lambda event: controller.seek(len(replayer) - 1))
+    root.bind('<Up>', lambda event: controller.set_fps(controller.fps * 2))
+    root.bind('<Down>', lambda event: controller.set_fps(controller.fps / 2))
+
+    def on_closing() -> None:
+        controller.stop()
+        replayer.close()
+        root.quit()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_closing)
+    controller.run()
+    show_title()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,21 @@ including model, view, and controller components for managing the grid state and
 
 __all__ = ['SimModel', 'SimView', 'SimController']
 
-# Import classes when accessed, not at module load time
-from .sim_model import SimModel
-from .sim_view import SimView
-from .sim_controller import SimController 
+# Import classes when accessed, not at module load time, so that the models
+# can be used without loading tkinter and matplotlib (see headless.py)
+import importlib
+from typing import Any
+
+_MODULES = {
+    'SimModel': '.sim_model',
+    'SimView': '.sim_view',
+    'SimController': '.sim_controller',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the requested class from its submodule on first access."""
+    if name in _MODULES:
+        module = importlib.import_module(_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,11 +4,29 @@ This module provides the controller component for the simulation module.
 It coordinates interactions between the model (SimModel) and view (SimView) components,
 managing the simulation loop, handling updates at the appropriate speed based on
 user settings, and responding to events from the user interface and function inputs
-controllers.
+controllers. The model is stepped by a background worker (SimWorker) and the view
+only displays the latest finished frame. Every frame is also kept in a compressed
+history (see sim_history) so that the user can step back or seek to a generation.
+Once the run settles into a still life or an oscillator (see sim_cycle), the
+controller pauses it or serves the frames of the cycle instead of computing them.
+The phases of each frame can be timed (see sim_metrics), shown in the metrics
+overlay of the user settings and exported as JSON lines. On request, the next
+steps and displays are captured with cProfile and tracemalloc (see sim_profile)
+while the application keeps running.
 """
 
-from typing import Any
+import time
+from typing import Any, Hashable, Optional
+import numpy as np
 from .sim_model import SimModel
+from .sim_worker import SimWorker
+from .sim_history import DEFAULT_MAX_BYTES, History
+from .sim_cycle import DEFAULT_MAX_PERIOD, CycleDetector
+from .sim_metrics import Metrics, format_overlay
+from .sim_profile import ProfileCapture, capture_name
+
+# Seconds between two refreshes of the metrics overlay and export
+METRICS_INTERVAL = 0.5
 
 
 class SimController:
@@ -17,8 +35,31 @@ class SimController:
     This class coordinates the simulation model and view components.
     It manages the simulation loop, handles updates at the appropriate speed,
     and responds to user interface events from other controllers.
+    
+    Stepping runs in a background thread at the speed set by the user, while
+    the Tk event loop polls for new frames at display rate, so a slow step does
+    not freeze the user interface.
+    
+    What happens once a cycle is confirmed depends on the cycle action:
+    - 'none': nothing, the cycle is only shown with the generation
+    - 'pause': the simulation is paused
+    - 'replay': the frames are served from the stored cycle, not computed
     """
-    def __init__(self, view: Any, root: Any, us_controller: Any, fi_controller: Any) -> None:
+    CYCLE_ACTIONS = ('none', 'pause', 'replay')
+
+    def __init__(self, 
+                 view: Any, 
+                 root: Any, 
+                 us_controller: Any, 
+                 fi_controller: Any, 
+                 discrete_engine: str = 'convolution',
+                 continuous_engine: str = 'convolution',
+                 history_bytes: int = DEFAULT_MAX_BYTES,
+                 cycle_action: str = 'replay',
+                 cycle_max_period: int = DEFAULT_MAX_PERIOD,
+                 metrics: Optional[Metrics] = None,
+                 metrics_path: Optional[str] = None,
+                 profile_dir: str = 'profiles') -> None:
         """Initialize the simulation controller.
         
         Args:
@@ -26,59 +67,258 @@ class SimController:
             root: Main Tkinter window
             us_controller: UsController instance
             fi_controller: FiController instance
+            discrete_engine (str): Engine used in discrete mode, one of
+                SimModel.ENGINES
+            continuous_engine (str): Engine used in continuous mode, any engine but
+                'bitboard', 'hashlife' and 'sparse', which only implement the Game of Life
+            history_bytes (int): Memory cap of the frame history, 0 to disable it
+            cycle_action (str): Action once a cycle is confirmed, one of
+                SimController.CYCLE_ACTIONS
+            cycle_max_period (int): Longest cycle period detected, in generations
+            metrics (Metrics, optional): Phase timings shared with the views,
+                recorded while the metrics overlay is shown
+            metrics_path (str, optional): JSON-lines file the metrics are
+                appended to every METRICS_INTERVAL, recording them all along
+            profile_dir (str): Directory of the profile captures, see start_profile
         """
-        self.model = SimModel()
+        if cycle_action not in self.CYCLE_ACTIONS:
+            raise ValueError(f"Unknown cycle action: {cycle_action}")
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.model = SimModel(metrics=self.metrics)
         self.view = view
         self.root = root
         self.us_controller = us_controller
         self.fi_controller = fi_controller
         self.min_delay = 16  # ~60 FPS maximum (1000/60 ≈ 16.67ms)
         self.update_timer = None
+        self.discrete_engine = discrete_engine
+        self.continuous_engine = continuous_engine
+        self.history = History(history_bytes)
+        self.cycle_action = cycle_action
+        self.cycles = CycleDetector(cycle_max_period)
+        self._paused_cycle = None   # (start, period) of the cycle that paused the run
+        self.metrics_file = open(metrics_path, 'a', encoding='utf-8') if metrics_path else None  # pylint: disable=R1732
+        self._metrics_time = 0.0
+        self.profile_dir = profile_dir
+        self.profile = None   # Active ProfileCapture, see start_profile
+        self.worker = SimWorker(self.step, self.us_controller.get_speed,
+                                self.us_controller.is_running,
+                                self.us_controller.get_generations_per_frame,
+                                self.us_controller.is_adaptive_generations)
         
     def run(self) -> None:
         """Start the simulation.
         
         Initializes the grid based on the current mode (continuous or discrete),
-        updates the display, and starts the update timer to begin the simulation loop.
+        starts the stepping worker and the update timer that displays its frames.
         """
         # Check mode (continuous or discrete) for initialization
         self.reset()
         
-        # Initial display update
-        self.view.update_display(self.model.get_grid())
+        # Start stepping in the background
+        self.worker.start()
         
         # Start the update timer
         self.update()
 
     def update(self) -> None:
-        """Update the model and view if the simulation is running."""
+        """Display the latest frame of the worker, called at display rate."""
         # Check if a reset is requested
         if self.us_controller.model.acknowledge_reset():
             # Check the mode (continuous or discrete) for reset
             self.reset()
-            self.view.update_display(self.model.get_grid())
         
-        # Update the simulation if it's running
-        if self.us_controller.is_running():
-
-            self.model.update(
-                self.fi_controller.get_growth_fct(),
-                self.fi_controller.get_nhood(),
-                self.fi_controller.get_step())
-            
-            # Update the display
-            self.view.update_display(self.model.get_grid())
+        # Check if a step back or a seek is requested
+        request = self.us_controller.model.acknowledge_seek()
+        if request is not None:
+            self.seek(*request)
+        
+        # Check if a profile capture is requested
+        calls = self.us_controller.model.acknowledge_profile()
+        if calls is not None:
+            self.start_profile(calls)
+        
+        # Only the newest frame is drawn, older ones were dropped by the slot
+        latest = self.worker.slot.take()
+        if latest is not None:
+            # Max pooling keeps isolated live cells visible on large discrete grids
+            pooling = 'mean' if self.us_controller.is_mode_continuous() else 'max'
+            if self.profile is not None:
+                self.profile.call(self.view.update_display, latest[1], pooling, counted=False)
+            else:
+                self.view.update_display(latest[1], pooling)
+            self.us_controller.show_generation(latest[0], self.cycles.period)
+        self.update_metrics()
+        self.update_profile()
+        
+        # Pause once on a newly confirmed cycle
+        cycle = (self.cycles.start, self.cycles.period)
+        if self.cycle_action == 'pause' and self.cycles.confirmed and cycle != self._paused_cycle:
+            self._paused_cycle = cycle
+            self.us_controller.pause()
         
         # Schedule the next update
-        generations_per_second = self.us_controller.get_speed()
-        delay = max(self.min_delay, int(1000 / generations_per_second))
-        self.update_timer = self.root.after(delay, self.update)
+        self.update_timer = self.root.after(self.min_delay, self.update)
+    
+    def update_metrics(self) -> None:
+        """Switch the phase timings with the overlay, refresh the overlay and export."""
+        shown = self.us_controller.is_metrics_shown()
+        enabled = shown or self.metrics_file is not None
+        if enabled != self.metrics.enabled:
+            self.metrics.reset()
+            self.metrics.enabled = enabled
+        now = time.perf_counter()
+        if not enabled or now - self._metrics_time < METRICS_INTERVAL:
+            return
+        self._metrics_time = now
+        grid = self.model.get_grid()
+        context = {'generation': self.worker.generation,
+                   'mode': 'continuous' if self.us_controller.is_mode_continuous() else 'discrete',
+                   'engine': self.model.engine,
+                   'shape': list(grid.shape) if grid is not None else None}
+        if self.metrics_file is not None:
+            snapshot = self.metrics.export(self.metrics_file, **context)
+        else:
+            snapshot = self.metrics.snapshot(**context)
+        if shown:
+            speed = None
+            if not self.us_controller.is_adaptive_generations():
+                speed = self.us_controller.get_speed() * self.us_controller.get_generations_per_frame()
+            self.us_controller.show_metrics(format_overlay(snapshot, speed))
+
+    def start_profile(self, calls: int) -> None:
+        """Capture a profile of the next steps, and of the displays meanwhile.
+        
+        The capture runs the next calls of step and update_display under
+        cProfile and traces the allocations with tracemalloc. Once calls steps
+        are captured, both turn off and update_profile writes the '.pstats' and
+        '.tracemalloc' files into profile_dir, named after the mode, the grid
+        size and the FiModel parameters. A request during a capture is ignored.
+        
+        Args:
+            calls (int): Number of steps (frames) to capture
+        """
+        if self.profile is not None:
+            return
+        fi_model = self.fi_controller.model
+        grid = self.model.get_grid()
+        name = capture_name('continuous' if self.us_controller.is_mode_continuous() else 'discrete',
+                            grid.shape if grid is not None else None,
+                            {'mu': fi_model.mu, 'sigma': fi_model.sigma,
+                             'gmu': fi_model.growth_mu, 'gsigma': fi_model.growth_sigma})
+        self.profile = ProfileCapture(calls, self.profile_dir, name)
+        self.us_controller.show_profile(f"Profiling {calls} steps...")
+    
+    def update_profile(self) -> None:
+        """Write the files of a finished profile capture, from the Tk thread."""
+        if self.profile is None or not self.profile.finished:
+            return
+        profile, self.profile = self.profile, None
+        paths = profile.save()
+        self.us_controller.show_profile(f"Saved {paths['pstats']}\n"
+                                        f"Peak traced memory: {profile.peak / 2**20:.1f} MiB")
+
+    def step(self, generations: int = 1) -> np.ndarray:
+        """Advance the model, called by the worker thread once per frame.
+        
+        The step is profiled while a profile capture is active.
+        
+        Args:
+            generations (int): Number of generations computed before the frame
+        
+        Returns:
+            numpy.ndarray: Copy of the new grid, safe to display while the
+                model keeps stepping
+        """
+        profile = self.profile
+        if profile is not None:
+            return profile.call(self._step, generations)
+        return self._step(generations)
+
+    def _step(self, generations: int) -> np.ndarray:
+        """Advance the model, see step.
+        
+        In cycle replay, the grid of the generation is taken from the stored
+        cycle when its phase is known, and computed then stored otherwise.
+        """
+        self.select_engine()
+        generation = self.worker.generation
+        target = generation + generations
+        if self.history.last_generation != generation:
+            # Stepping from a state sought in the history: drop its future
+            self.history.truncate(generation)
+        # Kernel and key read together: a slider may move while stepping
+        nhood, nhood_key = self.fi_controller.get_nhood_with_key()
+        rule_key = self.rule_key(nhood_key)
+        grid = None
+        replay = self.cycle_action == 'replay' and self.cycles.matches(rule_key)
+        if replay:
+            grid = self.cycles.frame(target)
+        if grid is not None:
+            self.model.grid = grid
+        else:
+            with self.metrics.phase('step'):
+                self.model.update(
+                    self.fi_controller.get_growth_fct(),
+                    nhood,
+                    self.fi_controller.get_step(),
+                    nhood_key,
+                    self.fi_controller.get_growth_key(),
+                    generations)
+            grid = self.model.get_grid()
+            if replay:
+                self.cycles.add(target, grid)
+            else:
+                # Rows changed since the last observed grid, if the engine knows them
+                changed_rows = None
+                if self.cycles.last_generation == generation:
+                    changed_rows = self.model.get_changed_rows()
+                self.cycles.observe(target, grid, rule_key, changed_rows)
+        self.history.push(target, grid, not self.us_controller.is_mode_continuous())
+        self.metrics.count_generations(generations)
+        return grid.copy()
+    
+    def rule_key(self, nhood_key: Optional[Hashable] = None) -> Hashable:
+        """Return a key identifying the current rule, for the cycle detection.
+        
+        Args:
+            nhood_key (hashable, optional): Key of the kernel stepped with,
+                read from the FiController by default
+        
+        Returns:
+            tuple: Mode, kernel key, growth key and time step
+        """
+        if nhood_key is None:
+            nhood_key = self.fi_controller.get_nhood_key()
+        return (self.us_controller.is_mode_continuous(),
+                nhood_key,
+                self.fi_controller.get_growth_key(),
+                self.fi_controller.get_step())
     
+    def select_engine(self) -> None:
+        """Select the model engine for the current mode.
+        
+        The bitboard, HashLife and sparse engines only implement the Game of Life rules,
+        so continuous mode has its own engine setting.
+        """
+        if self.us_controller.is_mode_continuous():
+            self.model.set_engine(self.continuous_engine)
+        else:
+            self.model.set_engine(self.discrete_engine)
+
     def stop(self) -> None:
-        """Stop the update timer."""
+        """Stop the update timer and the stepping worker."""
         if self.update_timer:
             self.root.after_cancel(self.update_timer)
             self.update_timer = None
+        self.worker.stop()
+        if self.profile is not None:
+            self.profile.cancel()
+            self.profile = None
+        self.model.close()
+        if self.metrics_file is not None:
+            self.metrics_file.close()
+            self.metrics_file = None
     
     def reset(self) -> None:
         """Reset the simulation grid.
@@ -86,8 +326,53 @@ class SimController:
         Resets the grid based on the current mode:
         - In continuous mode: Uses the numeric value to select a pattern
         - In discrete mode: Creates a random grid with the configured probability
+        
+        The worker lock is held so the reset never interleaves with a step, and
+        the new grid is published as the next frame.
         """
-        if self.us_controller.is_mode_continuous():
-            self.model.reset_continuous(self.us_controller.get_numeric_value())
-        else:
-            self.model.reset_discrete(self.us_controller.get_numeric_value())
+        with self.worker.lock:
+            if self.us_controller.is_mode_continuous():
+                self.model.reset_continuous(self.us_controller.get_numeric_value())
+            else:
+                self.model.reset_discrete(self.us_controller.get_numeric_value())
+            grid = self.model.get_grid()
+            self.cycles.clear()
+            self._paused_cycle = None
+            self.history.clear()
+            self.history.push(0, grid, not self.us_controller.is_mode_continuous())
+            self.worker.restart(grid.copy())
+
+    def seek(self, kind: str, value: int) -> None:
+        """Restore a generation from the history.
+        
+        The model continues from the restored grid, and the generations after
+        it are dropped from the history at the next step. Continuous grids are
+        restored with the quantization of the history.
+        
+        Args:
+            kind (str): 'step' to move by value stored frames (negative to go
+                back), 'generation' to go to the newest stored frame at or
+                before generation value
+            value (int): Number of frames or generation
+        """
+        with self.worker.lock:
+            generation = self.worker.generation
+            match kind:
+                case 'step':
+                    for _ in range(abs(value)):
+                        found = self.history.previous(generation) if value < 0 \
+                            else self.history.next(generation)
+                        if found is None:
+                            break
+                        generation = found
+                case 'generation':
+                    generation = value
+                case _:
+                    raise ValueError(f"Unknown seek: {kind}")
+            stored = self.history.get(generation)
+            if stored is None:
+                return
+            generation, grid = stored
+            self.model.grid = grid
+            self.cycles.clear()
+            self.worker.restart(grid.copy(), generation)
@@ -0,0 +1,280 @@
+"""Simulation convolution module.
+
+This module provides the periodic (toroidal) convolution used by the simulation
+model to compute neighborhood sums. It implements both the direct spatial
+convolution and an FFT-based convolution, and selects automatically between them
+based on the kernel and grid sizes. The real FFTs of the recently used kernels
+are kept in a bounded LRU cache keyed by the grid shape and the kernel
+parameters, so moving a slider back to a visited value does not recompute the
+spectrum. Each spectrum is stored with a checksum of its kernel, so a key
+reused for another kernel rebuilds the spectrum instead of serving a stale
+one. A stack of grids, shape (..., rows, columns), is convolved in one
+batched FFT.
+"""
+
+import inspect
+import zlib
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+import numpy as np
+from scipy.signal import convolve2d
+
+# Cost model: direct ~ N*K, FFT ~ FFT_CROSSOVER * N*log2(N) + FFT_OVERHEAD,
+# in units of one direct multiply-add (N cells, K kernel elements).
+# Measured with bench/bench_convolution.py: a 3x3 kernel only pays off from
+# 64x64 grids, every larger kernel is faster through the FFT path.
+FFT_CROSSOVER = 0.3
+FFT_OVERHEAD = 16384
+
+# NumPy >= 2.0 can write FFT results into preallocated arrays
+FFT_HAS_OUT = 'out' in inspect.signature(np.fft.rfft).parameters
+
+# Bounds of the kernel spectrum cache: a 1024x1024 spectrum takes 8 MiB
+SPECTRUM_CACHE_SIZE = 32
+SPECTRUM_CACHE_BYTES = 128 * 2**20
+
+
+def convolve_direct(grid: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolve the grid with the kernel in the spatial domain.
+
+    Args:
+        grid (numpy.ndarray): 2D grid of cells
+        kernel (numpy.ndarray): 2D neighborhood kernel
+
+    Returns:
+        numpy.ndarray: Neighborhood sums with toroidal boundaries
+    """
+    return convolve2d(grid, kernel, mode='same', boundary='wrap')
+
+
+def counts_neighbors(grid: np.ndarray, kernel: np.ndarray) -> bool:
+    """Return True when the convolution counts neighbors and its sums are integers.
+
+    Both the kernel and the grid must be integer (or boolean): an integer
+    kernel on a float grid gives fractional sums that must not be rounded.
+    """
+    return np.issubdtype(kernel.dtype, np.integer) \
+        and (grid.dtype == bool or np.issubdtype(grid.dtype, np.integer))
+
+
+def kernel_spectrum(kernel: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Compute the real FFT of a kernel embedded in a grid of the given shape.
+
+    The kernel is zero-padded to the grid shape and rolled so that its center
+    lies at the origin, which reproduces the alignment of
+    ``convolve2d(..., mode='same')`` for both odd and even kernel sizes.
+    Single and half precision kernels give a single precision spectrum, so that
+    float32 grids are convolved without promotion to double precision.
+
+    Args:
+        kernel (numpy.ndarray): 2D neighborhood kernel
+        shape (tuple): Shape (rows, columns) of the grid
+
+    Returns:
+        numpy.ndarray: Complex spectrum as returned by ``numpy.fft.rfft2``
+    """
+    k_rows, k_cols = kernel.shape
+    single = kernel.dtype in (np.float32, np.float16)
+    padded = np.zeros(shape, dtype=np.float32 if single else np.float64)
+    padded[:k_rows, :k_cols] = kernel
+    padded = np.roll(padded, (-((k_rows - 1) // 2), -((k_cols - 1) // 2)), axis=(0, 1))
+    return np.fft.rfft2(padded)
+
+
+def fft_convolve_into(grid: np.ndarray,
+                      spectrum: np.ndarray,
+                      freq: np.ndarray,
+                      out: np.ndarray) -> np.ndarray:
+    """Convolve through the FFT without allocating temporary arrays.
+
+    The 2D real FFT is done one axis at a time so that every transform can
+    write into a preallocated buffer. Requires NumPy >= 2.0 (see FFT_HAS_OUT).
+
+    Args:
+        grid (numpy.ndarray): 2D grid of cells, or stack of grids
+        spectrum (numpy.ndarray): Kernel spectrum from kernel_spectrum
+        freq (numpy.ndarray): Complex scratch buffer, shape of the grid
+            spectrum (last axis grid.shape[-1] // 2 + 1)
+        out (numpy.ndarray): Float array receiving the result, shape of the grid
+
+    Returns:
+        numpy.ndarray: The out array
+    """
+    np.fft.rfft(grid, axis=-1, out=freq)
+    np.fft.fft(freq, axis=-2, out=freq)
+    np.multiply(freq, spectrum, out=freq)
+    np.fft.ifft(freq, axis=-2, out=freq)
+    np.fft.irfft(freq, n=grid.shape[-1], axis=-1, out=out)
+    return out
+
+
+class Convolver:
+    """Periodic convolution with automatic direct/FFT selection.
+
+    This class computes neighborhood sums on a toroidal grid. Depending on the
+    selected method it uses ``scipy.signal.convolve2d`` or a real FFT product.
+    The kernel spectra are cached and keyed by the grid shape and a kernel key,
+    typically the parameters the kernel was built from. The key must be read
+    together with the kernel (see FiModel.get_con_nhood_with_key); a cached
+    spectrum whose kernel checksum differs from the given kernel is rebuilt.
+    The least recently used spectra are evicted beyond cache_size entries or
+    cache_bytes bytes.
+    """
+    METHODS = ('auto', 'direct', 'fft')
+
+    def __init__(self,
+                 method: str = 'auto',
+                 cache_size: int = SPECTRUM_CACHE_SIZE,
+                 cache_bytes: int = SPECTRUM_CACHE_BYTES) -> None:
+        """Initialize the convolver.
+
+        Args:
+            method (str): One of 'auto', 'direct' or 'fft'. Default is 'auto'.
+            cache_size (int): Maximum number of cached kernel spectra
+            cache_bytes (int): Maximum memory of the cached spectra. The most
+                recent spectrum is always kept.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown convolution method: {method}")
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.method = method
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self._spectra = OrderedDict()   # (shape, kernel key) -> (spectrum, checksum), oldest first
+        self._spectra_bytes = 0
+        self._freq = None         # Complex scratch buffer of convolve(out=...)
+        self.spectrum_builds = 0  # Number of kernel FFTs computed, for diagnostics
+        self.key_mismatches = 0   # Cached spectra rebuilt for another kernel under their key
+
+    def use_fft(self, grid_shape: Tuple[int, int], kernel_shape: Tuple[int, int]) -> bool:
+        """Decide whether the FFT path should be used.
+
+        Args:
+            grid_shape (tuple): Shape of the grid
+            kernel_shape (tuple): Shape of the kernel
+
+        Returns:
+            bool: True if the FFT convolution should be used
+        """
+        if self.method == 'direct':
+            return False
+        # A kernel larger than the grid would alias onto itself in the FFT path
+        if kernel_shape[0] > grid_shape[0] or kernel_shape[1] > grid_shape[1]:
+            return False
+        if self.method == 'fft':
+            return True
+        grid_size = grid_shape[0] * grid_shape[1]
+        kernel_size = kernel_shape[0] * kernel_shape[1]
+        fft_cost = FFT_CROSSOVER * grid_size * np.log2(max(grid_size, 2)) + FFT_OVERHEAD
+        return grid_size * kernel_size > fft_cost
+
+    def get_spectrum(self,
+                     kernel: np.ndarray,
+                     shape: Tuple[int, int],
+                     kernel_key: Optional[Hashable] = None) -> np.ndarray:
+        """Return the cached kernel spectrum, computing it if needed.
+
+        Args:
+            kernel (numpy.ndarray): 2D neighborhood kernel
+            shape (tuple): Shape of the grid
+            kernel_key (hashable, optional): Key identifying the kernel parameters.
+                If None, the kernel content is used as key.
+
+        Returns:
+            numpy.ndarray: Kernel spectrum for the given grid shape
+        """
+        if kernel_key is None:
+            kernel_key = (kernel.shape, kernel.tobytes())
+        key = (tuple(shape), kernel.dtype.str, kernel_key)
+        # A few microseconds for the small kernels of the simulation
+        checksum = (kernel.shape, zlib.crc32(np.ascontiguousarray(kernel)))
+        entry = self._spectra.get(key)
+        if entry is not None:
+            spectrum, cached = entry
+            if cached == checksum:
+                self._spectra.move_to_end(key)
+                return spectrum
+            # The key was given with another kernel: never serve its spectrum
+            del self._spectra[key]
+            self._spectra_bytes -= spectrum.nbytes
+            self.key_mismatches += 1
+
+        spectrum = kernel_spectrum(kernel, shape)
+        self.spectrum_builds += 1
+        self._spectra[key] = (spectrum, checksum)
+        self._spectra_bytes += spectrum.nbytes
+        while len(self._spectra) > 1 and (len(self._spectra) > self.cache_size
+                                          or self._spectra_bytes > self.cache_bytes):
+            _, (evicted, _) = self._spectra.popitem(last=False)
+            self._spectra_bytes -= evicted.nbytes
+        return spectrum
+
+    def cached_spectra(self) -> int:
+        """Return the number of kernel spectra in the cache."""
+        return len(self._spectra)
+
+    def convolve(self,
+                 grid: np.ndarray,
+                 kernel: np.ndarray,
+                 kernel_key: Optional[Hashable] = None,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convolve the grid with the kernel using toroidal boundaries.
+
+        Integer kernels count neighbors of discrete grids, so for an integer
+        kernel on an integer grid the FFT result is rounded to match the direct
+        convolution exactly (see counts_neighbors).
+        
+        A 3D array is a stack of grids convolved independently: the FFT path
+        transforms the whole stack at once, the direct path loops over it.
+
+        With ``out``, the result is written into that float array. On the FFT
+        path and NumPy >= 2.0 no temporary array is allocated.
+
+        Args:
+            grid (numpy.ndarray): 2D grid of cells, or 3D stack of grids
+            kernel (numpy.ndarray): 2D neighborhood kernel
+            kernel_key (hashable, optional): Key identifying the kernel parameters
+            out (numpy.ndarray, optional): Float array receiving the result
+
+        Returns:
+            numpy.ndarray: Neighborhood sums, same shape as the grid
+        """
+        shape = grid.shape[-2:]
+        if not self.use_fft(shape, kernel.shape):
+            if grid.ndim == 3:
+                if out is None:
+                    out = np.empty(grid.shape, dtype=np.result_type(grid, kernel))
+                for index, member in enumerate(grid):
+                    out[index] = convolve_direct(member, kernel)
+                return out
+            if out is None:
+                return convolve_direct(grid, kernel)
+            out[...] = convolve_direct(grid, kernel)
+            return out
+
+        spectrum = self.get_spectrum(kernel, shape, kernel_key)
+        if out is not None:
+            if FFT_HAS_OUT:
+                freq_shape = grid.shape[:-1] + spectrum.shape[-1:]
+                freq_dtype = np.result_type(grid.dtype, spectrum.dtype)
+                if self._freq is None or self._freq.shape != freq_shape or self._freq.dtype != freq_dtype:
+                    self._freq = np.empty(freq_shape, dtype=freq_dtype)
+                fft_convolve_into(grid, spectrum, self._freq, out)
+            else:
+                out[...] = np.fft.irfft2(np.fft.rfft2(grid) * spectrum, s=shape)
+            if counts_neighbors(grid, kernel):
+                np.rint(out, out=out)
+            return out
+
+        result = np.fft.irfft2(np.fft.rfft2(grid) * spectrum, s=shape)
+
+        if counts_neighbors(grid, kernel):
+            return np.rint(result).astype(np.result_type(grid, kernel), copy=False)
+        return result
+
+    def clear_cache(self) -> None:
+        """Drop the cached kernel spectra."""
+        self._spectra.clear()
+        self._spectra_bytes = 0
+        self._freq = None
@@ -0,0 +1,317 @@
+"""Simulation cycle detection module.
+
+This module detects when a run settles into a still life (period 1) or an
+oscillator, so that the controller can pause it or replay the cycle instead of
+computing it again.
+
+Each observed grid is reduced to a 64-bit hash. The grid is split into bands
+of rows, the tiles, each hashed on its own: its cells are packed into 64-bit
+words (64 cells of a discrete grid, or 8 bytes of a continuous one), each word
+is XORed with a random key of its position and mixed by the splitmix64
+finalizer, and the words are summed. The band hashes are combined by XOR and
+kept, so the next grid only rehashes the bands with changed rows. The changed
+rows are given by the engine when it tracks them (the 'tiled' engine), or found
+by comparing with a copy of the previous grid, a single pass with no hashing.
+
+A hash equal to the hash of an earlier generation within max_period gives a
+candidate period. The candidate is confirmed once a full period has been
+observed again and every grid seen twice in the same phase is exactly equal,
+so hash collisions never confirm a cycle. The grids of the cycle are kept to
+serve the frames of later generations.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
+import numpy as np
+
+DEFAULT_MAX_PERIOD = 64
+DEFAULT_MAX_BYTES = 64 * 2**20   # Memory cap of the grids of a cycle
+DEFAULT_BAND_ROWS = 64           # Rows of the hashed tiles, a multiple of 64
+
+
+def _mix(words: np.ndarray) -> None:
+    """Apply the splitmix64 finalizer to uint64 words in place."""
+    words ^= words >> np.uint64(30)
+    words *= np.uint64(0xBF58476D1CE4E5B9)
+    words ^= words >> np.uint64(27)
+    words *= np.uint64(0x94D049BB133111EB)
+    words ^= words >> np.uint64(31)
+
+
+class GridHasher:
+    """Tile-combined 64-bit hash of grids.
+
+    Equal grids have equal hashes. Discrete grids (integer or bool) are hashed
+    by cell state, alive or dead, continuous grids by their exact bytes.
+
+    The hasher keeps the band hashes of the last grid, and a copy of it, to
+    rehash only the changed bands of the next one. The buffers are allocated
+    once per grid shape and dtype.
+    """
+    def __init__(self, seed: int = 0, band_rows: int = DEFAULT_BAND_ROWS) -> None:
+        """Initialize the hasher.
+
+        Args:
+            seed (int): Seed of the random position keys
+            band_rows (int): Rows of each band, a multiple of 64 so that the
+                cells of a band fill whole words
+        """
+        if band_rows < 64 or band_rows % 64:
+            raise ValueError("band_rows must be a positive multiple of 64")
+        self.seed = seed
+        self.band_rows = band_rows
+        self.bands_hashed = 0   # Number of band hashes computed, for diagnostics
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the last grid, the next one is hashed in full."""
+        self._shape = None
+        self._dtype = None
+        self._prev = None       # Copy of the last grid
+        self._row_words = False
+        self._diff = None       # Comparison buffer
+        self._block = None      # Bands being hashed, zero-padded
+        self._words = None      # Words of the bands being hashed
+        self._keys = None       # Position keys, one row per band
+        self._hashes = None     # Hash of each band of the last grid
+        self._total = np.uint64(0)
+
+    def _allocate(self, grid: np.ndarray) -> None:
+        """Allocate the buffers of a grid shape and dtype."""
+        rows, cols = grid.shape
+        bands = -(-rows // self.band_rows)
+        packed = grid.dtype == bool or np.issubdtype(grid.dtype, np.integer)
+        cells = self.band_rows * cols
+        words = cells // 64 if packed else cells * grid.dtype.itemsize // 8
+        self._shape, self._dtype = grid.shape, grid.dtype
+        self._prev = np.empty(grid.shape, dtype=grid.dtype)
+        # Rows of whole words are compared word by word
+        self._row_words = cols * grid.dtype.itemsize % 8 == 0
+        compared = self._prev.view(np.uint64) if self._row_words else self._prev
+        self._diff = np.empty(compared.shape, dtype=bool)
+        self._block = np.zeros((bands, self.band_rows, cols), dtype=grid.dtype)
+        self._words = np.empty((bands, words), dtype=np.uint64)
+        rng = np.random.default_rng(self.seed)
+        self._keys = rng.integers(0, 2**64, size=(bands, words), dtype=np.uint64, endpoint=False)
+        self._hashes = np.zeros(bands, dtype=np.uint64)
+        self._total = np.uint64(0)
+
+    def _changed_bands(self, grid: np.ndarray, changed_rows: Optional[np.ndarray]) -> np.ndarray:
+        """Return the indices of the bands that differ from the last grid."""
+        if changed_rows is None:
+            if self._row_words:
+                np.not_equal(np.ascontiguousarray(grid).view(np.uint64), self._prev.view(np.uint64),
+                             out=self._diff)
+            else:
+                np.not_equal(grid, self._prev, out=self._diff)
+            changed_rows = self._diff.any(axis=1)
+        starts = np.arange(0, grid.shape[0], self.band_rows)
+        return np.flatnonzero(np.logical_or.reduceat(changed_rows, starts))
+
+    def _hash_bands(self, grid: np.ndarray, bands: np.ndarray) -> None:
+        """Rehash bands of the grid, update the combined hash and the copy."""
+        count = bands.size
+        if count == 0:
+            return
+        rows, cols = grid.shape
+        full = rows // self.band_rows
+        inner = bands[bands < full]
+        block = self._block[:count]
+        if inner.size:
+            view = grid[:full * self.band_rows].reshape(full, self.band_rows, cols)
+            np.take(view, inner, axis=0, out=block[:inner.size], mode='clip')
+            self._prev[:full * self.band_rows].reshape(full, self.band_rows, cols)[inner] = \
+                block[:inner.size]
+        if inner.size < count:
+            # Partial last band, zero-padded
+            tail = grid[full * self.band_rows:]
+            block[-1, :tail.shape[0]] = tail
+            block[-1, tail.shape[0]:] = 0
+            self._prev[full * self.band_rows:] = tail
+
+        words = self._words[:count]
+        np.take(self._keys, bands, axis=0, out=words, mode='clip')
+        if grid.dtype == bool or np.issubdtype(grid.dtype, np.integer):
+            words ^= np.packbits(block.reshape(count, -1), axis=1).view(np.uint64)
+        else:
+            words ^= block.reshape(count, -1).view(np.uint64)
+        _mix(words)
+        hashes = words.sum(axis=1, dtype=np.uint64)
+        self._total ^= np.bitwise_xor.reduce(self._hashes[bands] ^ hashes)
+        self._hashes[bands] = hashes
+        self.bands_hashed += count
+
+    def hash(self, grid: np.ndarray, changed_rows: Optional[np.ndarray] = None) -> int:
+        """Return the hash of a grid, rehashing the bands changed since the last one.
+
+        Args:
+            grid (numpy.ndarray): 2D grid of cells
+            changed_rows (numpy.ndarray, optional): Boolean array, True for the
+                rows that may differ from the last grid hashed. Found by
+                comparing with a copy of the last grid if None.
+
+        Returns:
+            int: 64-bit hash, also depending on the shape of the grid
+        """
+        if grid.shape != self._shape or grid.dtype != self._dtype:
+            self._allocate(grid)
+            bands = np.arange(self._hashes.size)
+        else:
+            bands = self._changed_bands(grid, changed_rows)
+        self._hash_bands(grid, bands)
+        return hash((grid.shape, int(self._total)))
+
+
+class CycleDetector:
+    """Detector of still lifes and oscillators in a sequence of grids.
+
+    Grids are observed in increasing generation order, not necessarily
+    consecutive (e.g. with several generations per frame), under a rule key
+    identifying the kernel, growth function and time step. A change of rule,
+    or a generation not after the last one, restarts the detection.
+    """
+    def __init__(self,
+                 max_period: int = DEFAULT_MAX_PERIOD,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize the detector.
+
+        Args:
+            max_period (int): Longest period detected, in generations
+            max_bytes (int): Memory cap of the grids of a cycle, longer cycles
+                of large grids are not detected
+        """
+        if max_period < 1:
+            raise ValueError("max_period must be at least 1")
+        self.max_period = max_period
+        self.max_bytes = max_bytes
+        self.hasher = GridHasher()
+        self.key = None
+        self.period = None      # Period of the confirmed cycle, in generations
+        self.start = None       # Generation of phase 0 of the cycle
+        self.frames: Dict[int, np.ndarray] = {}   # Phase -> read-only grid
+        self._hashes: Dict[int, int] = {}          # Generation -> hash
+        self._seen: Dict[int, int] = {}            # Hash -> newest generation
+        self._order: Deque[int] = deque()          # Observed generations, oldest first
+        self._candidate: Optional[Tuple[int, int]] = None   # (start, period)
+
+    def clear(self) -> None:
+        """Forget the observed grids and the cycle."""
+        self.hasher.reset()
+        self.period = None
+        self.start = None
+        self.frames = {}
+        self._hashes.clear()
+        self._seen.clear()
+        self._order.clear()
+        self._candidate = None
+
+    @property
+    def confirmed(self) -> bool:
+        """True once a cycle has been confirmed."""
+        return self.period is not None
+
+    @property
+    def last_generation(self) -> Optional[int]:
+        """Generation of the last grid observed, None if none is kept."""
+        return self._order[-1] if self._order else None
+
+    def matches(self, key: Optional[Hashable]) -> bool:
+        """Return True if a cycle is confirmed under the given rule key."""
+        return self.period is not None and key == self.key
+
+    def phase(self, generation: int) -> int:
+        """Return the phase of a generation in the candidate or confirmed cycle."""
+        start, period = (self.start, self.period) if self.confirmed else self._candidate
+        return (generation - start) % period
+
+    def observe(self,
+                generation: int,
+                grid: np.ndarray,
+                key: Optional[Hashable] = None,
+                changed_rows: Optional[np.ndarray] = None) -> Optional[int]:
+        """Observe the grid of a generation.
+
+        Args:
+            generation (int): Generation of the grid
+            grid (numpy.ndarray): Grid of cells, copied if kept
+            key (hashable, optional): Key identifying the rule
+            changed_rows (numpy.ndarray, optional): Rows that may differ from
+                the grid of last_generation, see GridHasher.hash
+
+        Returns:
+            int: Period of the confirmed cycle, None while not confirmed
+        """
+        if key != self.key or (self._order and generation <= self._order[-1]):
+            self.clear()
+            self.key = key
+        if self.confirmed:
+            return self.period
+
+        value = self.hasher.hash(grid, changed_rows)
+        if self._candidate is not None:
+            self._check_candidate(generation, grid, value)
+        if self._candidate is None:
+            previous = self._seen.get(value)
+            if previous is not None and (generation - previous) * grid.nbytes <= self.max_bytes:
+                self._candidate = (generation, generation - previous)
+                self._keep(generation, grid)
+
+        self._hashes[generation] = value
+        self._seen[value] = generation
+        self._order.append(generation)
+        while generation - self._order[0] > self.max_period:
+            old = self._order.popleft()
+            old_value = self._hashes.pop(old)
+            if self._seen.get(old_value) == old:
+                del self._seen[old_value]
+        return self.period
+
+    def _check_candidate(self, generation: int, grid: np.ndarray, value: int) -> None:
+        """Confirm or drop the candidate cycle with a new observation."""
+        start, period = self._candidate
+        earlier = self._hashes.get(generation - period)
+        if earlier is not None and earlier != value:
+            self._drop_candidate()
+            return
+        kept = self.frames.get(self.phase(generation))
+        if kept is None:
+            self._keep(generation, grid)
+        elif not np.array_equal(kept, grid):
+            self._drop_candidate()
+        elif generation - start >= period:
+            self.start, self.period = start, period
+
+    def _drop_candidate(self) -> None:
+        """Forget the candidate cycle after a mismatch."""
+        self._candidate = None
+        self.frames = {}
+
+    def _keep(self, generation: int, grid: np.ndarray) -> None:
+        """Store a read-only copy of the grid of a generation of the cycle."""
+        frame = np.array(grid)
+        frame.flags.writeable = False
+        self.frames[self.phase(generation)] = frame
+
+    def frame(self, generation: int) -> Optional[np.ndarray]:
+        """Return the grid of a generation from the confirmed cycle.
+
+        Args:
+            generation (int): Generation at or after the start of the cycle
+
+        Returns:
+            numpy.ndarray: Read-only grid, None if that phase was never
+                observed (add it with add) or no cycle is confirmed
+        """
+        if not self.confirmed:
+            return None
+        return self.frames.get(self.phase(generation))
+
+    def add(self, generation: int, grid: np.ndarray) -> None:
+        """Store a grid computed for a phase of the confirmed cycle not observed yet.
+
+        Args:
+            generation (int): Generation of the grid
+            grid (numpy.ndarray): Grid of cells, copied
+        """
+        if self.confirmed and self.phase(generation) not in self.frames:
+            self._keep(generation, grid)
@@ -0,0 +1,396 @@
+"""Simulation HashLife module.
+
+This module provides a HashLife engine for the discrete Game of Life. The state
+is a hash-consed quadtree: identical blocks share a single node, and the result
+of advancing each node is memoized, so periodic and repetitive patterns can be
+advanced by 2^k generations in one call. The node cache is bounded and evicted
+when it grows beyond its capacity.
+
+Two topologies are supported:
+- 'torus': the grid wraps like the convolution engine. It requires power-of-two
+  grid dimensions, which are tiled into one square periodic universe.
+- 'plane': the grid is embedded in an unbounded plane, cells leaving the grid
+  keep evolving outside of it.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+class Node:
+    """Quadtree node.
+
+    A node of level k covers a 2^k x 2^k square. Level 0 nodes are single cells.
+    Nodes are immutable and hash-consed, so two nodes are equal only if they are
+    the same object.
+    """
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self,
+                 nw: Optional['Node'],
+                 ne: Optional['Node'],
+                 sw: Optional['Node'],
+                 se: Optional['Node'],
+                 level: int,
+                 population: int) -> None:
+        """Initialize a node.
+
+        Args:
+            nw, ne, sw, se (Node): Quadrants, None for level 0 nodes
+            level (int): Level of the node
+            population (int): Number of living cells
+        """
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+# Nodes up to this level are converted to dense arrays as memoized blocks
+BLOCK_LEVEL = 3
+
+OFF = Node(None, None, None, None, 0, 0)
+ON = Node(None, None, None, None, 0, 1)
+
+
+def _is_pow2(value: int) -> bool:
+    """Return True if value is a positive power of two."""
+    return value > 0 and value & (value - 1) == 0
+
+
+class HashLifeEngine:
+    """HashLife Game of Life engine.
+
+    This class advances a discrete grid with the B3/S23 rules using the HashLife
+    algorithm. It converts to and from the dense grids used by the simulation
+    model, and can be plugged into SimModel as the 'hashlife' engine.
+    """
+    def __init__(self, max_nodes: int = 1_000_000) -> None:
+        """Initialize the engine.
+
+        Args:
+            max_nodes (int): Maximum number of nodes kept in the cache before
+                the cache and the memoized results are evicted
+        """
+        self.max_nodes = max_nodes
+        self.root = None
+        self.topology = None
+        self.generation = 0
+        self.evictions = 0
+        self.shape = None
+        self.dtype = None
+        self._origin = (0, 0)    # (row, column) of the root's top-left cell
+        self._table: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._results: Dict[Tuple[Node, int], Node] = {}
+        self._blocks: Dict[Node, np.ndarray] = {}
+        self._zeros: List[Node] = [OFF]
+        self._dense = None
+
+    # --- Quadtree primitives -------------------------------------------------
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node made of four quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            if len(self._table) >= self.max_nodes:
+                self._evict()
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._table[key] = node
+        return node
+
+    def _zero(self, level: int) -> Node:
+        """Return the empty node of the given level."""
+        while len(self._zeros) <= level:
+            previous = self._zeros[-1]
+            self._zeros.append(self._join(previous, previous, previous, previous))
+        return self._zeros[level]
+
+    def _evict(self) -> None:
+        """Drop the node cache and the memoized results.
+
+        Nodes in use stay valid since they are immutable, only sharing with
+        nodes created later is lost until the next collect.
+        """
+        self._table.clear()
+        self._results.clear()
+        self._blocks.clear()
+        self._zeros = [OFF]
+        self.evictions += 1
+
+    def collect(self) -> None:
+        """Rebuild the node cache from the nodes reachable from the root."""
+        self._table.clear()
+        self._results.clear()
+        self._blocks.clear()
+        self._zeros = [OFF]
+        stack = [self.root] if self.root is not None else []
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or id(node) in seen:
+                continue
+            seen.add(id(node))
+            self._table[(node.nw, node.ne, node.sw, node.se)] = node
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+
+    def node_count(self) -> int:
+        """Return the number of nodes in the cache.
+
+        Returns:
+            int: Number of cached nodes
+        """
+        return len(self._table)
+
+    # --- Evolution -----------------------------------------------------------
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Advance a level 2 node by one generation.
+
+        Returns:
+            Node: Level 1 node holding the next state of the 2x2 center
+        """
+        cells = [[0] * 4 for _ in range(4)]
+        for row_q, col_q, quad in ((0, 0, node.nw), (0, 2, node.ne),
+                                   (2, 0, node.sw), (2, 2, node.se)):
+            cells[row_q][col_q] = quad.nw.population
+            cells[row_q][col_q + 1] = quad.ne.population
+            cells[row_q + 1][col_q] = quad.sw.population
+            cells[row_q + 1][col_q + 1] = quad.se.population
+
+        def next_cell(row: int, col: int) -> Node:
+            count = sum(cells[r][c] for r in (row - 1, row, row + 1)
+                        for c in (col - 1, col, col + 1)) - cells[row][col]
+            alive = count == 3 or (count == 2 and cells[row][col])
+            return ON if alive else OFF
+
+        return self._join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """Advance the center of a node by 2^j generations.
+
+        Args:
+            node (Node): Node of level k >= 2
+            j (int): Log2 of the number of generations, 0 <= j <= k - 2
+
+        Returns:
+            Node: Level k - 1 node, center of the node after 2^j generations
+        """
+        if node.population == 0:
+            return self._zero(node.level - 1)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            join = self._join
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self._successor(nw, j)
+            c2 = self._successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self._successor(ne, j)
+            c4 = self._successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self._successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self._successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self._successor(sw, j)
+            c8 = self._successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self._successor(se, j)
+            if j < node.level - 2:
+                # Half speed: the nine results already hold 2^j generations
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                              join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw),
+                              join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = join(self._successor(join(c1, c2, c4, c5), j),
+                              self._successor(join(c2, c3, c5, c6), j),
+                              self._successor(join(c4, c5, c7, c8), j),
+                              self._successor(join(c5, c6, c8, c9), j))
+        self._results[key] = result
+        return result
+
+    def _centre(self, node: Node) -> Node:
+        """Embed a node in the center of an empty node of the next level."""
+        zero = self._zero(node.level - 1)
+        level = node.level
+        self._origin = (self._origin[0] - (1 << (level - 1)),
+                        self._origin[1] - (1 << (level - 1)))
+        return self._join(self._join(zero, zero, zero, node.nw),
+                          self._join(zero, zero, node.ne, zero),
+                          self._join(zero, node.sw, zero, zero),
+                          self._join(node.se, zero, zero, zero))
+
+    def _is_padded(self, node: Node) -> bool:
+        """Return True if all living cells lie in the central quarter of the node."""
+        return (node.nw.population == node.nw.se.se.population and
+                node.ne.population == node.ne.sw.sw.population and
+                node.sw.population == node.sw.ne.ne.population and
+                node.se.population == node.se.nw.nw.population)
+
+    def advance_pow2(self, k: int) -> None:
+        """Advance the state by 2^k generations in one call.
+
+        Args:
+            k (int): Log2 of the number of generations
+        """
+        if self.topology == 'torus':
+            half = self.root.level - 1
+            if k <= half:
+                tiled = self._join(self.root, self.root, self.root, self.root)
+                centre = self._successor(tiled, k)
+                # The center of the tiled universe is rolled by half a period
+                self.root = self._join(centre.se, centre.sw, centre.ne, centre.nw)
+            else:
+                for _ in range(1 << (k - half)):
+                    self.advance_pow2(half)
+                return
+        else:
+            while self.root.level < k + 2 or not self._is_padded(self.root):
+                self.root = self._centre(self.root)
+            self.root = self._centre(self.root)
+            shift = 1 << (self.root.level - 2)
+            self.root = self._successor(self.root, k)
+            self._origin = (self._origin[0] + shift, self._origin[1] + shift)
+        self.generation += 1 << k
+        if len(self._table) > self.max_nodes // 2:
+            self.collect()
+
+    def step(self, generations: int = 1) -> None:
+        """Advance the state by any number of generations.
+
+        Args:
+            generations (int): Number of generations to compute
+        """
+        k = 0
+        while generations:
+            if generations & 1:
+                self.advance_pow2(k)
+            generations >>= 1
+            k += 1
+
+    def population(self) -> int:
+        """Return the number of living cells.
+
+        Returns:
+            int: Number of living cells in the whole universe
+        """
+        return self.root.population
+
+    # --- Dense conversion ----------------------------------------------------
+
+    def load(self, grid: np.ndarray, topology: str = 'auto') -> None:
+        """Build the quadtree from a dense grid.
+
+        Args:
+            grid (numpy.ndarray): 2D grid of cells, non-zero cells are alive
+            topology (str): 'torus', 'plane', or 'auto' to use the torus when
+                the grid dimensions are powers of two
+        """
+        rows, cols = grid.shape
+        torus_ok = _is_pow2(rows) and _is_pow2(cols) and min(rows, cols) >= 4
+        if topology == 'auto':
+            topology = 'torus' if torus_ok else 'plane'
+        if topology == 'torus' and not torus_ok:
+            raise ValueError("The torus topology requires power-of-two dimensions of at least 4")
+        if topology not in ('torus', 'plane'):
+            raise ValueError(f"Unknown topology: {topology}")
+
+        self.topology = topology
+        self.shape = grid.shape
+        self.dtype = grid.dtype
+        self.generation = 0
+        self._origin = (0, 0)
+
+        cells = grid != 0
+        size = max(rows, cols, 4)
+        size = 1 << (size - 1).bit_length()
+        if topology == 'torus':
+            # Tile the periodic grid into a square universe
+            cells = np.tile(cells, (size // rows, size // cols))
+        else:
+            padded = np.zeros((size, size), dtype=bool)
+            padded[:rows, :cols] = cells
+            cells = padded
+        self.root = self._from_cells(cells)
+        self._dense = None
+
+    def _from_cells(self, cells: np.ndarray) -> Node:
+        """Build the canonical node of a square power-of-two boolean array.
+
+        The tree is built bottom-up one level at a time, only creating one node
+        per distinct block of each level.
+        """
+        ids = cells.astype(np.int64)
+        nodes: List[Node] = [OFF, ON]
+        while ids.shape[0] > 1:
+            quads = np.stack([ids[0::2, 0::2], ids[0::2, 1::2],
+                              ids[1::2, 0::2], ids[1::2, 1::2]], axis=-1)
+            unique, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = [self._join(nodes[a], nodes[b], nodes[c], nodes[d])
+                     for a, b, c, d in unique.tolist()]
+            ids = inverse.reshape(quads.shape[:2])
+        return nodes[int(ids[0, 0])]
+
+    def _fill(self, node: Node, out: np.ndarray, row: int, col: int) -> None:
+        """Write the cells of a node into a dense array, clipped to its bounds."""
+        size = 1 << node.level
+        if (node.population == 0 or row >= out.shape[0] or col >= out.shape[1]
+                or row + size <= 0 or col + size <= 0):
+            return
+        if node.level <= BLOCK_LEVEL:
+            block = self._block(node)
+            r0, c0 = max(row, 0), max(col, 0)
+            r1, c1 = min(row + size, out.shape[0]), min(col + size, out.shape[1])
+            out[r0:r1, c0:c1] = block[r0 - row:r1 - row, c0 - col:c1 - col]
+            return
+        half = size >> 1
+        self._fill(node.nw, out, row, col)
+        self._fill(node.ne, out, row, col + half)
+        self._fill(node.sw, out, row + half, col)
+        self._fill(node.se, out, row + half, col + half)
+
+    def _block(self, node: Node) -> np.ndarray:
+        """Return the memoized dense cells of a small node."""
+        block = self._blocks.get(node)
+        if block is None:
+            if node.level == 0:
+                block = np.full((1, 1), node.population, dtype=np.uint8)
+            else:
+                block = np.block([[self._block(node.nw), self._block(node.ne)],
+                                  [self._block(node.sw), self._block(node.se)]])
+            self._blocks[node] = block
+        return block
+
+    def to_dense(self) -> np.ndarray:
+        """Return the cells covering the loaded grid.
+
+        Returns:
+            numpy.ndarray: Grid of 0/1 cells with the shape and dtype of the loaded grid
+        """
+        out = np.zeros(self.shape, dtype=np.uint8)
+        self._fill(self.root, out, self._origin[0], self._origin[1])
+        return out.astype(self.dtype, copy=False)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        """Advance a dense grid and return the resulting dense grid.
+
+        The quadtree is kept between calls: if ``grid`` is the array returned by
+        the previous call, it is not rebuilt.
+
+        Args:
+            grid (numpy.ndarray): Current dense grid
+            generations (int): Number of generations to compute
+
+        Returns:
+            numpy.ndarray: New dense grid
+        """
+        if grid is not self._dense or grid.shape != self.shape:
+            self.load(grid)
+        self.step(generations)
+        self._dense = self.to_dense()
+        return self._dense
@@ -0,0 +1,231 @@
+"""Simulation history module.
+
+This module keeps the recent states of a run in memory so that the user can
+step back and seek to any stored generation. States are grouped in segments:
+a full keyframe followed by deltas to the previous state, so rebuilding a
+generation costs one keyframe decode and at most keyframe_interval deltas.
+
+- Discrete grids: keyframes are the bit-packed cells, deltas the bit-packed
+  XOR with the previous state, both compressed with zlib, so a delta costs
+  little more than the few cells that flipped.
+- Continuous grids: states are quantized to 15-bit levels (error below
+  2e-5), deltas are the level differences, both compressed with zlib.
+
+A state whose delta is not smaller than the keyframe starts a new segment.
+The oldest segments are evicted when the history exceeds its memory cap.
+"""
+
+import zlib
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+import numpy as np
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+DEFAULT_KEYFRAME_INTERVAL = 32
+LEVELS = 2**15 - 1   # Quantization levels of continuous grids, fit in int16
+COMPRESSION_LEVEL = 1   # zlib level, favoring speed: deltas are mostly zeros
+
+
+class _Segment:
+    """Keyframe and the deltas of the states following it."""
+    def __init__(self, generation: int, keyframe: bytes) -> None:
+        self.generations = [generation]
+        self.keyframe = keyframe
+        self.deltas: List[bytes] = []
+        self.nbytes = len(keyframe)
+
+
+class History:
+    """Keyframe plus delta ring buffer of grid states.
+
+    States are pushed in increasing generation order, not necessarily
+    consecutive (e.g. with several generations per frame). Pushing a grid of
+    another shape or mode clears the history.
+    """
+    def __init__(self,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        """Initialize an empty history.
+
+        Args:
+            max_bytes (int): Memory cap of the stored keyframes and deltas, 0
+                disables the history
+            keyframe_interval (int): Maximum number of deltas after a keyframe,
+                which bounds the cost of a seek
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.segments: Deque[_Segment] = deque()
+        self.nbytes = 0
+        self.shape = None
+        self.dtype = None
+        self.discrete = None
+        self._cells = 0
+        self._last = None   # Encoded state of the last generation
+
+    def clear(self) -> None:
+        """Drop all stored states."""
+        self.segments.clear()
+        self.nbytes = 0
+        self._last = None
+
+    def __len__(self) -> int:
+        return sum(len(segment.generations) for segment in self.segments)
+
+    @property
+    def first_generation(self) -> Optional[int]:
+        """Oldest stored generation, None if the history is empty."""
+        return self.segments[0].generations[0] if self.segments else None
+
+    @property
+    def last_generation(self) -> Optional[int]:
+        """Newest stored generation, None if the history is empty."""
+        return self.segments[-1].generations[-1] if self.segments else None
+
+    def _encode(self, grid: np.ndarray) -> np.ndarray:
+        """Return the flat encoded state: bool cells or int16 levels."""
+        if self.discrete:
+            return np.ravel(grid) != 0
+        levels = np.clip(np.ravel(grid), 0, 1) * LEVELS
+        return np.rint(levels, out=levels).astype(np.int16)
+
+    def _decode(self, state: np.ndarray) -> np.ndarray:
+        """Return the grid of an encoded state."""
+        if self.discrete:
+            return state.reshape(self.shape).astype(self.dtype)
+        return (state / LEVELS).reshape(self.shape).astype(self.dtype)
+
+    def _compress(self, state: np.ndarray) -> bytes:
+        """Return the stored form of an encoded state or difference."""
+        data = np.packbits(state) if self.discrete else state
+        return zlib.compress(data.tobytes(), COMPRESSION_LEVEL)
+
+    def _decompress(self, data: bytes) -> np.ndarray:
+        """Return the encoded state or difference of a stored form."""
+        if self.discrete:
+            packed = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+            return np.unpackbits(packed, count=self._cells).view(bool)
+        return np.frombuffer(zlib.decompress(data), dtype=np.int16).copy()
+
+    def _delta(self, before: np.ndarray, after: np.ndarray) -> bytes:
+        """Return the delta turning one encoded state into another."""
+        return self._compress(before ^ after if self.discrete else after - before)
+
+    def _apply(self, state: np.ndarray, delta: bytes) -> None:
+        """Apply a delta to an encoded state in place."""
+        if self.discrete:
+            state ^= self._decompress(delta)
+        else:
+            state += self._decompress(delta)
+
+    def push(self, generation: int, grid: np.ndarray, discrete: bool) -> None:
+        """Store the state of a generation.
+
+        Args:
+            generation (int): Generation of the grid, after the last stored one
+            grid (numpy.ndarray): Grid of cells, copied
+            discrete (bool): True for a Game of Life grid, False for Lenia
+        """
+        if self.max_bytes <= 0:
+            return
+        if grid.shape != self.shape or discrete != self.discrete or grid.dtype != self.dtype:
+            self.clear()
+            self.shape, self.dtype, self.discrete = grid.shape, grid.dtype, discrete
+            self._cells = grid.size
+        if self.segments and generation <= self.last_generation:
+            self.truncate(generation - 1)
+
+        state = self._encode(grid)
+        segment = self.segments[-1] if self.segments else None
+        delta = None
+        if segment is not None and self._last is not None \
+                and len(segment.deltas) < self.keyframe_interval:
+            delta = self._delta(self._last, state)
+        if delta is None or len(delta) >= len(segment.keyframe):
+            segment = _Segment(generation, self._compress(state))
+            self.segments.append(segment)
+            self.nbytes += segment.nbytes
+        else:
+            segment.generations.append(generation)
+            segment.deltas.append(delta)
+            segment.nbytes += len(delta)
+            self.nbytes += len(delta)
+        self._last = state
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest segments while over the memory cap, keeping the newest."""
+        while self.nbytes > self.max_bytes and len(self.segments) > 1:
+            self.nbytes -= self.segments.popleft().nbytes
+
+    def _locate(self, generation: int) -> Optional[Tuple[int, int]]:
+        """Return the segment and state index of the newest state at or before a generation."""
+        for index in range(len(self.segments) - 1, -1, -1):
+            generations = self.segments[index].generations
+            if generations[0] <= generation:
+                position = int(np.searchsorted(generations, generation, side='right')) - 1
+                return index, position
+        return None
+
+    def _rebuild(self, index: int, position: int) -> np.ndarray:
+        """Return the encoded state at a segment and state index."""
+        segment = self.segments[index]
+        state = self._decompress(segment.keyframe)
+        for delta in segment.deltas[:position]:
+            self._apply(state, delta)
+        return state
+
+    def get(self, generation: int) -> Optional[Tuple[int, np.ndarray]]:
+        """Rebuild the newest stored state at or before a generation.
+
+        Args:
+            generation (int): Requested generation
+
+        Returns:
+            tuple: (stored generation, new grid array), or None if the
+                generation is older than the history
+        """
+        location = self._locate(generation)
+        if location is None:
+            return None
+        index, position = location
+        return self.segments[index].generations[position], self._decode(self._rebuild(index, position))
+
+    def previous(self, generation: int) -> Optional[int]:
+        """Return the newest stored generation before a generation, or None."""
+        location = self._locate(generation - 1)
+        if location is None:
+            return None
+        return self.segments[location[0]].generations[location[1]]
+
+    def next(self, generation: int) -> Optional[int]:
+        """Return the oldest stored generation after a generation, or None."""
+        for segment in self.segments:
+            if segment.generations[-1] > generation:
+                position = int(np.searchsorted(segment.generations, generation, side='right'))
+                return segment.generations[position]
+        return None
+
+    def truncate(self, generation: int) -> None:
+        """Drop the states after a generation, e.g. before stepping from a sought state.
+
+        Args:
+            generation (int): Newest generation kept
+        """
+        while self.segments and self.segments[-1].generations[0] > generation:
+            self.nbytes -= self.segments.pop().nbytes
+        if not self.segments:
+            self._last = None
+            return
+        segment = self.segments[-1]
+        position = int(np.searchsorted(segment.generations, generation, side='right'))
+        if position == len(segment.generations):
+            return
+        for delta in segment.deltas[position - 1:]:
+            segment.nbytes -= len(delta)
+            self.nbytes -= len(delta)
+        del segment.generations[position:]
+        del segment.deltas[position - 1:]
+        self._last = self._rebuild(len(self.segments) - 1, position - 1)
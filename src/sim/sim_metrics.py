@@ -0,0 +1,241 @@
+"""Simulation metrics module.
+
+This module times the phases of the hot path (convolution, growth function,
+clipping, drawing of the simulation and of the function plots) and counts the
+generations computed, to tell where the time of a slow frame goes.
+
+Each phase keeps its latest durations in a rolling window, summarized as
+percentiles (p50, p95) and maximum. The hooks are context managers and
+function wrappers placed around the phases; while the metrics are disabled,
+a hook costs one attribute check and returns a shared no-op context, so it can
+stay in place. Summaries can be appended to a JSON-lines file for dashboards.
+"""
+
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, ContextManager, Deque, Dict, Optional, TextIO, Tuple
+import numpy as np
+
+DEFAULT_WINDOW = 512       # Durations kept per phase
+RATE_WINDOW = 2.0          # Seconds of generation counts behind the actual rate
+
+_DISABLED = contextlib.nullcontext()
+
+
+class PhaseTimes:
+    """Rolling window of the durations of one phase."""
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize an empty window.
+
+        Args:
+            window (int): Number of durations kept
+        """
+        self.samples = np.zeros(window)
+        self.count = 0        # Durations recorded since the last reset
+        self.total = 0.0      # Sum of the durations recorded, in seconds
+
+    def add(self, seconds: float) -> None:
+        """Record a duration, replacing the oldest one once the window is full."""
+        self.samples[self.count % self.samples.size] = seconds
+        self.count += 1
+        self.total += seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the durations of the window.
+
+        Returns:
+            dict: 'count' (all durations recorded), 'p50_ms', 'p95_ms',
+                'max_ms' and 'mean_ms' of the durations of the window
+        """
+        window = self.samples[:min(self.count, self.samples.size)]
+        if window.size == 0:
+            return {'count': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0, 'mean_ms': 0.0}
+        p50, p95 = np.percentile(window, (50, 95)) * 1e3
+        return {'count': self.count, 'p50_ms': float(p50), 'p95_ms': float(p95),
+                'max_ms': float(window.max()) * 1e3, 'mean_ms': float(window.mean()) * 1e3}
+
+
+class _Timer:
+    """Context manager recording the duration of its block into a phase."""
+    __slots__ = ('phase', 'start')
+
+    def __init__(self, phase: PhaseTimes) -> None:
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.phase.add(time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Per-phase timings and generation rate of the simulation.
+
+    The phases timed by the application are:
+    - 'step': update of the model for one frame, any engine
+    - 'convolve', 'growth', 'clip': parts of a generation of the
+      'convolution' and 'buffered' engines
+    - 'draw': drawing of the grid by SimView
+    - 'fi_draw': redraw of the FiView plots, e.g. after a slider change
+    The phases are recorded from the stepping thread and the Tk thread.
+    """
+    PHASES = ('step', 'convolve', 'growth', 'clip', 'draw', 'fi_draw')
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize the metrics.
+
+        Args:
+            enabled (bool): Record the phases from the start
+            window (int): Durations kept per phase
+        """
+        self.enabled = enabled
+        self.window = window
+        self.phases: Dict[str, PhaseTimes] = {}
+        self._lock = threading.Lock()
+        self._generations: Deque[Tuple[float, int]] = deque()
+        self._since = None    # Time of the first generations counted
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the recorded durations and generations."""
+        with self._lock:
+            self.phases = {name: PhaseTimes(self.window) for name in self.PHASES}
+            self._generations.clear()
+            self._since = None
+
+    def _times(self, name: str) -> PhaseTimes:
+        """Return the window of a phase, created on first use."""
+        times = self.phases.get(name)
+        if times is None:
+            with self._lock:
+                times = self.phases.setdefault(name, PhaseTimes(self.window))
+        return times
+
+    def phase(self, name: str) -> ContextManager:
+        """Return a context manager timing its block as a phase.
+
+        Args:
+            name (str): Phase name, see PHASES
+
+        Returns:
+            context manager: No-op while the metrics are disabled
+        """
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self._times(name))
+
+    def timed(self, name: str, fct: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a function so that its calls are timed as a phase.
+
+        Args:
+            name (str): Phase name
+            fct (function): Function to time
+
+        Returns:
+            function: Wrapper calling fct, timed while the metrics are enabled
+        """
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return fct(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fct(*args, **kwargs)
+            finally:
+                self._times(name).add(time.perf_counter() - start)
+        return wrapper
+
+    def count_generations(self, generations: int) -> None:
+        """Count generations computed now, for the actual generation rate."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if self._since is None:
+                self._since = now
+            self._generations.append((now, generations))
+            self._drop_old(now)
+
+    def _drop_old(self, now: float) -> None:
+        """Forget the generation counts older than RATE_WINDOW."""
+        while self._generations and now - self._generations[0][0] > RATE_WINDOW:
+            self._generations.popleft()
+
+    def generations_per_second(self) -> float:
+        """Return the number of generations computed per second recently.
+
+        Returns:
+            float: Rate over the last RATE_WINDOW seconds, 0 without data
+        """
+        now = time.perf_counter()
+        with self._lock:
+            if self._since is None:
+                return 0.0
+            self._drop_old(now)
+            count = sum(generations for _, generations in self._generations)
+            elapsed = min(now - self._since, RATE_WINDOW)
+        return count / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self, **context: Any) -> Dict[str, Any]:
+        """Summarize the metrics.
+
+        Args:
+            **context: Values added to the summary, e.g. the generation or
+                the grid shape
+
+        Returns:
+            dict: 'time' (Unix time), the context, 'generations_per_second'
+                and the summary of each phase with recorded durations in
+                'phases'
+        """
+        phases = {name: times.summary() for name, times in list(self.phases.items())
+                  if times.count}
+        return dict({'time': time.time()}, **context,
+                    generations_per_second=self.generations_per_second(), phases=phases)
+
+    def export(self, file: TextIO, **context: Any) -> Dict[str, Any]:
+        """Append a snapshot as one JSON line.
+
+        Args:
+            file (file): Text file open for writing
+            **context: See snapshot
+
+        Returns:
+            dict: The snapshot written
+        """
+        snapshot = self.snapshot(**context)
+        file.write(json.dumps(snapshot, default=_jsonable) + '\n')
+        file.flush()
+        return snapshot
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert numpy values and tuples of a snapshot context for JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def format_overlay(snapshot: Dict[str, Any], speed: Optional[float] = None) -> str:
+    """Format a snapshot for the metrics overlay.
+
+    Args:
+        snapshot (dict): Snapshot of Metrics.snapshot
+        speed (float, optional): Configured speed, shown next to the actual rate
+
+    Returns:
+        str: One line for the rate, then one line per phase
+    """
+    lines = [f"{snapshot['generations_per_second']:.1f} gen/s"
+             + (f" (set {speed:.0f})" if speed is not None else "")]
+    for name, summary in snapshot['phases'].items():
+        lines.append(f"{name}: {summary['p50_ms']:.2f} / {summary['p95_ms']:.2f}"
+                     f" / {summary['max_ms']:.2f} ms")
+    return "\n".join(lines)
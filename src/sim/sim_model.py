@@ -5,26 +5,74 @@ It defines the core grid structure and state, implements the update rules for bo
 discrete (Game of Life) and continuous (Lenia) cellular automata, and provides
 various initialization patterns for the grid. The model applies update rules using
 convolution with neighborhood kernels and growth functions.
+
+The grid dtype follows a precision policy: discrete grids are stored as uint8
+(any integer or bool grid set from outside keeps its dtype), continuous grids
+in the storage dtype of the selected precision and accumulated in its compute
+dtype, e.g. float16 storage with float32 convolution and growth.
 """
 
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
 import numpy as np
-from scipy.signal import convolve2d
+from .sim_convolution import Convolver
+from .sim_bitboard import BitboardEngine
+from .sim_hashlife import HashLifeEngine
+from .sim_sparse import SparseEngine
+from .sim_tiles import TiledEngine
+from .sim_parallel import ParallelEngine
+from .sim_multiprocess import MultiprocessEngine
+from .sim_record import TrajectoryRecorder
+from .sim_patterns import PatternLibrary
+from .sim_metrics import Metrics
+
+
+def is_discrete(grid: np.ndarray) -> bool:
+    """Return True for a Game of Life grid, stored as integers or booleans."""
+    return grid.dtype == bool or np.issubdtype(grid.dtype, np.integer)
+
 
 class SimModel:
     """Simulation model component.
     
     This class represents the core simulation model for cellular automata.
     It manages the grid state and provides methods for updating and resetting the simulation.
-    """
-    # Pre-calculated kernel for neighbor calculation
     
+    The grid is advanced by one of several engines:
+    - 'convolution': generic engine, convolution followed by the growth function
+    - 'bitboard': bit-packed Game of Life engine, discrete mode only
+    - 'hashlife': HashLife Game of Life engine, discrete mode only
+    - 'sparse': Game of Life engine on an unbounded plane stored as chunks,
+      discrete mode only; the grid is a viewport of the plane
+    - 'tiled': convolution engine that only recomputes active tiles
+    - 'buffered': convolution engine stepping in preallocated buffers
+    - 'parallel': convolution engine stepping horizontal strips in threads
+    - 'multiprocess': convolution engine stepping bands of rows in worker
+      processes over shared memory, for very large grids
+    
+    Continuous grids are stored and computed with one of the PRECISIONS,
+    (storage dtype, compute dtype) pairs. The 'convolution' and 'buffered'
+    engines compute in the compute dtype, the other engines keep their own
+    arithmetic and their result is stored in the storage dtype.
+    """
+    ENGINES = ('convolution', 'bitboard', 'hashlife', 'sparse', 'tiled', 'buffered', 'parallel',
+               'multiprocess')
+    PRECISIONS = {
+        'float64': (np.float64, np.float64),
+        'float32': (np.float32, np.float32),
+        'float16': (np.float16, np.float32),
+    }
+    DISCRETE_DTYPE = np.uint8
     
     def __init__(self, 
                  width: int = 100, 
                  height: int = 100, 
                  initial_alive_prob: 
-                 float = 0.2) -> None:
+                 float = 0.2,
+                 conv_method: str = 'auto',
+                 tile_size: int = 32,
+                 workers: Optional[int] = None,
+                 precision: str = 'float64',
+                 metrics: Optional[Metrics] = None) -> None:
         
         """Initialize the simulation model.
         
@@ -32,27 +80,368 @@ class SimModel:
             width (int): Grid width in cells
             height (int): Grid height in cells
             initial_alive_prob (float): Initial probability for a cell to be alive
+            conv_method (str): Convolution method, 'auto', 'direct' or 'fft'
+            tile_size (int): Side of the tiles of the 'tiled' engine in cells
+            workers (int, optional): Threads of the 'parallel' engine and
+                processes of the 'multiprocess' engine, default the number of CPUs
+            precision (str): Precision of continuous grids, one of SimModel.PRECISIONS
+            metrics (Metrics, optional): Timings of the 'convolve', 'growth' and
+                'clip' phases, disabled metrics by default
         """
         self.width = width
         self.height = height
         self.initial_alive_prob = initial_alive_prob
         self.grid = None
+        self.convolver = Convolver(conv_method)
+        self.engine = 'convolution'
+        self.bitboard = BitboardEngine()
+        self.hashlife = HashLifeEngine()
+        self.sparse = SparseEngine()
+        self.tiled = TiledEngine(tile_size)
+        self._changed_rows = None   # Rows changed by the last update, see get_changed_rows
+        self.parallel = ParallelEngine(workers, conv_method)
+        self.multiprocess = MultiprocessEngine(workers, conv_method)
+        
+        # Front/back grids and scratch array of the 'buffered' engine
+        self._front = None
+        self._back = None
+        self._scratch = None
+        self._source = None
+        
+        # Trajectory recorder, see start_recording
+        self.recorder = None
+        
+        # Phase timings of the convolution engines
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        # Pattern library, and description of the last library pattern loaded
+        self.patterns = PatternLibrary()
+        self.pattern = None
+        
+        # Last kernel cast to a convolution dtype: (kernel, dtype, cast kernel)
+        self._kernel_cast = None
+        self.precision = None
+        self.state_dtype = None
+        self.compute_dtype = None
+        self.set_precision(precision)
+
+    def set_engine(self, engine: str) -> None:
+        """Select the engine used by update.
+        
+        Args:
+            engine (str): Engine name, one of SimModel.ENGINES
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+
+    def set_precision(self, precision: str) -> None:
+        """Select the precision of continuous grids.
+        
+        A continuous grid already loaded is converted to the new storage dtype.
+        
+        Args:
+            precision (str): Precision name, one of SimModel.PRECISIONS
+        """
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.precision = precision
+        self.state_dtype, self.compute_dtype = (np.dtype(dtype) for dtype in self.PRECISIONS[precision])
+        if self.grid is not None and not is_discrete(self.grid):
+            self.grid = self.grid.astype(self.state_dtype, copy=False)
+
+    def _store(self, grid: np.ndarray, like: np.ndarray) -> np.ndarray:
+        """Return an engine result in the storage dtype of the grid it was computed from."""
+        if is_discrete(like):
+            return grid.astype(like.dtype, copy=False)
+        return grid.astype(self.state_dtype, copy=False)
 
-    def update(self, fct: Callable[[np.ndarray], np.ndarray], nhood: np.ndarray, dt: float) -> None:
-        """Update the grid state for one generation.
+    @staticmethod
+    def _is_discrete_rule(grid: np.ndarray, nhood: np.ndarray, dt: float) -> bool:
+        """Return True when a step keeps the grid discrete.
+        
+        The discrete rule counts neighbors with an integer kernel and applies
+        the whole change at once (dt = 1). Other rules on a discrete grid
+        produce fractional states and step the grid in the continuous precision.
+        """
+        return is_discrete(grid) and np.issubdtype(nhood.dtype, np.integer) and dt == 1
+
+    def _cast_kernel(self, nhood: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """Return the kernel in a convolution dtype.
+        
+        Read-only kernels, like the cached FiModel kernels, are converted once.
+        """
+        if nhood.dtype == dtype:
+            return nhood
+        cached = self._kernel_cast
+        if cached is not None and cached[0] is nhood and cached[1] == dtype:
+            return cached[2]
+        kernel = nhood.astype(dtype)
+        if not nhood.flags.writeable:
+            self._kernel_cast = (nhood, dtype, kernel)
+        return kernel
+
+    def update(self,
+               fct: Callable[[np.ndarray], np.ndarray],
+               nhood: np.ndarray,
+               dt: float,
+               nhood_key: Optional[Hashable] = None,
+               growth_key: Optional[Hashable] = None,
+               generations: int = 1) -> None:
+        """Update the grid state for one or more generations.
         
         Applies the cellular automata rules by convolving the neighborhood kernel
-        with the current grid, then applying the growth function.
+        with the current grid, then applying the growth function. The discrete
+        engines implement the Game of Life rules directly and ignore fct, nhood
+        and dt. The bitboard, HashLife and multiprocess engines compute several
+        generations in one call, the others repeat single steps. While recording,
+        the generations are split so that every recorded generation is stored.
         
         Args:
             fct (function): Growth function to apply
             nhood (numpy.ndarray): Neighborhood kernel
             dt (float): Time step (1.0 for discrete, smaller for continuous)
+            nhood_key (hashable, optional): Key identifying the kernel parameters,
+                used to cache the kernel spectrum of the FFT convolution
+            growth_key (hashable, optional): Key identifying the growth function
+                parameters, used by the 'tiled' and 'multiprocess' engines to
+                detect rule changes
+            generations (int): Number of generations to compute
         """
-        neighbors = convolve2d(self.grid, nhood, mode='same', boundary='wrap')
-        self.grid = self.grid + dt * fct(neighbors)
-        self.grid = np.clip(self.grid, 0, 1)
+        self._changed_rows = None
+        if self.engine == 'tiled' and self.grid is not None:
+            self._changed_rows = np.zeros(self.grid.shape[0], dtype=bool)
+        if self.recorder is None:
+            self._advance(fct, nhood, dt, nhood_key, growth_key, generations)
+            return
+        while generations > 0:
+            batch = min(generations, self.recorder.pending())
+            self._advance(fct, nhood, dt, nhood_key, growth_key, batch)
+            self.recorder.record(self.grid, batch)
+            generations -= batch
     
+    def _advance(self,
+                 fct: Callable[[np.ndarray], np.ndarray],
+                 nhood: np.ndarray,
+                 dt: float,
+                 nhood_key: Optional[Hashable],
+                 growth_key: Optional[Hashable],
+                 generations: int) -> None:
+        """Update the grid for one or more generations with the selected engine."""
+        match self.engine:
+            case 'bitboard':
+                self.grid = self.bitboard.advance(self.grid, generations)
+            case 'hashlife':
+                self.grid = self.hashlife.advance(self.grid, generations)
+            case 'sparse':
+                self.grid = self.sparse.advance(self.grid, generations)
+            case 'multiprocess':
+                grid = self.multiprocess.advance(self.grid, fct, nhood, dt, nhood_key,
+                                                 growth_key, generations)
+                self.grid = self._store(grid, self.grid)
+            case _:
+                for _ in range(generations):
+                    self._update_once(fct, nhood, dt, nhood_key, growth_key)
+    
+    def _update_once(self,
+                     fct: Callable[[np.ndarray], np.ndarray],
+                     nhood: np.ndarray,
+                     dt: float,
+                     nhood_key: Optional[Hashable],
+                     growth_key: Optional[Hashable]) -> None:
+        """Update the grid for one generation with a convolution engine."""
+        match self.engine:
+            case 'tiled':
+                rule_key = None
+                if nhood_key is not None and growth_key is not None:
+                    rule_key = (nhood_key, growth_key, dt)
+                self.grid = self.tiled.advance(self.grid, fct, nhood, dt, rule_key)
+                if self._changed_rows is not None:
+                    self._changed_rows |= self.tiled.changed_rows()
+            case 'buffered':
+                self._update_buffered(fct, nhood, dt, nhood_key)
+            case 'parallel':
+                grid = self.parallel.advance(self.grid, fct, nhood, dt, nhood_key)
+                self.grid = self._store(grid, self.grid)
+            case _:
+                self._update_convolution(fct, nhood, dt, nhood_key)
+    
+    def _update_convolution(self,
+                            fct: Callable[[np.ndarray], np.ndarray],
+                            nhood: np.ndarray,
+                            dt: float,
+                            nhood_key: Optional[Hashable]) -> None:
+        """Update the grid for one generation in its precision.
+        
+        Discrete grids stepped with the discrete rule are convolved with the
+        kernel cast to their integer dtype, so that int8/uint8 neighbor counts
+        reach the growth lookup table, and stay integers. Other grids, and
+        discrete grids stepped with a continuous rule like Lenia, are convolved
+        and grown in the compute dtype, then stored in the storage dtype.
+        """
+        grid = self.grid
+        metrics = self.metrics
+        integer_kernel = np.issubdtype(nhood.dtype, np.integer)
+        if self._is_discrete_rule(grid, nhood, dt):
+            kernel = self._cast_kernel(nhood, np.dtype(np.uint8) if grid.dtype == bool else grid.dtype)
+            with metrics.phase('convolve'):
+                neighbors = self.convolver.convolve(grid, kernel, nhood_key)
+            with metrics.phase('growth'):
+                change = fct(neighbors)
+            if np.issubdtype(change.dtype, np.integer):
+                with metrics.phase('clip'):
+                    updated = np.add(grid, change, dtype=np.int16)
+                    np.clip(updated, 0, 1, out=updated)
+                    self.grid = updated.astype(grid.dtype)
+                return
+            # A growth with fractional values promotes the grid
+            source = grid.astype(self.compute_dtype)
+        else:
+            # Discrete grids are promoted, rounding them would freeze a continuous rule
+            source = grid.astype(self.compute_dtype, copy=False)
+            # Integer kernels on a float grid give fractional sums, left unrounded by the convolver
+            kernel = nhood if integer_kernel else self._cast_kernel(nhood, self.compute_dtype)
+            with metrics.phase('convolve'):
+                neighbors = self.convolver.convolve(source, kernel, nhood_key)
+            with metrics.phase('growth'):
+                change = fct(neighbors)
+        with metrics.phase('clip'):
+            updated = source + dt * change
+            np.clip(updated, 0, 1, out=updated)
+            self.grid = updated.astype(self.state_dtype, copy=False)
+    
+    def _update_buffered(self,
+                         fct: Callable[..., np.ndarray],
+                         nhood: np.ndarray,
+                         dt: float,
+                         nhood_key: Optional[Hashable]) -> None:
+        """Update the grid in preallocated buffers.
+        
+        The new generation is written into the back buffer, then front and back
+        are swapped. With the FFT convolution no array is allocated per step.
+        Front and back hold the grid in its storage dtype, the neighborhood sums
+        and growth are computed in a scratch array of the compute dtype (float64
+        for discrete grids stepped with the discrete rule, which stay integers).
+        The growth function must accept an ``out`` argument, like the FiModel
+        growth functions. The grid returned by get_grid is overwritten two
+        generations later, copy it to keep it.
+        
+        Args:
+            fct (function): Growth function accepting ``out``
+            nhood (numpy.ndarray): Neighborhood kernel
+            dt (float): Time step
+            nhood_key (hashable, optional): Key identifying the kernel parameters
+        """
+        discrete = self._is_discrete_rule(self.grid, nhood, dt)
+        dtype = self.grid.dtype if discrete else self.state_dtype
+        if self.grid is not self._front or self._front.dtype != dtype:
+            # The grid was reset, set from outside or promoted by a continuous
+            # rule: load it into new buffers
+            compute = np.float64 if discrete else self.compute_dtype
+            self._front = np.array(self.grid, dtype=dtype)
+            self._back = np.empty_like(self._front)
+            self._scratch = np.empty(self._front.shape, dtype=compute)
+            # Copy of the front buffer in the compute dtype, for float16 storage
+            self._source = None if discrete or dtype == compute else np.empty_like(self._scratch)
+        
+        source = self._front
+        if self._source is not None:
+            np.copyto(self._source, self._front)
+            source = self._source
+        kernel = nhood if discrete or np.issubdtype(nhood.dtype, np.integer) \
+            else self._cast_kernel(nhood, self._scratch.dtype)
+        metrics = self.metrics
+        with metrics.phase('convolve'):
+            self.convolver.convolve(source, kernel, nhood_key, out=self._scratch)
+        with metrics.phase('growth'):
+            fct(self._scratch, out=self._scratch)
+        with metrics.phase('clip'):
+            self._scratch *= dt
+            if self._back.dtype == self._scratch.dtype:
+                np.add(source, self._scratch, out=self._back)
+                np.clip(self._back, 0, 1, out=self._back)
+            else:
+                self._scratch += source
+                np.clip(self._scratch, 0, 1, out=self._scratch)
+                np.copyto(self._back, self._scratch, casting='unsafe')
+        
+        self._front, self._back = self._back, self._front
+        self.grid = self._front
+
+    def fast_forward(self, generations: int) -> None:
+        """Advance a discrete grid by many generations with the HashLife engine.
+        
+        Power-of-two grids wrap like the other engines, other grids evolve in an
+        unbounded plane and the grid shows the window they were loaded in.
+        
+        Args:
+            generations (int): Number of generations to compute
+        """
+        self.grid = self.hashlife.advance(self.grid, generations)
+    
+    def get_changed_rows(self) -> Optional[np.ndarray]:
+        """Return the rows changed by the last update, when the engine tracks them.
+        
+        Returns:
+            numpy.ndarray: Boolean array, True for the rows that may differ
+                between the grids before and after the last update call, None
+                for the engines other than 'tiled'
+        """
+        return self._changed_rows
+    
+    def get_active_tiles(self) -> Tuple[int, int]:
+        """Return the tile activity of the last 'tiled' step.
+        
+        Returns:
+            tuple: (number of recomputed tiles, total number of tiles)
+        """
+        return self.tiled.active_tiles, self.tiled.total_tiles
+
+    def get_worker_times(self) -> List[Dict[str, Any]]:
+        """Return the per-worker timing of the last 'multiprocess' step.
+        
+        Returns:
+            list: One dict per worker, see MultiprocessEngine.worker_times
+        """
+        return self.multiprocess.worker_times()
+
+    def start_recording(self,
+                        path: str,
+                        every: int = 1,
+                        metadata: Optional[Dict[str, Any]] = None,
+                        dtype: Any = None) -> TrajectoryRecorder:
+        """Record the current grid and the generations computed by update.
+        
+        Args:
+            path (str): Trajectory file, see sim_record
+            every (int): Record one generation out of every
+            metadata (dict, optional): Run description stored in the header,
+                e.g. the mode and the FiModel parameters
+            dtype (optional): Data type of the stored cells, default uint8 for
+                integer grids and the grid type otherwise
+        
+        Returns:
+            TrajectoryRecorder: The recorder, also stored in self.recorder
+        """
+        self.stop_recording()
+        if dtype is None:
+            dtype = np.uint8 if is_discrete(self.grid) else self.grid.dtype
+        self.recorder = TrajectoryRecorder(path, self.grid.shape, dtype, every, metadata=metadata)
+        self.recorder.append(self.grid)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        """Close the trajectory file of the current recording, if any."""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def close(self) -> None:
+        """Stop the recording and the worker threads and processes of the parallel engines."""
+        self.stop_recording()
+        self.parallel.shutdown()
+        self.multiprocess.close()
+
     def get_grid(self) -> np.ndarray:
         """Return the current grid.
         
@@ -61,8 +450,45 @@ class SimModel:
         """
         return self.grid
 
-    def reset_discrete(self, num: int) -> None:
+    def get_window(self, top: int, left: int, rows: int, cols: int) -> np.ndarray:
+        """Return a rectangle of the cells as a dense grid.
+
+        With the 'sparse' engine, the rectangle can be anywhere on the plane,
+        in the coordinates of the grid when it was loaded. With the other
+        engines, the grid wraps toroidally.
+
+        Args:
+            top (int): Row of the first row
+            left (int): Column of the first column
+            rows (int): Number of rows
+            cols (int): Number of columns
+
+        Returns:
+            numpy.ndarray: New grid in the dtype of the current grid
+        """
+        if self.engine == 'sparse':
+            self.sparse.sync(self.grid)
+            return self.sparse.window(top, left, rows, cols, self.grid.dtype)
+        row_index = np.arange(top, top + rows) % self.grid.shape[0]
+        col_index = np.arange(left, left + cols) % self.grid.shape[1]
+        return self.grid[np.ix_(row_index, col_index)]
+
+    def set_viewport(self, top: int, left: int) -> None:
+        """Move the grid of the 'sparse' engine over the plane, keeping its shape.
+
+        Args:
+            top (int): Plane row of the first grid row
+            left (int): Plane column of the first grid column
+        """
+        if self.engine != 'sparse':
+            raise ValueError("Only the 'sparse' engine has a movable viewport")
+        self.sparse.sync(self.grid)
+        self.grid = self.sparse.set_viewport(top, left, *self.grid.shape)
+
+    def reset_discrete(self, num: Union[int, str]) -> None:
         match num:
+            case str():
+                self.load_pattern(num)
             case 0:
                 self.random()
             case 1:
@@ -82,7 +508,7 @@ class SimModel:
             [0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
             [0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]])
 
-        self.grid = np.zeros((self.width, self.height))
+        self.grid = np.zeros((self.width, self.height), dtype=self.DISCRETE_DTYPE)
         pos_x = self.width//6
         pos_y = self.height//6
         self.grid[pos_x:(pos_x + glider_gun.shape[1]), pos_y:(pos_y + glider_gun.shape[0])] = glider_gun.T
@@ -96,18 +522,21 @@ class SimModel:
             [0, 1],
             self.width * self.height,
             p=[1-self.initial_alive_prob, self.initial_alive_prob]
-        ).reshape(self.height, self.width).astype(np.int8)
+        ).reshape(self.height, self.width).astype(self.DISCRETE_DTYPE)
 
-    def reset_continuous(self, num: int) -> None:
+    def reset_continuous(self, num: Union[int, str]) -> None:
         """Reset the grid with a continuous pattern based on the numeric value.
         
         Args:
-            num (int): Pattern selector:
+            num (int or str): Pattern selector:
                 - 0: Stain pattern (centered Gaussian spot)
                 - 1: Orbium pattern (Lenia spaceship)
+                - Name of a pattern of the library, see load_pattern
                 - Other values: No action
         """
         match num:
+            case str():
+                self.load_pattern(num)
             case 0:
                 self.stain()
             case 1:
@@ -115,6 +544,30 @@ class SimModel:
             case _:
                 return
 
+    def load_pattern(self, name: str) -> None:
+        """Reset the grid with a pattern of the library, centered.
+
+        Discrete patterns are loaded in a uint8 grid of the model size, Lenia
+        patterns in a grid of the size of the orbium pattern, in the storage
+        dtype. The grid is enlarged to fit a larger pattern.
+
+        Args:
+            name (str): Pattern name, see PatternLibrary.names
+        """
+        info = self.patterns.info(name)
+        if info['kind'] == 'continuous':
+            n = 128
+            rows, cols, dtype = n, int(np.ceil((16*n)/9)), self.state_dtype
+        else:
+            rows, cols, dtype = self.height, self.width, self.DISCRETE_DTYPE
+        # Keep a dead border around the pattern, the grid is a torus
+        rows = max(rows, info['height'] + 2)
+        cols = max(cols, info['width'] + 2)
+        grid = np.zeros((rows, cols), dtype=dtype)
+        offset = ((rows - info['height']) // 2, (cols - info['width']) // 2)
+        self.grid = self.patterns.load(name, grid, offset)
+        self.pattern = info
+
     def stain(self) -> None:
         """Create a centered Gaussian stain pattern.
         
@@ -126,7 +579,7 @@ class SimModel:
         # Gaussian spot centered in the middle
         radius = 36
         y, x = np.ogrid[-n//2:n//2, -n//2:n//2]
-        self.grid = np.exp(-0.5 * (x*x + y*y) / (radius*radius))
+        self.grid = np.exp(-0.5 * (x*x + y*y) / (radius*radius)).astype(self.state_dtype)
 
 
     def orbium(self) -> None:
@@ -142,4 +595,5 @@ class SimModel:
         pos_x = m//6
         pos_y = n//6
         self.grid[pos_x:(pos_x + orbium.shape[1]), pos_y:(pos_y + orbium.shape[0])] = orbium.T
+        self.grid = self.grid.astype(self.state_dtype, copy=False)
         
@@ -0,0 +1,303 @@
+"""Simulation multiprocess module.
+
+This module provides a process-pool engine for very large grids. The grid lives
+in two shared memory buffers (front and back) and every worker process owns a
+band of rows. At each generation a worker reads its band and the halo rows of
+its neighbors from the front buffer, writes its new band into the back buffer,
+and waits on a barrier before the buffers swap. Grids are never pickled: only
+the rule (growth function, kernel, time step) is sent to the workers, once per
+rule change.
+"""
+
+import multiprocessing as mp
+import os
+import pickle
+import threading
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from .sim_convolution import Convolver
+from .sim_parallel import step_strip
+
+# Commands written to the control block before releasing the workers
+STEP = 1
+STOP = 2
+
+# Control block fields
+COMMAND = 0
+GENERATIONS = 1
+FRONT = 2
+NEW_RULE = 3
+CONTROL_SIZE = 4
+
+# Seconds allowed for the workers to start (spawn imports NumPy and SciPy)
+STARTUP_TIMEOUT = 60
+
+
+def _worker(index: int,
+            grid_name: str,
+            control_name: str,
+            timing_name: str,
+            shape: Tuple[int, int],
+            bounds: Tuple[int, int],
+            workers: int,
+            conv_method: str,
+            start: Any,
+            step: Any,
+            conn: Any) -> None:
+    """Worker process loop.
+
+    Joins the start barrier once attached to the shared memory, then waits on
+    it for each command: it runs the requested generations on its band with
+    a step barrier after each of them, then waits on the start barrier again to
+    report completion.
+
+    Args:
+        index (int): Worker index
+        grid_name (str): Shared memory block of the front and back grids
+        control_name (str): Shared memory block of the control fields
+        timing_name (str): Shared memory block of the per-worker timings
+        shape (tuple): Shape of the grid
+        bounds (tuple): (first row, end row) of the band owned by the worker
+        workers (int): Number of workers
+        conv_method (str): Convolution method of the band
+        start (multiprocessing.Barrier): Barrier shared with the main process
+        step (multiprocessing.Barrier): Barrier between the workers
+        conn (multiprocessing.connection.Connection): Receives the rule
+    """
+    blocks = [shared_memory.SharedMemory(name=name)
+              for name in (grid_name, control_name, timing_name)]
+    grids = np.ndarray((2,) + tuple(shape), dtype=np.float64, buffer=blocks[0].buf)
+    control = np.ndarray(CONTROL_SIZE, dtype=np.int64, buffer=blocks[1].buf)
+    timings = np.ndarray((workers, 2), dtype=np.float64, buffer=blocks[2].buf)
+    convolver = Convolver(conv_method)
+    r0, r1 = bounds
+    rule = None
+    try:
+        start.wait()
+        while True:
+            start.wait()
+            if control[COMMAND] == STOP:
+                break
+            if control[NEW_RULE]:
+                rule = pickle.loads(conn.recv_bytes())
+            fct, nhood, dt, nhood_key = rule
+
+            front = int(control[FRONT])
+            compute = wait = 0.0
+            for _ in range(int(control[GENERATIONS])):
+                begin = time.perf_counter()
+                grids[1 - front, r0:r1] = step_strip(grids[front], bounds, fct, nhood, dt,
+                                                     convolver, nhood_key)
+                middle = time.perf_counter()
+                step.wait()
+                compute += middle - begin
+                wait += time.perf_counter() - middle
+                front = 1 - front
+            timings[index] = (compute, wait)
+            start.wait()
+    except Exception:
+        # Release the main process and the other workers instead of hanging
+        start.abort()
+        step.abort()
+        raise
+    finally:
+        del grids, control, timings
+        for block in blocks:
+            block.close()
+
+
+def _release(processes: List[Any], blocks: List[shared_memory.SharedMemory]) -> None:
+    """Terminate the workers and free the shared memory of an engine."""
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Arrays still view the block at interpreter exit
+            pass
+        block.unlink()
+
+
+class MultiprocessEngine:
+    """Shared memory process-pool engine.
+
+    This class advances the grid with the same convolution and growth rules as
+    the convolution engine, split into bands of rows computed by worker
+    processes (see ParallelEngine for the halo and exactness rules). The workers
+    start on the first advance and restart when the grid shape changes. The
+    growth function and kernel must be picklable, like the FiModel growth
+    functions.
+    """
+    def __init__(self, workers: Optional[int] = None, conv_method: str = 'auto') -> None:
+        """Initialize the multiprocess engine.
+
+        Args:
+            workers (int, optional): Number of worker processes and bands.
+                Default is the number of CPUs.
+            conv_method (str): Convolution method of the bands, 'auto',
+                'direct' or 'fft'
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        if conv_method not in Convolver.METHODS:
+            raise ValueError(f"Unknown convolution method: {conv_method}")
+        self.workers = workers
+        self.conv_method = conv_method
+        self.bands: List[Tuple[int, int]] = []
+        self._shape = None
+        self._processes = []
+        self._conns = []
+        self._start = None
+        self._step = None
+        self._grids = None
+        self._control = None
+        self._timings = None
+        self._finalizer = None
+        self._front = 0
+        self._rule_key = None
+        self._dense = None     # Last grid returned by advance()
+
+    def _launch(self, shape: Tuple[int, int]) -> None:
+        """Allocate the shared memory and start one worker per band.
+
+        Args:
+            shape (tuple): Shape of the grid
+        """
+        self.close()
+        rows = shape[0]
+        bounds = np.linspace(0, rows, min(self.workers, rows) + 1).astype(int)
+        self.bands = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        n_workers = len(self.bands)
+
+        blocks = [shared_memory.SharedMemory(create=True, size=2 * shape[0] * shape[1] * 8),
+                  shared_memory.SharedMemory(create=True, size=CONTROL_SIZE * 8),
+                  shared_memory.SharedMemory(create=True, size=n_workers * 2 * 8)]
+        self._grids = np.ndarray((2,) + tuple(shape), dtype=np.float64, buffer=blocks[0].buf)
+        self._control = np.ndarray(CONTROL_SIZE, dtype=np.int64, buffer=blocks[1].buf)
+        self._timings = np.ndarray((n_workers, 2), dtype=np.float64, buffer=blocks[2].buf)
+        self._timings[...] = 0
+
+        # Spawned workers do not inherit the threads of this process
+        context = mp.get_context('spawn')
+        self._start = context.Barrier(n_workers + 1)
+        self._step = context.Barrier(n_workers)
+        for index, bounds in enumerate(self.bands):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_worker,
+                args=(index, blocks[0].name, blocks[1].name, blocks[2].name, tuple(shape),
+                      bounds, n_workers, self.conv_method, self._start, self._step, receiver),
+                name=f'sim-band-{index}', daemon=True)
+            process.start()
+            self._processes.append(process)
+            self._conns.append(sender)
+
+        self._finalizer = weakref.finalize(self, _release, self._processes, blocks)
+        self._shape = tuple(shape)
+        self._rule_key = None
+        try:
+            self._start.wait(timeout=STARTUP_TIMEOUT)
+        except threading.BrokenBarrierError as error:
+            self.close()
+            raise RuntimeError("The simulation worker processes failed to start") from error
+
+    def advance(self,
+                grid: np.ndarray,
+                fct: Callable[[np.ndarray], np.ndarray],
+                nhood: np.ndarray,
+                dt: float,
+                nhood_key: Optional[Hashable] = None,
+                growth_key: Optional[Hashable] = None,
+                generations: int = 1) -> np.ndarray:
+        """Advance the grid in the worker processes.
+
+        Args:
+            grid (numpy.ndarray): Current grid
+            fct (function): Growth function to apply, must be picklable
+            nhood (numpy.ndarray): Neighborhood kernel
+            dt (float): Time step
+            nhood_key (hashable, optional): Key identifying the kernel parameters
+            growth_key (hashable, optional): Key identifying the growth function
+                parameters. If a key is None, the growth function, kernel and
+                time step are compared instead, which misses in-place parameter
+                changes.
+            generations (int): Number of generations to compute
+
+        Returns:
+            numpy.ndarray: New grid, with the dtype of the input grid
+        """
+        if self._shape != grid.shape:
+            self._launch(grid.shape)
+        if grid is not self._dense:
+            self._grids[self._front] = grid
+
+        if nhood_key is None or growth_key is None:
+            rule_key = (fct, nhood.shape, nhood.tobytes(), dt)
+        else:
+            rule_key = (nhood_key, growth_key, dt)
+        new_rule = rule_key != self._rule_key
+        if new_rule:
+            # Pickled before releasing the workers, which would otherwise wait
+            # for a rule that fails to pickle
+            payload = pickle.dumps((fct, nhood, dt, nhood_key))
+
+        self._control[COMMAND] = STEP
+        self._control[GENERATIONS] = generations
+        self._control[FRONT] = self._front
+        self._control[NEW_RULE] = new_rule
+        try:
+            self._start.wait()   # Release the workers
+            if new_rule:
+                # Sent once the workers are receiving, a large kernel could
+                # otherwise fill the pipe
+                for conn in self._conns:
+                    conn.send_bytes(payload)
+                self._rule_key = rule_key
+            self._start.wait()   # Wait for the last generation
+        except threading.BrokenBarrierError as error:
+            self.close()
+            raise RuntimeError("A simulation worker process failed") from error
+        self._front = (self._front + generations) % 2
+
+        self._dense = self._grids[self._front].astype(grid.dtype)
+        return self._dense
+
+    def worker_times(self) -> List[Dict[str, Any]]:
+        """Return the timing of each worker for the last advance.
+
+        A worker with a short wait time is the slowest one, the others wait for
+        it at the barrier.
+
+        Returns:
+            list: One dict per worker with 'rows' (band bounds), 'compute' and
+                'wait' (seconds)
+        """
+        if self._timings is None:
+            return []
+        return [{'rows': bounds, 'compute': float(compute), 'wait': float(wait)}
+                for bounds, (compute, wait) in zip(self.bands, self._timings)]
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self._finalizer is None or not self._finalizer.alive:
+            return
+        self._control[COMMAND] = STOP
+        try:
+            self._start.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        for conn in self._conns:
+            conn.close()
+        self._grids = self._control = self._timings = None
+        self._finalizer()
+        self._processes, self._conns = [], []
+        self._shape = None
+        self._dense = None
@@ -0,0 +1,146 @@
+"""Simulation parallel module.
+
+This module provides a multi-threaded engine that splits the grid into
+horizontal strips and steps them concurrently. Each strip reads a halo of rows
+as wide as the kernel reach above and below it, gathered with toroidal wrap, so
+the strips are independent and the result matches the convolution engine of the
+simulation model. NumPy and SciPy release the GIL in their convolution and FFT
+kernels, so the strips run on several cores.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, List, Optional, Tuple
+import numpy as np
+from .sim_convolution import Convolver
+
+
+def step_strip(grid: np.ndarray,
+               bounds: Tuple[int, int],
+               fct: Callable[[np.ndarray], np.ndarray],
+               nhood: np.ndarray,
+               dt: float,
+               convolver: Convolver,
+               nhood_key: Optional[Hashable] = None) -> np.ndarray:
+    """Compute the next generation of a band of rows.
+
+    The band and its halo are convolved periodically: the columns wrap like
+    the full grid, and the wrap of the rows only reaches the halo rows, which
+    are dropped.
+
+    Args:
+        grid (numpy.ndarray): Current grid
+        bounds (tuple): (first row, end row) of the band
+        fct (function): Growth function to apply
+        nhood (numpy.ndarray): Neighborhood kernel
+        dt (float): Time step
+        convolver (Convolver): Convolver of the band
+        nhood_key (hashable, optional): Key identifying the kernel parameters
+
+    Returns:
+        numpy.ndarray: New cells of the band
+    """
+    r0, r1 = bounds
+    # Rows read before and after each output cell, as in convolve2d 'same'
+    before = nhood.shape[0] // 2
+    after = (nhood.shape[0] - 1) // 2
+    region = np.take(grid, np.arange(r0 - before, r1 + after), axis=0, mode='wrap')
+
+    neighbors = convolver.convolve(region, nhood, nhood_key)[before:before + r1 - r0]
+    return np.clip(grid[r0:r1] + dt * fct(neighbors), 0, 1)
+
+
+class ParallelEngine:
+    """Strip-parallel convolution engine.
+
+    This class advances the grid with the same convolution and growth rules as
+    the convolution engine. The grid is split into one strip per worker, every
+    strip is convolved with its halo rows and the growth function is applied,
+    then the strips are stacked back together.
+
+    With the direct convolution, or with an integer kernel on a discrete grid
+    such as the Game of Life, the result is bit-identical to the single-threaded
+    engine. Otherwise the FFT convolution of both agrees up to rounding errors.
+    """
+    def __init__(self, workers: Optional[int] = None, conv_method: str = 'auto') -> None:
+        """Initialize the parallel engine.
+
+        Args:
+            workers (int, optional): Number of threads and strips. Default is
+                the number of CPUs.
+            conv_method (str): Convolution method of the strips, 'auto',
+                'direct' or 'fft'
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        if conv_method not in Convolver.METHODS:
+            raise ValueError(f"Unknown convolution method: {conv_method}")
+        self.workers = workers
+        self.conv_method = conv_method
+        self._pool = None
+        # One convolver per strip, each caches the spectrum of its strip shape
+        self._convolvers: List[Convolver] = []
+
+    def strips(self, rows: int) -> List[Tuple[int, int]]:
+        """Split the rows of the grid into strips.
+
+        Args:
+            rows (int): Number of rows of the grid
+
+        Returns:
+            list: (first row, end row) of each strip, at most one per worker
+        """
+        bounds = np.linspace(0, rows, min(self.workers, rows) + 1).astype(int)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def _step_strip(self,
+                    index: int,
+                    grid: np.ndarray,
+                    bounds: Tuple[int, int],
+                    fct: Callable[[np.ndarray], np.ndarray],
+                    nhood: np.ndarray,
+                    dt: float,
+                    nhood_key: Optional[Hashable]) -> np.ndarray:
+        """Compute the next generation of one strip with its own convolver."""
+        return step_strip(grid, bounds, fct, nhood, dt, self._convolvers[index], nhood_key)
+
+    def advance(self,
+                grid: np.ndarray,
+                fct: Callable[[np.ndarray], np.ndarray],
+                nhood: np.ndarray,
+                dt: float,
+                nhood_key: Optional[Hashable] = None) -> np.ndarray:
+        """Advance the grid by one generation, one strip per worker.
+
+        Args:
+            grid (numpy.ndarray): Current grid
+            fct (function): Growth function to apply, called concurrently
+            nhood (numpy.ndarray): Neighborhood kernel
+            dt (float): Time step
+            nhood_key (hashable, optional): Key identifying the kernel parameters,
+                used to cache the kernel spectrum of each strip
+
+        Returns:
+            numpy.ndarray: New grid
+        """
+        strips = self.strips(grid.shape[0])
+        while len(self._convolvers) < len(strips):
+            self._convolvers.append(Convolver(self.conv_method))
+
+        if len(strips) == 1:
+            return self._step_strip(0, grid, strips[0], fct, nhood, dt, nhood_key)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='sim-strip')
+        futures = [self._pool.submit(self._step_strip, index, grid, bounds, fct, nhood, dt, nhood_key)
+                   for index, bounds in enumerate(strips)]
+        return np.concatenate([future.result() for future in futures], axis=0)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads. They are restarted by the next advance."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,479 @@
+"""Simulation pattern module.
+
+This module loads patterns from files and from an on-disk pattern library.
+Three formats are read:
+- Golly RLE (.rle): run-length encoded cells after an 'x = .., y = ..' header
+- plaintext (.cells): one line of '.' and 'O' per row, '!' comment lines
+- Lenia JSON (.json): the animal format of Lenia, with the growth parameters
+  in 'params' and the cells in 'cells', an RLE whose states 'A' to 'yO'
+  encode values from 1/255 to 1
+
+The files are parsed as a stream: runs of cells are written straight into a
+preallocated grid at an offset, line by line or token by token, so that large
+patterns are never expanded into Python lists.
+
+The library is a directory of pattern files with an index.json file giving
+the name, format, bounding box, rule and period of each pattern, so listing
+and looking up patterns does not open the pattern files.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+import numpy as np
+
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patterns')
+INDEX_FILE = 'index.json'
+FORMATS = {'.rle': 'rle', '.cells': 'cells', '.json': 'lenia'}
+LENIA_MAX_STATE = 255      # State of a cell of value 1 in Lenia cells
+MAX_PERIOD = 64            # Longest period measured when building the index
+
+_TOKEN = re.compile(r'(\d*)([p-y][A-X]|[A-Xa-z.$!])')
+_PARTIAL = re.compile(r'\d*[p-y]?$')     # Token cut at the end of a chunk
+_SPACE = re.compile(r'\s+')
+_HEADER = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+_PERIOD = re.compile(r'period\s*[:=]?\s*(\d+)', re.IGNORECASE)
+
+
+class _RleDecoder:
+    """Incremental RLE decoder writing runs into a grid region.
+
+    Without a grid, the decoder only measures the extent of the pattern.
+    """
+    def __init__(self, target: Optional[np.ndarray] = None, lenia: bool = False) -> None:
+        self.target = target
+        self.lenia = lenia
+        self.scale = target is not None and not (target.dtype == bool or np.issubdtype(target.dtype, np.integer))
+        self.row = 0
+        self.col = 0
+        self.width = 0
+        self.done = False
+        self._carry = ''
+
+    def _state(self, symbol: str) -> int:
+        """Return the state of an RLE cell symbol."""
+        if symbol in 'b.':
+            return 0
+        if symbol == 'o':
+            return LENIA_MAX_STATE if self.lenia else 1
+        if len(symbol) == 2:
+            return (ord(symbol[0]) - ord('p')) * 24 + ord(symbol[1]) - ord('A') + 25
+        if 'A' <= symbol <= 'X':
+            return ord(symbol) - ord('A') + 1
+        raise ValueError(f"Invalid RLE cell state: {symbol!r}")
+
+    def feed(self, text: str) -> None:
+        """Decode a chunk of the RLE body."""
+        text = self._carry + _SPACE.sub('', text)
+        cut = _PARTIAL.search(text).start()
+        self._carry, text = text[cut:], text[:cut]
+        position = 0
+        for match in _TOKEN.finditer(text):
+            if self.done:
+                return
+            if match.start() != position:
+                raise ValueError(f"Invalid RLE data: {text[position:match.start()]!r}")
+            position = match.end()
+            count = int(match.group(1) or 1)
+            symbol = match.group(2)
+            if symbol == '$':
+                self.row += count
+                self.col = 0
+            elif symbol == '!':
+                self.done = True
+            else:
+                self._run(self._state(symbol), count)
+        if position != len(text) and not self.done:
+            raise ValueError(f"Invalid RLE data: {text[position:]!r}")
+
+    def _run(self, state: int, count: int) -> None:
+        """Write a run of cells of one state."""
+        end = self.col + count
+        if state and self.target is not None:
+            rows, cols = self.target.shape
+            if self.row >= rows or end > cols:
+                raise ValueError("The pattern exceeds its bounding box")
+            if self.scale:
+                value = state / LENIA_MAX_STATE if self.lenia else 1
+            else:
+                value = 1
+            self.target[self.row, self.col:end] = value
+        if state:
+            self.width = max(self.width, end)
+        self.col = end
+
+    def close(self) -> Tuple[int, int]:
+        """Finish decoding and return the (rows, columns) extent of the live cells."""
+        if self._carry:
+            raise ValueError(f"Truncated RLE data: {self._carry!r}")
+        rows = self.row + (1 if self.col else 0)
+        return rows, self.width
+
+
+def _region(grid: np.ndarray, offset: Tuple[int, int], shape: Tuple[int, int]) -> np.ndarray:
+    """Return the view of the grid receiving a pattern of a shape at an offset."""
+    row, col = offset
+    if row < 0 or col < 0 or row + shape[0] > grid.shape[0] or col + shape[1] > grid.shape[1]:
+        raise ValueError(f"A {shape[0]}x{shape[1]} pattern at {offset} does not fit "
+                         f"in a {grid.shape[0]}x{grid.shape[1]} grid")
+    return grid[row:row + shape[0], col:col + shape[1]]
+
+
+def _period(comment: str) -> Optional[int]:
+    """Return the period given in a comment line, if any."""
+    match = _PERIOD.search(comment)
+    return int(match.group(1)) if match else None
+
+
+def _read_rle_header(file: TextIO) -> Dict[str, Any]:
+    """Read the comment and header lines of an RLE file, up to the body."""
+    info = {'name': None, 'rule': None, 'period': None}
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            kind, text = line[1:2], line[2:].strip()
+            if kind == 'N':
+                info['name'] = text
+            elif kind in 'Cc' and info['period'] is None:
+                info['period'] = _period(text)
+            continue
+        match = _HEADER.match(line)
+        if match is None:
+            raise ValueError(f"Invalid RLE header: {line!r}")
+        info['width'], info['height'] = int(match.group(1)), int(match.group(2))
+        info['rule'] = match.group(3)
+        return info
+    raise ValueError("Missing RLE header")
+
+
+def _read_cells_header(file: TextIO) -> Dict[str, Any]:
+    """Measure a plaintext file and read its comments, in one pass."""
+    info = {'name': None, 'rule': None, 'period': None}
+    width = height = 0
+    for line in file:
+        line = line.rstrip('\r\n')
+        if line.startswith('!'):
+            text = line[1:].strip()
+            if text.lower().startswith('name:'):
+                info['name'] = text[5:].strip()
+            elif info['period'] is None:
+                info['period'] = _period(text)
+            continue
+        height += 1
+        width = max(width, len(line.rstrip()))
+    info['width'], info['height'] = width, height
+    return info
+
+
+def _load_lenia(path: str) -> Tuple[Dict[str, Any], str]:
+    """Return the description and the RLE cells of a Lenia JSON file."""
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    cells = data.get('cells')
+    if not isinstance(cells, str):
+        raise ValueError(f"No RLE 'cells' in {path}")
+    if '%' in cells:
+        raise ValueError("Only two-dimensional Lenia patterns are supported")
+    params = dict(data.get('params', {}))
+    info = {'name': data.get('name'), 'rule': None, 'period': data.get('period'), 'params': params}
+    decoder = _RleDecoder(lenia=True)
+    decoder.feed(cells)
+    info['height'], info['width'] = decoder.close()
+    return info, cells
+
+
+def pattern_format(path: str) -> str:
+    """Return the format of a pattern file from its extension: 'rle', 'cells' or 'lenia'."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown pattern format: {path}")
+    return FORMATS[extension]
+
+
+def read_info(path: str) -> Dict[str, Any]:
+    """Read the description of a pattern file without loading its cells.
+
+    Args:
+        path (str): Pattern file
+
+    Returns:
+        dict: 'name', 'format', 'kind' ('discrete' or 'continuous'), 'width',
+            'height', 'rule', 'period' (None if not given) and for Lenia
+            patterns 'params'
+    """
+    fmt = pattern_format(path)
+    if fmt == 'lenia':
+        info = _load_lenia(path)[0]
+    else:
+        with open(path, encoding='utf-8') as file:
+            info = _read_rle_header(file) if fmt == 'rle' else _read_cells_header(file)
+    info['format'] = fmt
+    info['kind'] = 'continuous' if fmt == 'lenia' else 'discrete'
+    if info['name'] is None:
+        info['name'] = os.path.splitext(os.path.basename(path))[0]
+    return info
+
+
+def load_pattern(path: str,
+                 grid: Optional[np.ndarray] = None,
+                 offset: Tuple[int, int] = (0, 0),
+                 dtype: Any = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Load a pattern file into a grid.
+
+    Only the live cells are written, the other cells of the grid keep their
+    value. Discrete grids receive 1 for every live cell, float grids the
+    value of the cell (Lenia) or 1.
+
+    Args:
+        path (str): Pattern file, see FORMATS
+        grid (numpy.ndarray, optional): Grid receiving the pattern. If None,
+            a zero grid of the bounding box of the pattern is created.
+        offset (tuple): (row, column) of the top left corner of the pattern
+        dtype (optional): Dtype of a created grid, default uint8 for discrete
+            patterns and float64 for Lenia patterns
+
+    Returns:
+        tuple: (grid, description as returned by read_info)
+    """
+    fmt = pattern_format(path)
+    if fmt == 'lenia':
+        info, cells = _load_lenia(path)
+        info['format'], info['kind'] = fmt, 'continuous'
+        info['name'] = info['name'] or os.path.splitext(os.path.basename(path))[0]
+    else:
+        info = read_info(path)
+    shape = (info['height'], info['width'])
+    if grid is None:
+        if dtype is None:
+            dtype = np.float64 if fmt == 'lenia' else np.uint8
+        grid = np.zeros(shape, dtype=dtype)
+        offset = (0, 0)
+    target = _region(grid, offset, shape)
+
+    if fmt == 'lenia':
+        decoder = _RleDecoder(target, lenia=True)
+        decoder.feed(cells)
+        decoder.close()
+        return grid, info
+
+    with open(path, encoding='utf-8') as file:
+        if fmt == 'rle':
+            _read_rle_header(file)
+            decoder = _RleDecoder(target)
+            for line in file:
+                decoder.feed(line)
+                if decoder.done:
+                    break
+            decoder.close()
+        else:
+            _load_cells_rows(file, target)
+    return grid, info
+
+
+def _load_cells_rows(file: TextIO, target: np.ndarray) -> None:
+    """Write the rows of a plaintext file into the grid region."""
+    row = 0
+    for line in file:
+        if line.startswith('!'):
+            continue
+        data = np.frombuffer(line.rstrip().encode('ascii'), dtype=np.uint8)
+        alive = (data == ord('O')) | (data == ord('*'))
+        if alive.any():
+            target[row, :data.size][alive] = 1
+        row += 1
+
+
+def encode_rle(grid: np.ndarray, lenia: bool = False) -> str:
+    """Encode a grid as the RLE body of a pattern.
+
+    Args:
+        grid (numpy.ndarray): 2D grid of cells
+        lenia (bool): Encode values from 0 to 1 as Lenia states (1 to 255),
+            instead of alive ('o') and dead ('b') cells
+
+    Returns:
+        str: RLE body ending with '!', without line breaks
+    """
+    if lenia:
+        states = np.rint(np.clip(grid, 0, 1) * LENIA_MAX_STATE).astype(np.int64)
+    else:
+        states = (np.asarray(grid) != 0).astype(np.int64)
+    parts = []
+    empty_rows = 0
+    for row in states:
+        live = np.flatnonzero(row)
+        if live.size == 0:
+            empty_rows += 1
+            continue
+        if parts:
+            parts.append(f"{empty_rows + 1}$" if empty_rows else '$')
+        empty_rows = 0
+        row = row[:live[-1] + 1]
+        # Boundaries of the runs of equal states
+        starts = np.flatnonzero(np.diff(row, prepend=-1))
+        lengths = np.diff(np.append(starts, row.size))
+        for start, length in zip(starts, lengths):
+            parts.append((str(length) if length > 1 else '') + _symbol(int(row[start]), lenia))
+    return ''.join(parts) + '!'
+
+
+def _symbol(state: int, lenia: bool) -> str:
+    """Return the RLE symbol of a state."""
+    if state == 0:
+        return 'b' if not lenia else '.'
+    if not lenia:
+        return 'o'
+    if state <= 24:
+        return chr(ord('A') + state - 1)
+    state -= 25
+    return chr(ord('p') + state // 24) + chr(ord('A') + state % 24)
+
+
+def measure_period(path: str, max_period: int = MAX_PERIOD) -> Optional[int]:
+    """Measure the period of a discrete still life or oscillator.
+
+    The pattern is run on a torus with a margin around it, using the cycle
+    detector. Spaceships and growing patterns have no period in place.
+
+    Args:
+        path (str): Discrete pattern file
+        max_period (int): Longest period measured
+
+    Returns:
+        int: Period in generations, or None
+    """
+    from .sim_bitboard import BitboardEngine
+    from .sim_cycle import CycleDetector
+
+    info = read_info(path)
+    margin = max_period // 2 + 2
+    shape = (info['height'] + 2 * margin, info['width'] + 2 * margin)
+    grid, _ = load_pattern(path, np.zeros(shape, dtype=np.uint8), (margin, margin))
+    initial = grid.copy()
+    engine, detector = BitboardEngine(), CycleDetector(max_period + 1)
+    detector.observe(0, grid, info['rule'])
+    for generation in range(1, 2 * max_period + 2):
+        grid = engine.advance(grid, 1)
+        period = detector.observe(generation, grid, info['rule'])
+        if period is not None:
+            # The pattern itself repeats, not a debris it turned into
+            return period if np.array_equal(detector.frame(0), initial) else None
+    return None
+
+
+class PatternLibrary:
+    """Indexed directory of pattern files.
+
+    The index maps each pattern name to its file and description (format,
+    kind, bounding box, rule, period). It is read from index.json, written by
+    build_index, or built in memory if the file is missing.
+    """
+    def __init__(self, path: str = DEFAULT_LIBRARY) -> None:
+        """Open a pattern library.
+
+        Args:
+            path (str): Library directory
+        """
+        self.path = path
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """Description of each pattern, by name."""
+        if self._index is None:
+            index_path = os.path.join(self.path, INDEX_FILE)
+            if os.path.exists(index_path):
+                with open(index_path, encoding='utf-8') as file:
+                    entries = json.load(file)
+                self._index = {entry['name']: entry for entry in entries}
+            else:
+                self._index = self.build_index(write=False)
+        return self._index
+
+    def names(self, kind: Optional[str] = None) -> List[str]:
+        """Return the sorted pattern names, optionally of one kind.
+
+        Args:
+            kind (str, optional): 'discrete' or 'continuous'
+        """
+        return sorted(name for name, entry in self.index.items() if kind in (None, entry['kind']))
+
+    def info(self, name: str) -> Dict[str, Any]:
+        """Return the index entry of a pattern.
+
+        Args:
+            name (str): Pattern name, case-insensitive
+
+        Returns:
+            dict: See read_info, with the 'file' name in the library
+        """
+        entry = self.index.get(name)
+        if entry is None:
+            lowered = {key.lower(): value for key, value in self.index.items()}
+            entry = lowered.get(name.lower())
+        if entry is None:
+            raise ValueError(f"Unknown pattern: {name}")
+        return entry
+
+    def load(self,
+             name: str,
+             grid: Optional[np.ndarray] = None,
+             offset: Tuple[int, int] = (0, 0),
+             dtype: Any = None) -> np.ndarray:
+        """Load a pattern of the library, see load_pattern.
+
+        Args:
+            name (str): Pattern name
+            grid (numpy.ndarray, optional): Grid receiving the pattern
+            offset (tuple): (row, column) of the pattern in the grid
+            dtype (optional): Dtype of a created grid
+
+        Returns:
+            numpy.ndarray: The grid
+        """
+        entry = self.info(name)
+        return load_pattern(os.path.join(self.path, entry['file']), grid, offset, dtype)[0]
+
+    def build_index(self, write: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Describe every pattern file of the library.
+
+        The period of a discrete pattern is measured when its file does not
+        give it.
+
+        Args:
+            write (bool): Write the index to index.json
+
+        Returns:
+            dict: Description of each pattern, by name
+        """
+        index = {}
+        for file_name in sorted(os.listdir(self.path)):
+            if file_name == INDEX_FILE or os.path.splitext(file_name)[1].lower() not in FORMATS:
+                continue
+            path = os.path.join(self.path, file_name)
+            info = read_info(path)
+            if info['period'] is None and info['kind'] == 'discrete':
+                info['period'] = measure_period(path)
+            if info['name'] in index:
+                raise ValueError(f"Duplicate pattern name: {info['name']}")
+            index[info['name']] = dict(info, file=file_name)
+        if write:
+            with open(os.path.join(self.path, INDEX_FILE), 'w', encoding='utf-8') as file:
+                json.dump(list(index.values()), file, indent=1)
+                file.write('\n')
+        self._index = index
+        return index
+
+
+def parse_pattern(value: str) -> Union[int, str]:
+    """Return a command line pattern selector: a number, or a library pattern name."""
+    return int(value) if value.lstrip('-').isdigit() else value
+
+
+if __name__ == "__main__":
+    for entry in PatternLibrary().build_index().values():
+        print(f"{entry['name']}: {entry['width']}x{entry['height']} {entry['kind']}, "
+              f"period {entry['period']}")
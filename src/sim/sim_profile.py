@@ -0,0 +1,151 @@
+"""Simulation profiling module.
+
+This module captures a profile of a running simulation for a given number of
+calls, without restarting it under a profiler. The calls are run under
+cProfile and the Python allocations are traced with tracemalloc while the
+capture is active. Once the last counted call returns, the allocations are
+snapshotted and tracing stops, and the capture is written to two files:
+- '<name>.pstats': the profile of every thread, readable with pstats or
+  snakeviz
+- '<name>.tracemalloc': the allocation snapshot, readable with
+  tracemalloc.Snapshot.load
+
+cProfile only sees the thread it is enabled in, so each thread making calls
+(e.g. the stepping worker and the Tk thread) gets its own profiler, and the
+profiles are merged when the capture is saved.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TRACE_FRAMES = 10   # Stack frames kept per traced allocation
+
+
+def capture_name(mode: str, shape: Optional[Tuple[int, ...]], params: Dict[str, float]) -> str:
+    """Return the base file name of a capture.
+
+    Args:
+        mode (str): 'discrete' or 'continuous'
+        shape (tuple, optional): Grid shape
+        params (dict): FiModel parameters, e.g. mu and sigma
+
+    Returns:
+        str: e.g. 'profile_continuous_128x228_mu0.5_sigma0.15_20261018-101500'
+    """
+    size = 'x'.join(str(side) for side in shape) if shape is not None else 'empty'
+    values = '_'.join(f"{name}{value:g}" for name, value in params.items())
+    name = f"profile_{mode}_{size}_{values}_{time.strftime('%Y%m%d-%H%M%S')}"
+    return re.sub(r'[^\w.-]', '', name)
+
+
+class ProfileCapture:
+    """cProfile and tracemalloc capture over the next calls.
+
+    Calls made through call are profiled until `calls` counted calls have
+    returned, then the capture finishes and later calls run unprofiled.
+    """
+    def __init__(self,
+                 calls: int,
+                 directory: str = '.',
+                 name: str = 'profile',
+                 frames: int = DEFAULT_TRACE_FRAMES) -> None:
+        """Initialize the capture and start tracing the allocations.
+
+        Args:
+            calls (int): Number of counted calls to capture
+            directory (str): Directory of the capture files, created if needed
+            name (str): Base file name of the capture files, see capture_name
+            frames (int): Stack frames kept per traced allocation
+        """
+        if calls < 1:
+            raise ValueError("A profile captures at least one call")
+        self.calls = calls
+        self.directory = directory
+        self.name = name
+        self.done = 0              # Counted calls captured
+        self.finished = False
+        self.peak = None           # Peak traced memory in bytes, once finished
+        self._profiles: Dict[int, cProfile.Profile] = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop_tracing = not tracemalloc.is_tracing()
+        if self._stop_tracing:
+            tracemalloc.start(frames)
+        tracemalloc.reset_peak()
+
+    def call(self, fct: Callable[..., Any], *args: Any, counted: bool = True, **kwargs: Any) -> Any:
+        """Call a function, profiled while the capture is active.
+
+        Args:
+            fct (function): Function to call
+            *args: Arguments of fct
+            counted (bool): Count the call towards the captured calls
+            **kwargs: Keyword arguments of fct
+
+        Returns:
+            The result of fct
+        """
+        if self.finished:
+            return fct(*args, **kwargs)
+        with self._lock:
+            profile = self._profiles.setdefault(threading.get_ident(), cProfile.Profile())
+        profile.enable()
+        try:
+            return fct(*args, **kwargs)
+        finally:
+            profile.disable()
+            if counted:
+                self._count()
+
+    def _count(self) -> None:
+        """Count a captured call, and finish the capture after the last one."""
+        with self._lock:
+            self.done += 1
+            if self.done < self.calls:
+                return
+        self.finish()
+
+    def finish(self) -> None:
+        """Finish the capture now: snapshot the allocations and stop tracing."""
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+        self._snapshot = tracemalloc.take_snapshot()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        if self._stop_tracing:
+            tracemalloc.stop()
+
+    def cancel(self) -> None:
+        """Stop the capture without saving it."""
+        with self._lock:
+            self.finished = True
+        if self._stop_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def save(self) -> Dict[str, str]:
+        """Write the capture files of a finished capture.
+
+        Call it from a thread not inside a profiled call, e.g. the thread that
+        checked finished, as the profiles of all threads are read.
+
+        Returns:
+            dict: Paths of the 'pstats' and 'tracemalloc' files
+        """
+        if self._snapshot is None:
+            raise ValueError("The capture is not finished")
+        if not self._profiles:
+            raise ValueError("The capture has no call")
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.name)
+        paths = {'pstats': base + '.pstats', 'tracemalloc': base + '.tracemalloc'}
+        stats = pstats.Stats(*self._profiles.values())
+        stats.dump_stats(paths['pstats'])
+        self._snapshot.dump(paths['tracemalloc'])
+        return paths
@@ -0,0 +1,265 @@
+"""Simulation recording module.
+
+This module stores whole runs on disk for offline analysis. The recorder
+appends every generation, or every k-th one, to a preallocated file mapped in
+memory with ``np.memmap``, and the replayer maps the same file read-only so
+that any frame can be read without loading the run into RAM.
+
+File layout:
+- 8 bytes: magic ``GOLTRAJ1``
+- 8 bytes: number of recorded frames (uint64), written after each frame
+- 4 bytes: length of the JSON metadata (uint32)
+- JSON metadata: shape, dtype, every and the user metadata (mode, FiModel
+  parameters...), padded to a multiple of HEADER_ALIGN bytes
+- frames: C-ordered (rows, columns) arrays of the recorded dtype
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+
+MAGIC = b'GOLTRAJ1'
+HEADER_ALIGN = 4096
+_COUNT_OFFSET = len(MAGIC)
+_LENGTH_OFFSET = _COUNT_OFFSET + 8
+_JSON_OFFSET = _LENGTH_OFFSET + 4
+
+
+def _data_offset(json_length: int) -> int:
+    """Return the offset of the first frame for a metadata length."""
+    return -(-(_JSON_OFFSET + json_length) // HEADER_ALIGN) * HEADER_ALIGN
+
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int, int]:
+    """Read the header of a trajectory file.
+
+    Args:
+        path (str): Trajectory file
+
+    Returns:
+        tuple: (metadata dict, number of frames, offset of the first frame)
+    """
+    with open(path, 'rb') as file:
+        start = file.read(_JSON_OFFSET)
+        if len(start) < _JSON_OFFSET or start[:_COUNT_OFFSET] != MAGIC:
+            raise ValueError(f"Not a trajectory file: {path}")
+        count = int(np.frombuffer(start, dtype='<u8', count=1, offset=_COUNT_OFFSET)[0])
+        length = int(np.frombuffer(start, dtype='<u4', count=1, offset=_LENGTH_OFFSET)[0])
+        header = json.loads(file.read(length).decode('utf-8'))
+    return header, count, _data_offset(length)
+
+
+class TrajectoryRecorder:
+    """Memory-mapped trajectory recorder.
+
+    Frames are copied into a file preallocated for ``capacity`` frames, which
+    doubles when full and is truncated to the recorded frames on close. The
+    frame count in the header is updated after each frame, so an interrupted
+    recording stays readable.
+    """
+    def __init__(self,
+                 path: str,
+                 shape: Tuple[int, int],
+                 dtype: Any = np.float64,
+                 every: int = 1,
+                 capacity: int = 256,
+                 metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Create the trajectory file.
+
+        Args:
+            path (str): Destination file, overwritten if it exists
+            shape (tuple): (rows, columns) of the grid
+            dtype: Data type of the stored cells, e.g. uint8 for discrete grids
+            every (int): Record one generation out of every
+            capacity (int): Number of frames preallocated
+            metadata (dict, optional): JSON-serializable run description, e.g.
+                the mode and the FiModel parameters
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.path = path
+        self.shape = tuple(int(side) for side in shape)
+        self.dtype = np.dtype(dtype)
+        self.every = int(every)
+        self.metadata = dict(metadata or {})
+        self.generation = 0    # Generation of the last grid passed to record
+        self.count = 0         # Number of recorded frames
+
+        header = dict(self.metadata, shape=list(self.shape), dtype=self.dtype.str, every=self.every)
+        encoded = json.dumps(header).encode('utf-8')
+        self._offset = _data_offset(len(encoded))
+        self._frame_bytes = self.dtype.itemsize * self.shape[0] * self.shape[1]
+        with open(path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(np.array([0], dtype='<u8').tobytes())
+            file.write(np.array([len(encoded)], dtype='<u4').tobytes())
+            file.write(encoded)
+            file.truncate(self._offset + capacity * self._frame_bytes)
+        self._count = np.memmap(path, dtype='<u8', mode='r+', offset=_COUNT_OFFSET, shape=(1,))
+        self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        """Map the frames of a file holding capacity frames."""
+        self.capacity = capacity
+        self._frames = np.memmap(self.path, dtype=self.dtype, mode='r+', offset=self._offset,
+                                 shape=(capacity,) + self.shape)
+
+    def append(self, grid: np.ndarray) -> None:
+        """Store a grid as the next frame.
+
+        Args:
+            grid (numpy.ndarray): Grid of the recorded shape
+        """
+        if self._frames is None:
+            raise ValueError("The recorder is closed")
+        if grid.shape != self.shape:
+            raise ValueError(f"Grid shape {grid.shape} does not match the recording {self.shape}")
+        if self.count == self.capacity:
+            self._frames.flush()
+            self._frames = None
+            with open(self.path, 'r+b') as file:
+                file.truncate(self._offset + 2 * self.capacity * self._frame_bytes)
+            self._map(2 * self.capacity)
+        np.copyto(self._frames[self.count], grid, casting='unsafe')
+        self.count += 1
+        self._count[0] = self.count
+
+    def pending(self) -> int:
+        """Return the number of generations until the next recorded one."""
+        return self.every - self.generation % self.every
+
+    def record(self, grid: np.ndarray, generations: int = 1) -> bool:
+        """Advance the generation counter and store the grid if it is due.
+
+        Args:
+            grid (numpy.ndarray): Grid after the generations
+            generations (int): Generations computed since the last call
+
+        Returns:
+            bool: True if the grid was stored
+        """
+        self.generation += generations
+        if self.generation % self.every:
+            return False
+        self.append(grid)
+        return True
+
+    def close(self) -> None:
+        """Write the frames to disk and shrink the file to the recorded frames."""
+        if self._frames is None:
+            return
+        self._frames.flush()
+        self._count.flush()
+        self._frames = None
+        self._count = None
+        with open(self.path, 'r+b') as file:
+            file.truncate(self._offset + self.count * self._frame_bytes)
+
+    def __enter__(self) -> 'TrajectoryRecorder':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class TrajectoryReplayer:
+    """Memory-mapped trajectory reader.
+
+    Frames are read-only views of the file mapping: the operating system loads
+    the pages of the frames actually read, so a run larger than the memory can
+    be replayed. A recording still in progress can be opened, the frames
+    written afterwards are seen after refresh().
+    """
+    def __init__(self, path: str) -> None:
+        """Open a trajectory file.
+
+        Args:
+            path (str): File written by TrajectoryRecorder
+        """
+        self.path = path
+        header, count, self._offset = read_header(path)
+        self.shape = tuple(header.pop('shape'))
+        self.dtype = np.dtype(header.pop('dtype'))
+        self.every = header.pop('every')
+        self.metadata = header
+        self._frames = None
+        self._length = 0
+        self._map(count)
+
+    def _map(self, count: int) -> None:
+        """Map the first count frames of the file."""
+        frame_bytes = self.dtype.itemsize * self.shape[0] * self.shape[1]
+        count = min(count, (os.path.getsize(self.path) - self._offset) // frame_bytes)
+        self._length = count
+        if count:
+            self._frames = np.memmap(self.path, dtype=self.dtype, mode='r', offset=self._offset,
+                                     shape=(count,) + self.shape)
+
+    def refresh(self) -> int:
+        """Map the frames recorded since the file was opened.
+
+        Returns:
+            int: Number of frames
+        """
+        _, count, _ = read_header(self.path)
+        if count != self._length:
+            self._map(count)
+        return self._length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.frame(index)
+
+    def frame(self, index: int) -> np.ndarray:
+        """Return a frame.
+
+        Args:
+            index (int): Frame index, negative values count from the end
+
+        Returns:
+            numpy.ndarray: Read-only view of the frame in the file
+        """
+        if not -self._length <= index < self._length:
+            raise IndexError(f"Frame {index} out of range ({self._length} frames)")
+        return self._frames[index]
+
+    def generation(self, index: int) -> int:
+        """Return the generation of a frame.
+
+        Args:
+            index (int): Frame index
+
+        Returns:
+            int: Generation, counted from the start of the recording
+        """
+        return (index % self._length if self._length else index) * self.every
+
+    def frames(self, start: int = 0, stop: Optional[int] = None, step: int = 1) -> Iterator[np.ndarray]:
+        """Iterate over a range of frames.
+
+        Args:
+            start (int): First frame index
+            stop (int, optional): End frame index, default the last frame
+            step (int): Index increment, e.g. 10 to replay ten times faster
+
+        Yields:
+            numpy.ndarray: Read-only view of each frame
+        """
+        for index in range(*slice(start, stop, step).indices(self._length)):
+            yield self._frames[index]
+
+    def close(self) -> None:
+        """Release the file mapping. Frames returned before stay valid."""
+        self._frames = None
+        self._length = 0
+
+    def __enter__(self) -> 'TrajectoryReplayer':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
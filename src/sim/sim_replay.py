@@ -0,0 +1,105 @@
+"""Simulation replay module.
+
+This module plays back a trajectory recorded by sim_record in a SimView. Frames
+are read from the memory-mapped file as they are displayed, so the length of
+the run is not limited by the memory, and the playback speed is set by a frame
+rate and a stride (frames skipped between two displayed frames).
+"""
+
+from typing import Any
+from .sim_record import TrajectoryReplayer
+
+
+class ReplayController:
+    """Trajectory playback controller.
+
+    This class displays the frames of a TrajectoryReplayer in a view, scheduling
+    itself with the Tk ``after`` method of the root window.
+    """
+    def __init__(self,
+                 view: Any,
+                 root: Any,
+                 replayer: TrajectoryReplayer,
+                 fps: float = 30.0,
+                 stride: int = 1,
+                 loop: bool = False) -> None:
+        """Initialize the replay controller.
+
+        Args:
+            view: SimView instance
+            root: Main Tkinter window
+            replayer (TrajectoryReplayer): Trajectory to play
+            fps (float): Frames displayed per second
+            stride (int): Frame index increment, negative to play backwards
+            loop (bool): Restart from the other end after the last frame
+        """
+        self.view = view
+        self.root = root
+        self.replayer = replayer
+        self.fps = 30.0
+        self.stride = 1
+        self.loop = loop
+        self.index = 0
+        self.paused = False
+        self.update_timer = None
+        self.set_fps(fps)
+        self.set_stride(stride)
+
+    def set_fps(self, fps: float) -> None:
+        """Set the number of frames displayed per second (values <= 0 are ignored)."""
+        if fps > 0:
+            self.fps = float(fps)
+
+    def set_stride(self, stride: int) -> None:
+        """Set the frame index increment (0 is ignored)."""
+        if stride:
+            self.stride = int(stride)
+
+    def seek(self, index: int) -> None:
+        """Display a frame and continue the playback from it.
+
+        Args:
+            index (int): Frame index, clamped to the recorded frames
+        """
+        self.index = min(max(index, 0), len(self.replayer) - 1)
+        self.show()
+
+    def toggle_pause(self) -> None:
+        """Pause or resume the playback."""
+        self.paused = not self.paused
+
+    def show(self) -> None:
+        """Display the current frame."""
+        if len(self.replayer):
+            self.view.update_display(self.replayer.frame(self.index))
+
+    def run(self) -> None:
+        """Start the playback from the current frame."""
+        self.show()
+        self.update_timer = self.root.after(int(1000 / self.fps), self.update)
+
+    def update(self) -> None:
+        """Display the next frame, called by the timer."""
+        if not self.paused:
+            self._advance()
+        self.update_timer = self.root.after(int(1000 / self.fps), self.update)
+
+    def _advance(self) -> None:
+        """Move to the next frame and display it, wrapping or stopping at the ends."""
+        count = self.replayer.refresh()
+        if not count:
+            return
+        index = self.index + self.stride
+        if not 0 <= index < count:
+            if not self.loop:
+                self.paused = True
+                return
+            index %= count
+        self.index = index
+        self.show()
+
+    def stop(self) -> None:
+        """Stop the playback."""
+        if self.update_timer:
+            self.root.after_cancel(self.update_timer)
+            self.update_timer = None
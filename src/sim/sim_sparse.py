@@ -0,0 +1,269 @@
+"""Simulation sparse plane module.
+
+This module provides a Game of Life engine on an unbounded plane, stored
+sparsely as fixed-size square chunks of cells. Chunks are created when cells
+are born in them and freed when they empty, so memory and stepping time scale
+with the live population rather than with the area of the bounding box.
+
+A generation is computed for the occupied chunks and for the neighbors facing
+live cells on their edges, the only chunks where cells can change. The chunks
+are processed together: each one is stacked with a one-cell halo gathered from
+its eight neighbors, and the neighbor counts and rules are applied to the
+whole stack with array operations.
+"""
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+CHUNK_SIZE = 64
+
+# Neighbor offsets in (row, column) chunks, row-major, the chunk itself at index 4
+_OFFSETS = np.array([(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)], dtype=np.int64)
+_BIAS = 1 << 30     # Chunk coordinates are encoded as one int64 for lookups
+
+
+def _codes(keys: np.ndarray) -> np.ndarray:
+    """Encode (row, column) chunk coordinates as sortable int64 codes."""
+    return ((keys[..., 0] + _BIAS) << 31) | (keys[..., 1] + _BIAS)
+
+
+class SparseEngine:
+    """Sparse Game of Life engine on an unbounded plane.
+
+    The state is a dict mapping (row, column) chunk coordinates to
+    chunk_size x chunk_size uint8 arrays of 0/1 cells, the chunk (r, c)
+    covering the cells from (r * chunk_size, c * chunk_size). Coordinates may
+    be negative. Like the bitboard and HashLife engines, it applies the B3/S23
+    rules encoded by FiModel.growth_gol, and can be plugged into SimModel as
+    the 'sparse' engine, which displays a viewport of the plane.
+    """
+    def __init__(self, chunk_size: int = CHUNK_SIZE) -> None:
+        """Initialize an empty plane.
+
+        Args:
+            chunk_size (int): Side of the chunks in cells
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.chunk_size = chunk_size
+        self.chunks: Dict[Tuple[int, int], np.ndarray] = {}
+        self.generation = 0
+        self.viewport = None     # (top, left, rows, columns) returned by advance
+        self.dtype = np.dtype(np.uint8)
+        self._dense = None       # Last viewport grid returned by advance
+
+    def clear(self) -> None:
+        """Remove every cell."""
+        self.chunks = {}
+        self.generation = 0
+        self._dense = None
+
+    def load(self, grid: np.ndarray, top: int = 0, left: int = 0) -> None:
+        """Replace the plane with a dense grid, which becomes the viewport.
+
+        Args:
+            grid (numpy.ndarray): 2D grid of cells, non-zero cells are alive
+            top (int): Plane row of the first grid row
+            left (int): Plane column of the first grid column
+        """
+        self.clear()
+        self.dtype = grid.dtype
+        self.viewport = (top, left, grid.shape[0], grid.shape[1])
+        self.paste(grid, top, left)
+
+    def paste(self, grid: np.ndarray, top: int, left: int) -> None:
+        """Overwrite a rectangle of the plane with a dense grid.
+
+        Args:
+            grid (numpy.ndarray): 2D grid of cells, non-zero cells are alive
+            top (int): Plane row of the first grid row
+            left (int): Plane column of the first grid column
+        """
+        n = self.chunk_size
+        rows, cols = grid.shape
+        cells = grid != 0
+        for chunk_row in range(top // n, -(-(top + rows) // n)):
+            for chunk_col in range(left // n, -(-(left + cols) // n)):
+                r0, c0 = chunk_row * n, chunk_col * n
+                # Overlap of the grid and the chunk, in plane coordinates
+                r1, r2 = max(r0, top), min(r0 + n, top + rows)
+                c1, c2 = max(c0, left), min(c0 + n, left + cols)
+                part = cells[r1 - top:r2 - top, c1 - left:c2 - left]
+                key = (chunk_row, chunk_col)
+                chunk = self.chunks.get(key)
+                if chunk is None:
+                    if not part.any():
+                        continue
+                    chunk = self.chunks[key] = np.zeros((n, n), dtype=np.uint8)
+                chunk[r1 - r0:r2 - r0, c1 - c0:c2 - c0] = part
+                if not chunk.any():
+                    del self.chunks[key]
+        self._dense = None
+
+    def window(self, top: int, left: int, rows: int, cols: int,
+               dtype: Optional[np.dtype] = None) -> np.ndarray:
+        """Export a rectangle of the plane as a dense grid.
+
+        Only the chunks overlapping the rectangle are read.
+
+        Args:
+            top (int): Plane row of the first row
+            left (int): Plane column of the first column
+            rows (int): Number of rows
+            cols (int): Number of columns
+            dtype (optional): Dtype of the grid, default the dtype of the
+                loaded grid
+
+        Returns:
+            numpy.ndarray: New grid of 0/1 cells
+        """
+        n = self.chunk_size
+        out = np.zeros((rows, cols), dtype=self.dtype if dtype is None else dtype)
+        for chunk_row in range(top // n, -(-(top + rows) // n)):
+            for chunk_col in range(left // n, -(-(left + cols) // n)):
+                chunk = self.chunks.get((chunk_row, chunk_col))
+                if chunk is None:
+                    continue
+                r0, c0 = chunk_row * n, chunk_col * n
+                r1, r2 = max(r0, top), min(r0 + n, top + rows)
+                c1, c2 = max(c0, left), min(c0 + n, left + cols)
+                out[r1 - top:r2 - top, c1 - left:c2 - left] = chunk[r1 - r0:r2 - r0, c1 - c0:c2 - c0]
+        return out
+
+    def population(self) -> int:
+        """Return the number of living cells.
+
+        Returns:
+            int: Number of living cells on the whole plane
+        """
+        return sum(int(np.count_nonzero(chunk)) for chunk in self.chunks.values())
+
+    def nbytes(self) -> int:
+        """Return the memory used by the chunks, in bytes."""
+        return sum(chunk.nbytes for chunk in self.chunks.values())
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return the bounding box of the living cells.
+
+        Returns:
+            tuple: (top, left, rows, columns) in plane coordinates, None if
+                the plane is empty
+        """
+        if not self.chunks:
+            return None
+        n = self.chunk_size
+        tops, lefts, bottoms, rights = [], [], [], []
+        for (chunk_row, chunk_col), chunk in self.chunks.items():
+            rows = np.flatnonzero(chunk.any(axis=1))
+            cols = np.flatnonzero(chunk.any(axis=0))
+            tops.append(chunk_row * n + rows[0])
+            bottoms.append(chunk_row * n + rows[-1] + 1)
+            lefts.append(chunk_col * n + cols[0])
+            rights.append(chunk_col * n + cols[-1] + 1)
+        top, left = int(min(tops)), int(min(lefts))
+        return top, left, int(max(bottoms)) - top, int(max(rights)) - left
+
+    def step(self, generations: int = 1) -> None:
+        """Advance the plane.
+
+        Args:
+            generations (int): Number of generations to compute
+        """
+        for _ in range(generations):
+            self._next()
+            self.generation += 1
+
+    def _next(self) -> None:
+        """Compute the next generation of the occupied chunks and their edges."""
+        if not self.chunks:
+            return
+        n = self.chunk_size
+        keys = np.array(list(self.chunks), dtype=np.int64)
+        count = len(keys)
+        # Stacked chunks, with an empty chunk at index count for missing neighbors
+        data = np.zeros((count + 1, n, n), dtype=np.uint8)
+        data[:count] = np.stack(list(self.chunks.values()))
+
+        # Cells can only change in a chunk or in the neighbors facing its live edges
+        faces = np.empty((count, 9), dtype=bool)
+        top, bottom = data[:count, 0, :], data[:count, -1, :]
+        left, right = data[:count, :, 0], data[:count, :, -1]
+        faces[:, 4] = True
+        faces[:, 1], faces[:, 7] = top.any(axis=1), bottom.any(axis=1)
+        faces[:, 3], faces[:, 5] = left.any(axis=1), right.any(axis=1)
+        faces[:, 0], faces[:, 2] = top[:, 0] != 0, top[:, -1] != 0
+        faces[:, 6], faces[:, 8] = bottom[:, 0] != 0, bottom[:, -1] != 0
+        candidates = np.unique((keys[:, None, :] + _OFFSETS)[faces], axis=0)
+
+        # Index of the 3x3 neighborhood of each candidate in the stack
+        codes = _codes(keys)
+        order = np.argsort(codes)
+        sorted_codes = codes[order]
+        wanted = _codes(candidates[:, None, :] + _OFFSETS)
+        position = np.minimum(np.searchsorted(sorted_codes, wanted), count - 1)
+        index = np.where(sorted_codes[position] == wanted, order[position], count)
+
+        # Candidates with a one-cell halo taken from their neighbors
+        padded = np.empty((len(candidates), n + 2, n + 2), dtype=np.uint8)
+        padded[:, 1:-1, 1:-1] = data[index[:, 4]]
+        padded[:, 0, 1:-1] = data[index[:, 1], -1, :]
+        padded[:, -1, 1:-1] = data[index[:, 7], 0, :]
+        padded[:, 1:-1, 0] = data[index[:, 3], :, -1]
+        padded[:, 1:-1, -1] = data[index[:, 5], :, 0]
+        padded[:, 0, 0] = data[index[:, 0], -1, -1]
+        padded[:, 0, -1] = data[index[:, 2], -1, 0]
+        padded[:, -1, 0] = data[index[:, 6], 0, -1]
+        padded[:, -1, -1] = data[index[:, 8], 0, 0]
+
+        # 3x3 sums including the cell: born with 3, survives with 3 or 4
+        columns = padded[:, :-2, :] + padded[:, 1:-1, :] + padded[:, 2:, :]
+        total = columns[:, :, :-2] + columns[:, :, 1:-1] + columns[:, :, 2:]
+        cells = (total == 3) | ((total == 4) & (padded[:, 1:-1, 1:-1] != 0))
+        alive = cells.reshape(len(candidates), -1).any(axis=1)
+        new = cells[alive].astype(np.uint8)
+        self.chunks = dict(zip(map(tuple, candidates[alive].tolist()), new))
+        self._dense = None
+
+    def set_viewport(self, top: int, left: int, rows: int, cols: int) -> np.ndarray:
+        """Move the viewport returned by advance.
+
+        Args:
+            top (int): Plane row of the first row
+            left (int): Plane column of the first column
+            rows (int): Number of rows
+            cols (int): Number of columns
+
+        Returns:
+            numpy.ndarray: Grid of the new viewport
+        """
+        self.viewport = (top, left, rows, cols)
+        self._dense = self.window(*self.viewport)
+        return self._dense
+
+    def sync(self, grid: np.ndarray) -> None:
+        """Load a dense grid unless it is the viewport last returned by advance.
+
+        Args:
+            grid (numpy.ndarray): Current dense grid
+        """
+        if grid is not self._dense or self.viewport is None or grid.shape != self.viewport[2:]:
+            self.load(grid)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        """Advance a dense grid and return the resulting viewport grid.
+
+        The grid is the viewport of the plane: cells leaving it keep evolving
+        outside of it. The plane is kept between calls: if ``grid`` is the
+        array returned by the previous call, it is not loaded again.
+
+        Args:
+            grid (numpy.ndarray): Current dense grid
+            generations (int): Number of generations to compute
+
+        Returns:
+            numpy.ndarray: New dense grid of the viewport
+        """
+        self.sync(grid)
+        self.step(generations)
+        self._dense = self.window(*self.viewport)
+        return self._dense
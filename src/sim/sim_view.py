@@ -1,35 +1,102 @@
 """Simulation view module.
 
 This module provides the view component for the cellular automata simulation.
-It handles the visualization of the simulation grid using matplotlib, wrapped
-in a Tkinter widget for display. The view is optimized for performance, allowing
-smooth updates of the grid state as the simulation progresses.
+It handles the visualization of the simulation grid in a Tkinter widget. By
+default the grid is rasterized through a colormap lookup table straight into a
+Tk image (see sim_render); matplotlib, with blitting or full redraws, is kept as
+a fallback. Grids with more cells than the canvas has pixels are pooled down to
+the canvas size before drawing. The view is optimized for performance, allowing smooth updates of
+the grid state as the simulation progresses.
 """
 
-from typing import Any
+import tkinter as tk
+from typing import Any, Optional
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
+from .sim_render import RasterRenderer, fit_size, to_ppm
+from .sim_metrics import Metrics
 
 
 class SimView:
     """Simulation view component.
     
     This class represents the view component for the simulation module.
-    It manages the visualization of the cellular automaton grid using matplotlib
-    and provides methods to update the display when the grid state changes.
+    It manages the visualization of the cellular automaton grid and provides
+    methods to update the display when the grid state changes.
+    
+    Renderers:
+    - 'raster': colormap lookup table into a Tk photo image, no matplotlib per frame
+    - 'blit': matplotlib, only the image artist is redrawn and blitted
+    - 'matplotlib': matplotlib, full figure redraw
     """
-    def __init__(self, master: Any, width: int, height: int) -> None:
+    RENDERERS = ('raster', 'blit', 'matplotlib')
+    
+    def __init__(self, master: Any, width: int, height: int, renderer: str = 'raster',
+                 metrics: Optional[Metrics] = None) -> None:
         """Initialize the simulation view.
         
         Args:
             master: Parent Tkinter widget
             width (int): Grid width in cells
             height (int): Grid height in cells
+            renderer (str): One of SimView.RENDERERS. 'raster' falls back to
+                'blit' when the Tk image cannot be created.
+            metrics (Metrics, optional): Timings of the 'draw' phase
         """
+        if renderer not in self.RENDERERS:
+            raise ValueError(f"Unknown renderer: {renderer}")
         self.master = master
         self.current_grid = None
+        self.fig = None
+        self.renderer = renderer
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Colormap renderer, also provides the level-of-detail pooling
+        self.raster = RasterRenderer('inferno', vmin=0, vmax=1)
+        self._shown = None   # Grid and canvas size of the displayed frame
+        self._pooling = None
+        
+        if renderer == 'raster':
+            try:
+                self._init_raster(width, height)
+                return
+            except tk.TclError:
+                self.renderer = 'blit'
+        self._init_matplotlib(width, height)
+    
+    def _init_raster(self, width: int, height: int) -> None:
+        """Create the Tk canvas and photo image of the raster renderer.
+        
+        Args:
+            width (int): Initial canvas width in pixels
+            height (int): Initial canvas height in pixels
+        """
+        # Grids are stretched into a width x height box, like the imshow extent
+        self.box_shape = (height, width)
+        self.canvas_size = (width, height)
+        self.tk_canvas = tk.Canvas(self.master, width=width, height=height,
+                                   highlightthickness=0, background='black')
+        self.photo = tk.PhotoImage(master=self.master, width=width, height=height)
+        # Raises TclError if this Tk build cannot read PPM data
+        self.photo.configure(data=to_ppm(np.zeros((1, 1, 3), dtype=np.uint8)), format='PPM')
+        self.image_item = self.tk_canvas.create_image(width // 2, height // 2,
+                                                      image=self.photo, anchor='center')
+        self.tk_canvas.bind('<Configure>', self._on_resize)
+    
+    def _on_resize(self, event: Any) -> None:
+        """Track the canvas size and redraw the current grid."""
+        self.canvas_size = (max(1, event.width), max(1, event.height))
+        self.tk_canvas.coords(self.image_item, event.width // 2, event.height // 2)
+        if self.current_grid is not None:
+            self.update_display(self.current_grid, self._pooling)
+    
+    def _init_matplotlib(self, width: int, height: int) -> None:
+        """Create the matplotlib figure of the 'blit' and 'matplotlib' renderers.
         
+        Args:
+            width (int): Grid width in cells
+            height (int): Grid height in cells
+        """
         # Creation of matplotlib figure with fixed size
         self.fig = plt.figure(figsize=(width/100, height/100))  # Standard DPI = 100
         self.fig.set_facecolor('none')  # Transparent background
@@ -52,7 +119,7 @@ class SimView:
         )
         
         # Creation of Tkinter canvas with fixed size
-        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.master)
         
         # Configuration of view limits
         self.ax.set_xlim(-0.5, width-0.5)  # Grid centering
@@ -63,16 +130,55 @@ class SimView:
             callbacks = self.canvas.callbacks.callbacks.get(event_name, {})
             if callbacks and 0 in callbacks:
                 self.canvas.mpl_disconnect(callbacks[0])
+        
+        # Background without the image, captured at each full draw for blitting
+        self.background = None
+        self.grid_display.set_animated(self.renderer == 'blit')
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _on_draw(self, event: Any) -> None:
+        """Capture the background after a full redraw (e.g. a window resize)."""
+        if self.renderer == 'blit':
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self.ax.draw_artist(self.grid_display)
 
     
-    def update_display(self, grid: np.ndarray) -> None:
+    def update_display(self, grid: np.ndarray, pooling: Optional[str] = None) -> None:
         """Update the grid display.
         
+        Redrawing the displayed grid object at the same canvas size does nothing,
+        so grids must not be modified in place once displayed.
+        
         Args:
             grid (numpy.ndarray): New grid to display
+            pooling (str, optional): Reduction of grids larger than the canvas,
+                'max' for discrete grids, 'mean' for Lenia. By default 'max' for
+                integer grids and 'mean' otherwise.
         """
-        self.grid_display.set_array(grid)
-        self.canvas.draw()
+        self.current_grid = grid
+        self._pooling = pooling
+        with self.metrics.phase('draw'):
+            match self.renderer:
+                case 'raster':
+                    size = fit_size(self.box_shape, self.canvas_size)
+                    if self._shown is not None and self._shown[0] is grid and self._shown[1] == size:
+                        return
+                    rgb = self.raster.render(grid, size, pooling)
+                    self.photo.configure(width=size[0], height=size[1], data=to_ppm(rgb), format='PPM')
+                    self._shown = (grid, size)
+                case 'blit':
+                    grid = self.raster.pool(grid, self.canvas.get_width_height(), pooling)
+                    self.grid_display.set_array(grid)
+                    if self.background is None:
+                        self.canvas.draw()
+                        return
+                    self.canvas.restore_region(self.background)
+                    self.ax.draw_artist(self.grid_display)
+                    self.canvas.blit(self.fig.bbox)
+                case _:
+                    grid = self.raster.pool(grid, self.canvas.get_width_height(), pooling)
+                    self.grid_display.set_array(grid)
+                    self.canvas.draw()
     
     def get_canvas(self) -> Any:
         """Return the canvas widget.
@@ -80,8 +186,11 @@ class SimView:
         Returns:
             tkinter.Widget: Tkinter canvas widget
         """
+        if self.renderer == 'raster':
+            return self.tk_canvas
         return self.canvas.get_tk_widget()
     
     def __del__(self) -> None:
         """Clean up matplotlib resources."""
-        plt.close(self.fig)
+        if self.fig is not None:
+            plt.close(self.fig)
@@ -0,0 +1,180 @@
+"""Simulation worker module.
+
+This module moves the stepping of the simulation off the Tk event loop. A
+background thread advances the model at the frame rate set by the user and
+publishes every finished grid into a frame slot holding only the latest frame.
+The Tk side takes the newest frame at display rate, so frames the display cannot
+keep up with are dropped and a slow step no longer blocks the user interface.
+
+Each frame can batch several generations, either a fixed number or, in adaptive
+mode, as many as fit in the frame time according to recent step times.
+"""
+
+import threading
+import time
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+# Share of the frame time filled with generations in adaptive mode
+ADAPTIVE_FILL = 0.8
+# Upper bound of the generations per frame in adaptive mode
+MAX_GENERATIONS = 100_000
+# Weight of the last batch in the step time estimate
+STEP_TIME_SMOOTHING = 0.3
+
+
+class FrameSlot:
+    """Latest-frame slot.
+
+    A bounded buffer of one frame shared by the stepping thread (producer) and
+    the Tk thread (consumer). Publishing replaces the frame not taken yet.
+    """
+    def __init__(self) -> None:
+        """Initialize an empty frame slot."""
+        self._lock = threading.Lock()
+        self._frame = None
+        self._generation = 0
+        self.published = 0   # Number of frames published
+        self.dropped = 0     # Number of frames replaced before being taken
+
+    def publish(self, frame: np.ndarray, generation: int) -> None:
+        """Store a frame, replacing the frame not taken yet.
+
+        Args:
+            frame (numpy.ndarray): Grid to display, not modified afterwards
+            generation (int): Generation of the grid
+        """
+        with self._lock:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._generation = generation
+            self.published += 1
+
+    def take(self) -> Optional[Tuple[int, np.ndarray]]:
+        """Take the latest frame out of the slot.
+
+        Returns:
+            tuple: (generation, frame), or None if no frame was published since
+                the last call
+        """
+        with self._lock:
+            if self._frame is None:
+                return None
+            frame, self._frame = self._frame, None
+            return self._generation, frame
+
+
+class SimWorker:
+    """Background stepping thread.
+
+    The thread calls the step function at the frame rate returned by get_rate
+    while is_running returns True, and publishes the returned grids into its
+    frame slot. Each call runs with the worker lock held; hold it as well to
+    modify the model from another thread, e.g. to reset it.
+    """
+    def __init__(self,
+                 step: Callable[[int], np.ndarray],
+                 get_rate: Callable[[], float],
+                 is_running: Callable[[], bool],
+                 get_generations: Optional[Callable[[], int]] = None,
+                 is_adaptive: Optional[Callable[[], bool]] = None) -> None:
+        """Initialize the worker.
+
+        Args:
+            step (function): Advances the model by the given number of
+                generations and returns a grid that is not modified afterwards
+            get_rate (function): Returns the target number of frames per second
+            is_running (function): Returns True while the simulation should advance
+            get_generations (function, optional): Returns the number of
+                generations per frame, 1 by default
+            is_adaptive (function, optional): Returns True to fit the number of
+                generations per frame to the frame time instead
+        """
+        self.step = step
+        self.get_rate = get_rate
+        self.is_running = is_running
+        self.get_generations = get_generations or (lambda: 1)
+        self.is_adaptive = is_adaptive or (lambda: False)
+        self.slot = FrameSlot()
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.step_time = None          # Estimated seconds per generation
+        self.last_generations = 0      # Generations of the last frame
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the stepping thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sim-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the stepping thread after its current step."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def restart(self, frame: np.ndarray, generation: int = 0) -> None:
+        """Publish the grid of a reset or restored model and continue from it.
+
+        Args:
+            frame (numpy.ndarray): Grid to display, not modified afterwards
+            generation (int): Generation of the grid
+        """
+        with self.lock:
+            self.generation = generation
+            self.slot.publish(frame, generation)
+
+    def batch_size(self, rate: float) -> int:
+        """Return the number of generations to compute for the next frame.
+
+        Args:
+            rate (float): Target number of frames per second
+
+        Returns:
+            int: Generations per frame, fitted to ADAPTIVE_FILL of the frame time
+                from the step time estimate in adaptive mode
+        """
+        if not self.is_adaptive():
+            return max(1, int(self.get_generations()))
+        if not self.step_time:
+            return 1
+        return int(min(max(ADAPTIVE_FILL / (rate * self.step_time), 1), MAX_GENERATIONS))
+
+    def _run(self) -> None:
+        """Step the model until stopped, paced to the target rate."""
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            if not self.is_running():
+                self._stop.wait(0.01)
+                deadline = time.perf_counter()
+                continue
+
+            rate = self.get_rate()
+            generations = self.batch_size(rate)
+            with self.lock:
+                start = time.perf_counter()
+                frame = self.step(generations)
+                step_time = (time.perf_counter() - start) / generations
+                self.generation += generations
+                self.last_generations = generations
+                self.slot.publish(frame, self.generation)
+
+            if self.step_time is None:
+                self.step_time = step_time
+            else:
+                self.step_time += STEP_TIME_SMOOTHING * (step_time - self.step_time)
+
+            deadline += 1 / rate
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Slower than the target rate: do not try to catch up
+                deadline = time.perf_counter()
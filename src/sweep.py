@@ -0,0 +1,288 @@
+"""Lenia parameter sweep module.
+
+This is the entry point for mapping which kernel and growth parameters keep a
+pattern alive. The points of a parameter grid, or a random sample of parameter
+ranges, are run without display in a pool of worker processes. A run stops
+early when its mass dies out or blows up, and each finished run appends one row
+(survival time, final mass, centroid drift) to a CSV file. Points already in the
+file are skipped, so an interrupted sweep resumes where it stopped.
+
+Example:
+    python sweep.py --pattern 1 --growth-mu 0.12 0.14 0.16 --growth-sigma 0.01 0.015 0.02
+    python sweep.py --samples 200 --seed 3 --mu 0.4 0.6 --growth-mu 0.1 0.2 --output sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+import numpy as np
+from sim.sim_model import SimModel
+from fi.fi_model import FiModel
+from sim.sim_patterns import parse_pattern
+
+PARAMETERS = ('mu', 'sigma', 'growth_mu', 'growth_sigma')
+DEFAULTS = {'mu': 0.5, 'sigma': 0.15, 'growth_mu': 0.15, 'growth_sigma': 0.015}
+RESULT_FIELDS = ['key', 'pattern', *PARAMETERS, 'status', 'survival', 'final_mass',
+                 'mass_ratio', 'drift', 'elapsed']
+
+
+def point_key(point: Dict[str, float], pattern: Union[int, str]) -> str:
+    """Return the identifier of a sweep point, used to resume a sweep.
+
+    Args:
+        point (dict): Parameter values
+        pattern (int or str): Initial pattern, see SimModel.reset_continuous
+
+    Returns:
+        str: Key built from the pattern and the rounded parameter values
+    """
+    return f"{pattern}:" + ",".join(f"{name}={point[name]:.6g}" for name in PARAMETERS)
+
+
+def parameter_grid(values: Dict[str, Iterable[float]]) -> List[Dict[str, float]]:
+    """Return every combination of the parameter values.
+
+    Args:
+        values (dict): Values of each parameter, missing parameters take
+            their FiModel default
+
+    Returns:
+        list: One dict of parameter values per point
+    """
+    lists = [list(values.get(name, [DEFAULTS[name]])) for name in PARAMETERS]
+    return [dict(zip(PARAMETERS, combination)) for combination in itertools.product(*lists)]
+
+
+def random_sample(bounds: Dict[str, Iterable[float]], count: int,
+                  seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """Return points drawn uniformly within parameter ranges.
+
+    Args:
+        bounds (dict): (low, high) range, or single fixed value, of each
+            parameter, missing parameters take their FiModel default
+        count (int): Number of points
+        seed (int, optional): Seed of the random generator
+
+    Returns:
+        list: One dict of parameter values per point
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name in PARAMETERS:
+        bound = list(bounds.get(name, [DEFAULTS[name]]))
+        if len(bound) == 1:
+            columns[name] = np.full(count, float(bound[0]))
+        elif len(bound) == 2:
+            columns[name] = rng.uniform(bound[0], bound[1], count)
+        else:
+            raise ValueError(f"Expected a value or a (low, high) range for {name}, got {bound}")
+    return [{name: float(columns[name][index]) for name in PARAMETERS} for index in range(count)]
+
+
+def centroid(grid: np.ndarray) -> np.ndarray:
+    """Return the centroid of the mass of a toroidal grid.
+
+    Each coordinate is a circular mean, so a pattern crossing the border is
+    not split between both sides.
+
+    Args:
+        grid (numpy.ndarray): Grid of cells with a positive mass
+
+    Returns:
+        numpy.ndarray: (row, column) of the centroid
+    """
+    position = np.empty(2)
+    for axis in range(2):
+        size = grid.shape[axis]
+        weights = grid.sum(axis=1 - axis)
+        angles = 2 * np.pi * np.arange(size) / size
+        angle = np.arctan2(weights @ np.sin(angles), weights @ np.cos(angles))
+        position[axis] = (angle % (2 * np.pi)) * size / (2 * np.pi)
+    return position
+
+
+def run_point(point: Dict[str, float],
+              pattern: Union[int, str] = 1,
+              generations: int = 500,
+              dt: float = 0.1,
+              min_mass: float = 1e-3,
+              max_fill: float = 0.5,
+              conv_method: str = 'auto') -> Dict[str, Any]:
+    """Run one sweep point.
+
+    Args:
+        point (dict): Parameter values, see PARAMETERS
+        pattern (int or str): Initial pattern, 0 stain, 1 orbium, or name of a
+            continuous pattern of the library
+        generations (int): Maximum number of generations
+        dt (float): Time step
+        min_mass (float): The run died when its mass falls below this value
+        max_fill (float): The run exploded when its mass exceeds this share of
+            the grid cells
+        conv_method (str): Convolution method of the model
+
+    Returns:
+        dict: Result row, see RESULT_FIELDS. 'survival' is the number of
+            generations computed before the run died, exploded or reached
+            'generations'; 'drift' the distance traveled by the centroid.
+    """
+    start = time.perf_counter()
+    fi_model = FiModel(point['mu'], point['sigma'], point['growth_mu'], point['growth_sigma'])
+    sim_model = SimModel(conv_method=conv_method)
+    sim_model.reset_continuous(pattern)
+    if sim_model.get_grid() is None:
+        raise ValueError(f"Unknown pattern: {pattern}")
+    nhood, nhood_key = fi_model.get_con_nhood_with_key()
+
+    grid = sim_model.get_grid()
+    initial_mass = float(grid.sum())
+    max_mass = max_fill * grid.size
+    shape = np.array(grid.shape)
+    position = centroid(grid)
+    drift = 0.0
+    status = 'alive'
+    survival = 0
+    for survival in range(1, generations + 1):
+        sim_model.update(fi_model.growth_lenia, nhood, dt, nhood_key)
+        grid = sim_model.get_grid()
+        mass = float(grid.sum())
+        if mass < min_mass:
+            status = 'died'
+            break
+        if mass > max_mass:
+            status = 'exploded'
+            break
+        # Shortest displacement on the torus since the last generation
+        new_position = centroid(grid)
+        step = (new_position - position + shape / 2) % shape - shape / 2
+        drift += float(np.hypot(*step))
+        position = new_position
+
+    final_mass = float(grid.sum())
+    return dict(point, key=point_key(point, pattern), pattern=pattern, status=status,
+                survival=survival, final_mass=final_mass,
+                mass_ratio=final_mass / initial_mass if initial_mass else 0.0,
+                drift=drift, elapsed=time.perf_counter() - start)
+
+
+def finished_keys(path: str) -> Set[str]:
+    """Return the keys of the points already in a result file.
+
+    A row cut by an interruption is removed from the file.
+
+    Args:
+        path (str): CSV result file, may not exist
+
+    Returns:
+        set: Keys of the complete rows
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'rb+') as file:
+        data = file.read()
+        if data and not data.endswith(b'\n'):
+            file.truncate(data.rfind(b'\n') + 1)
+    with open(path, newline='', encoding='utf-8') as file:
+        return {row['key'] for row in csv.DictReader(file)
+                if row.get('key') and row.get(RESULT_FIELDS[-1]) not in (None, '')}
+
+
+def sweep(points: List[Dict[str, float]],
+          output: str,
+          workers: Optional[int] = None,
+          **kwargs: Any) -> List[Dict[str, Any]]:
+    """Run the points not yet in the result file in a process pool.
+
+    Args:
+        points (list): Parameter values of each point
+        output (str): CSV result file, appended to
+        workers (int, optional): Number of processes, default the number of CPUs
+        **kwargs: Run settings, see run_point
+
+    Returns:
+        list: Result rows of the points run by this call, in completion order
+    """
+    pattern = kwargs.get('pattern', 1)
+    done = finished_keys(output)
+    pending, seen = [], set(done)
+    for point in points:
+        key = point_key(point, pattern)
+        if key not in seen:
+            seen.add(key)
+            pending.append(point)
+
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    results = []
+    new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+    with open(output, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        if not pending:
+            return results
+        # Spawned workers, like the multiprocess engine: no state inherited by fork
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(run_point, point, **kwargs) for point in pending]
+            for future in as_completed(futures):
+                row = future.result()
+                writer.writerow(row)
+                file.flush()
+                results.append(row)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Sweep Lenia parameters in a process pool.")
+    for name in PARAMETERS:
+        parser.add_argument('--' + name.replace('_', '-'), type=float, nargs='+', default=None,
+                            help=f"values of {name} (grid), or LOW HIGH with --samples, "
+                                 f"default {DEFAULTS[name]}")
+    parser.add_argument('--samples', type=int, default=None,
+                        help="draw this many random points instead of the full grid")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--pattern', type=parse_pattern, default=1,
+                        help="0 stain, 1 orbium, or a pattern name of the library")
+    parser.add_argument('--generations', type=int, default=500)
+    parser.add_argument('--min-mass', type=float, default=1e-3, help="mass below which a run died")
+    parser.add_argument('--max-fill', type=float, default=0.5,
+                        help="share of the cells above which a run exploded")
+    parser.add_argument('--workers', type=int, default=None, help="default the number of CPUs")
+    parser.add_argument('--output', default='sweep.csv', help="CSV result file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the parameter sweep."""
+    args = parse_args(argv)
+    values = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name) is not None}
+    if args.samples is not None:
+        points = random_sample(values, args.samples, args.seed)
+    else:
+        points = parameter_grid(values)
+
+    start = time.perf_counter()
+    results = sweep(points, args.output, args.workers, pattern=args.pattern,
+                    generations=args.generations, min_mass=args.min_mass, max_fill=args.max_fill)
+    alive = sum(row['status'] == 'alive' for row in results)
+    print(f"{len(results)} of {len(points)} points run in {time.perf_counter() - start:.1f} s "
+          f"({alive} alive), results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
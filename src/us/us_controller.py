@@ -6,7 +6,7 @@ handling user input events, managing simulation controls like start/stop, reset,
 and continuous mode, and configuring parameter sliders for the simulation functions.
 """
 
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 from .us_model import UsModel
 
 
@@ -42,9 +42,31 @@ class UsController:
 
         self.view.speed_slider.config(command=combined_command)
         
+        # Configure generations per frame
+        self.view.generations_spinbox.config(command=self.update_generations_per_frame)
+        self.view.generations_spinbox.bind(
+            '<KeyRelease>', lambda event: self.update_generations_per_frame())
+        self.view.adaptive_switch.config(command=self.model.toggle_adaptive_generations)
+        self.view.metrics_switch.config(command=self.toggle_metrics)
+        self.view.profile_button.config(
+            command=lambda: self.model.request_profile(self.view.profile_spinbox.get()))
+        
+        # Configure history navigation
+        self.view.back_button.config(command=lambda: self.model.request_seek('step', -1))
+        self.view.forward_button.config(command=lambda: self.model.request_seek('step', 1))
+        self.view.seek_button.config(
+            command=lambda: self.model.request_seek('generation', self.view.seek_entry.get()))
+        self.view.seek_entry.bind(
+            '<Return>', lambda event: self.model.request_seek('generation', self.view.seek_entry.get()))
+        
         # Configure numeric entry
         self.view.set_numeric_entry_command(self.update_numeric_value)
     
+    def toggle_metrics(self) -> None:
+        """Toggle the metrics overlay, hidden at once when turned off."""
+        if not self.model.toggle_metrics():
+            self.view.show_metrics(None)
+    
     def update_numeric_value(self, value: str) -> None:
         """Update the numeric value in the model.
         
@@ -53,6 +75,10 @@ class UsController:
         """
         self.model.set_numeric_value(value)
     
+    def update_generations_per_frame(self) -> None:
+        """Update the generations per frame in the model from the spinbox."""
+        self.model.set_generations_per_frame(self.view.generations_spinbox.get())
+    
     def set_continuous_switch_callback(self, continuous_button_command: Callable[[], None]) -> None:
         """Configure the callback for the continuous mode switch.
         
@@ -136,6 +162,64 @@ class UsController:
         return self.model.speed
         
     
+    def get_generations_per_frame(self) -> int:
+        """Return the number of generations computed before each frame.
+        
+        Returns:
+            int: Generations per frame
+        """
+        return self.model.get_generations_per_frame()
+    
+    def is_adaptive_generations(self) -> bool:
+        """Return the adaptive generations per frame state.
+        
+        Returns:
+            bool: True if the generations per frame follow the frame time
+        """
+        return self.model.adaptive_generations
+    
+    def show_generation(self, generation: int, period: Optional[int] = None) -> None:
+        """Display the generation of the frame shown by the simulation view.
+        
+        Args:
+            generation (int): Generation of the displayed frame
+            period (int, optional): Period of the cycle the run settled into
+        """
+        text = f"Generation : {generation}"
+        if period is not None:
+            text += " (still life)" if period == 1 else f" (cycle of {period})"
+        self.view.generation_label.config(text=text)
+    
+    def is_metrics_shown(self) -> bool:
+        """Return True while the metrics overlay is shown.
+        
+        Returns:
+            bool: Metrics overlay state
+        """
+        return self.model.show_metrics
+    
+    def show_metrics(self, text: str) -> None:
+        """Display the text of the metrics overlay, if it is shown.
+        
+        Args:
+            text (str): Actual rate and phase timings, see format_overlay
+        """
+        if self.model.show_metrics:
+            self.view.show_metrics(text)
+    
+    def show_profile(self, text: str) -> None:
+        """Display the state of the profile capture.
+        
+        Args:
+            text (str): Capture in progress, or files written
+        """
+        self.view.profile_label.config(text=text)
+    
+    def pause(self) -> None:
+        """Pause the simulation if it is running."""
+        if self.model.is_running:
+            self.model.toggle_running_state()
+    
     def is_running(self) -> bool:
         """Return the current simulation state.
         
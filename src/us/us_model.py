@@ -7,7 +7,7 @@ numeric values. The model also manages the reset operation and synchronizes
 with the user interface elements.
 """
 
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 
 class UsModel:
     """User settings model component.
@@ -25,6 +25,10 @@ class UsModel:
         - No reset pending
         - Discrete mode (not continuous) by default
         - Initial numeric value of 0
+        - One generation per displayed frame, adaptive mode off
+        - No history seek pending
+        - Metrics overlay hidden
+        - No profile capture pending
         """
         self.toggle_button = None
         self.speed = 60.0  # Default speed (generations per second)
@@ -32,6 +36,11 @@ class UsModel:
         self.needs_reset = False  # Reset flag
         self.is_continuous = False  # Continuous mode state
         self.numeric_value = 0  # Numeric value entered by the user
+        self.generations_per_frame = 1  # Generations computed before each frame
+        self.adaptive_generations = False  # Fit the generations to the frame time
+        self.seek_request = None  # Pending history seek, see request_seek
+        self.show_metrics = False  # Metrics overlay shown, and phase timings on
+        self.profile_request = None  # Pending profile capture, see request_profile
     
     def set_widgets(self, toggle_button: Any) -> None:
         """Store only the reference to the toggle button that needs to be updated."""
@@ -53,6 +62,54 @@ class UsModel:
         self.needs_reset = True
         self.toggle_button.config(text="Start")
     
+    def request_seek(self, kind: str, value: Union[int, str, None]) -> None:
+        """Request a move in the history of the simulation.
+        
+        Args:
+            kind (str): 'step' to move by value frames (negative to go back),
+                'generation' to go to generation value
+            value (int or str): Number of frames or generation, invalid values
+                are ignored
+        """
+        try:
+            self.seek_request = (kind, int(float(value)))
+        except (ValueError, TypeError):
+            # If conversion fails, keep the current request
+            pass
+    
+    def acknowledge_seek(self) -> Optional[Tuple[str, int]]:
+        """Acknowledge the history seek request.
+        
+        Returns:
+            tuple: (kind, value) of the pending request, or None
+        """
+        request, self.seek_request = self.seek_request, None
+        return request
+    
+    def request_profile(self, value: Union[int, str, None]) -> None:
+        """Request a profile capture of the next steps.
+        
+        Args:
+            value (int or str): Number of steps to capture, invalid values and
+                values below 1 are ignored
+        """
+        try:
+            calls = int(float(value))
+        except (ValueError, TypeError):
+            # If conversion fails, keep the current request
+            return
+        if calls >= 1:
+            self.profile_request = calls
+    
+    def acknowledge_profile(self) -> Optional[int]:
+        """Acknowledge the profile capture request.
+        
+        Returns:
+            int: Number of steps to capture, or None
+        """
+        request, self.profile_request = self.profile_request, None
+        return request
+    
     def acknowledge_reset(self) -> bool:
         """Acknowledge the reset request.
         
@@ -109,3 +166,48 @@ class UsModel:
         return self.numeric_value
             
     
+
+    def set_generations_per_frame(self, value: Union[int, str, None]) -> None:
+        """Set the number of generations computed before each displayed frame.
+        
+        Args:
+            value (int or str): Number of generations, values below 1 are ignored
+        """
+        try:
+            generations = int(float(value))
+        except (ValueError, TypeError):
+            # If conversion fails, keep the current value
+            return
+        if generations >= 1:
+            self.generations_per_frame = generations
+    
+    def get_generations_per_frame(self) -> int:
+        """Get the number of generations computed before each displayed frame.
+        
+        Returns:
+            int: Generations per frame, ignored in adaptive mode
+        """
+        return self.generations_per_frame
+    
+    def toggle_adaptive_generations(self) -> bool:
+        """Toggle the adaptive generations per frame mode.
+        
+        In adaptive mode the simulation computes as many generations as fit in
+        the time of one frame.
+        
+        Returns:
+            bool: New adaptive mode state
+        """
+        self.adaptive_generations = not self.adaptive_generations
+        return self.adaptive_generations
+    
+    def toggle_metrics(self) -> bool:
+        """Toggle the metrics overlay.
+        
+        The phase timings are only recorded while the overlay is shown.
+        
+        Returns:
+            bool: New overlay state
+        """
+        self.show_metrics = not self.show_metrics
+        return self.show_metrics
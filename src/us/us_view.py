@@ -9,7 +9,7 @@ for the Gaussian function and growth function.
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 # pylint raise a warning for the class attribute number. It's ok, it's a UI class
 class UsView: # pylint: disable=R0902
@@ -29,6 +29,10 @@ class UsView: # pylint: disable=R0902
         - Continuous mode checkbox
         - Numeric entry field
         - Speed control slider
+        - Generations per frame field and adaptive mode checkbox
+        - Metrics overlay checkbox
+        - Profile capture button and number of steps
+        - History step back/forward buttons and generation field
         - Gaussian function parameter sliders
         - Growth function parameter sliders
         Args:
@@ -43,6 +47,7 @@ class UsView: # pylint: disable=R0902
         # Creation of widgets
         self._create_control_buttons()
         self._create_speed_frame()
+        self._create_history_frame()
         self._create_gaussian_frame()
 
     def _create_control_buttons(self) -> None:
@@ -111,12 +116,66 @@ class UsView: # pylint: disable=R0902
         )
         self.speed_slider.grid(row=1, column=0, pady=5, padx=10, sticky='ew')
 
+        # Generations computed before each frame, or adaptive to the frame time
+        generations_frame = ttk.Frame(speed_frame)
+        generations_frame.grid(row=2, column=0, pady=(0, 5))
+        generations_label = ttk.Label(generations_frame, text="Gen/frame :")
+        generations_label.grid(row=0, column=0, padx=(0, 5))
+        self.generations_spinbox = ttk.Spinbox(generations_frame, from_=1, to=10000, width=6)
+        self.generations_spinbox.set(1)
+        self.generations_spinbox.grid(row=0, column=1, padx=(0, 10))
+        self.adaptive_switch = ttk.Checkbutton(generations_frame, text="Adaptive")
+        self.adaptive_switch.grid(row=0, column=2)
+
+        # Actual rate and phase timings (p50 / p95 / max), shown on demand
+        self.metrics_switch = ttk.Checkbutton(speed_frame, text="Metrics")
+        self.metrics_switch.grid(row=3, column=0, pady=(0, 5))
+        self.metrics_label = ttk.Label(speed_frame, text="", justify=tk.LEFT,
+                                       font='TkFixedFont')
+        self.metrics_label.grid(row=4, column=0, pady=(0, 5), padx=10, sticky='w')
+        self.metrics_label.grid_remove()
+
+        # cProfile and tracemalloc capture of the next steps
+        profile_frame = ttk.Frame(speed_frame)
+        profile_frame.grid(row=5, column=0, pady=(0, 5))
+        self.profile_spinbox = ttk.Spinbox(profile_frame, from_=1, to=10000, width=6)
+        self.profile_spinbox.set(100)
+        self.profile_spinbox.grid(row=0, column=0, padx=(0, 5))
+        self.profile_button = ttk.Button(profile_frame, text="Profile")
+        self.profile_button.grid(row=0, column=1)
+        self.profile_label = ttk.Label(speed_frame, text="", wraplength=260)
+        self.profile_label.grid(row=6, column=0, pady=(0, 5), padx=10, sticky='w')
+
+    def _create_history_frame(self) -> None:
+
+        """Create history frame."""
+        history_frame = ttk.LabelFrame(self.frame, text="History")
+        history_frame.grid(row=3, column=0, pady=5, padx=5, sticky='ew')
+        for column in range(4):
+            history_frame.grid_columnconfigure(column, weight=1)
+
+        # Generation of the displayed frame
+        self.generation_label = ttk.Label(history_frame, text="Generation : 0")
+        self.generation_label.grid(row=0, column=0, columnspan=4, pady=(5, 0))
+
+        # Step back/forward through the stored frames
+        self.back_button = ttk.Button(history_frame, text="◀", width=3)
+        self.back_button.grid(row=1, column=0, pady=5, padx=(10, 0))
+        self.forward_button = ttk.Button(history_frame, text="▶", width=3)
+        self.forward_button.grid(row=1, column=1, pady=5)
+
+        # Seek to a generation
+        self.seek_entry = ttk.Entry(history_frame, width=7)
+        self.seek_entry.grid(row=1, column=2, pady=5)
+        self.seek_button = ttk.Button(history_frame, text="Go", width=4)
+        self.seek_button.grid(row=1, column=3, pady=5, padx=(0, 10))
+
     def _create_gaussian_frame(self) -> None:
 
         """Create gaussian parameters frame."""
         gaussian_frame = ttk.LabelFrame(self.frame, text="Gaussian Function")
         gaussian_frame.grid_columnconfigure(0, weight=1)
-        gaussian_frame.grid(row=3, column=0, pady=5, padx=5, sticky='ew')
+        gaussian_frame.grid(row=4, column=0, pady=5, padx=5, sticky='ew')
         # μ (mu) parameter
 
         self.mu_label = ttk.Label(gaussian_frame, text="μ : 0.50")
@@ -145,7 +204,7 @@ class UsView: # pylint: disable=R0902
         # New frame for growth function
         growth_frame = ttk.LabelFrame(self.frame, text="Growth Function")
         growth_frame.grid_columnconfigure(0, weight=1)
-        growth_frame.grid(row=4, column=0, pady=5, padx=5, sticky='ew')
+        growth_frame.grid(row=5, column=0, pady=5, padx=5, sticky='ew')
 
         # μ (mu) parameter for growth
         self.growth_mu_label = ttk.Label(growth_frame, text="μ : 0.15")
@@ -172,6 +231,17 @@ class UsView: # pylint: disable=R0902
         )
         self.growth_sigma_slider.grid(row=3, column=0, pady=(0,5), padx=10, sticky='ew')
 
+    def show_metrics(self, text: Optional[str]) -> None:
+        """Show the metrics overlay, or hide it.
+        Args:
+            text (str, optional): Overlay text, None to hide the overlay
+        """
+        if text is None:
+            self.metrics_label.grid_remove()
+            return
+        self.metrics_label.config(text=text)
+        self.metrics_label.grid()
+
     def get_frame(self) -> ttk.Frame:
         """Get the main frame of the view.
         Returns:
@@ -1,6 +1,9 @@
+import threading
+import time
 import pytest
 import numpy as np
-from src.fi.fi_model import FiModel
+from src.fi.fi_model import FiModel, GOL_GROWTH_LUT, LENIA_LUT_ERROR
+from src.sim.sim_model import SimModel
 
 class TestFiModel:
     @pytest.fixture
@@ -107,6 +110,26 @@ class TestFiModel:
         assert model.mu == new_mu
         assert model.sigma == new_sigma
     
+    def test_kernel_and_key_read_together(self, model):
+        """A kernel read during a parameter change comes with its own key."""
+        seen = []
+        build = model._update_con_nhood
+
+        def slow_build():
+            # mu is already set: a reader must not pair the new key with the old kernel
+            reader = threading.Thread(target=lambda: seen.append(model.get_con_nhood_with_key()))
+            reader.start()
+            time.sleep(0.05)
+            build()
+            model.reader = reader
+
+        model._update_con_nhood = slow_build
+        model.set_nhood_params(mu=0.3)
+        model.reader.join()
+        kernel, key = seen[0]
+        assert key == model.get_con_nhood_key() == ('continuous', 0.3, 0.15, 13)
+        assert np.array_equal(kernel, FiModel(mu=key[1], sigma=key[2]).get_con_nhood())
+
     def test_set_growth_params(self, model):
         """Test that the growth parameters update works."""
         # Save the initial values
@@ -124,4 +147,95 @@ class TestFiModel:
         
         # Verify that the growth function uses the new parameters
         result = model.growth_lenia(new_g_mu)
-        assert np.isclose(result, 1.0) 
\ No newline at end of file
+        assert np.isclose(result, 1.0)
+
+    def test_kernel_cache(self):
+        """Visited neighborhood parameters reuse their kernel, and the cache is bounded."""
+        model = FiModel(mu=0.5, sigma=0.15, kernel_cache_size=2)
+        kernel = model.get_con_nhood()
+        assert model.kernel_builds == 1
+        assert not kernel.flags.writeable
+
+        model.set_nhood_params(mu=0.6)
+        assert np.isclose(np.sum(model.get_con_nhood()), 1.0)
+        model.set_nhood_params(mu=0.5)
+        assert model.get_con_nhood() is kernel
+        assert model.kernel_builds == 2
+
+        # mu=0.6 is the least recently used kernel, evicted by mu=0.7
+        model.set_nhood_params(mu=0.7)
+        model.set_nhood_params(mu=0.6)
+        assert model.kernel_builds == 4
+        model.set_nhood_params(mu=0.5)
+        assert model.kernel_builds == 5
+
+        # A cached kernel equals a freshly built one
+        assert np.array_equal(model.get_con_nhood(), FiModel(mu=0.5, sigma=0.15).get_con_nhood()) 
+
+
+class TestGrowthLut:
+    @pytest.fixture
+    def model(self):
+        """Create an instance of FiModel evaluating growth_lenia through its table."""
+        return FiModel(mu=0.5, sigma=0.15, growth_mu=0.15, growth_sigma=0.015, lenia_lut=True)
+
+    @pytest.mark.parametrize("dtype", [np.int8, np.uint8, np.int64])
+    def test_gol_lut_matches_masks(self, dtype):
+        """Integer neighbor counts give the same growth as the float mask path."""
+        model = FiModel()
+        counts = np.random.default_rng(0).integers(0, 10, (64, 64)).astype(dtype)
+        expected = model.growth_gol(counts.astype(float))
+        result = model.growth_gol(counts)
+        assert np.array_equal(result, expected)
+        assert GOL_GROWTH_LUT[[0, 1, 2, 3, 4, 8]].tolist() == [-1, -1, 0, 1, -1, -1]
+
+    @pytest.mark.parametrize("g_mu, g_sigma", [(0.15, 0.015), (0.3, 0.05), (0.12, 0.004)])
+    def test_lenia_lut_error(self, model, g_mu, g_sigma):
+        """The table stays within LENIA_LUT_ERROR of the exact function, inside and outside its window."""
+        model.set_growth_params(g_mu, g_sigma)
+        rng = np.random.default_rng(1)
+        u = np.concatenate([rng.uniform(g_mu - 7 * g_sigma, g_mu + 7 * g_sigma, 50000),
+                            rng.uniform(0, 1, 10000), [0.0, 1.0, g_mu]])
+        exact = -1 + 2 * model._gauss(u, g_mu, g_sigma)
+        assert np.max(np.abs(model.growth_lenia(u) - exact)) < LENIA_LUT_ERROR
+
+        # In place, as used by the simulation engines
+        out = u.copy()
+        assert model.growth_lenia(out, out=out) is out
+        assert np.max(np.abs(out - exact)) < LENIA_LUT_ERROR
+
+    def test_lenia_lut_rebuilt_on_parameter_change(self, model):
+        """The table is built once per growth parameter change, not per call."""
+        builds = model.growth_lut_builds
+        u = np.linspace(0, 1, 1000)
+        model.growth_lenia(u)
+        model.growth_lenia(u)
+        assert model.growth_lut_builds == builds
+        model.set_nhood_params(mu=0.4)
+        assert model.growth_lut_builds == builds
+        model.set_growth_params(g_mu=0.2)
+        assert model.growth_lut_builds == builds + 1
+        assert np.isclose(model.growth_lenia(np.array([0.2]))[0], 1.0)
+
+    def test_lenia_lut_scalar_and_zero_width(self, model):
+        """Scalars use the exact function, and a zero width disables the table."""
+        assert model.growth_lenia(0.15) == 1.0
+        model.set_growth_params(g_sigma=0.0)
+        assert model.lenia_table is None
+        u = np.array([0.1, 0.15, 0.2])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exact = FiModel(growth_sigma=0.0).growth_lenia(u)
+            assert np.array_equal(model.growth_lenia(u), exact, equal_nan=True)
+
+    def test_simulation_with_lut(self, model):
+        """A Lenia run with the table stays close to the exact run."""
+        exact_model = FiModel(mu=0.5, sigma=0.15, growth_mu=0.15, growth_sigma=0.015)
+        nhood, nhood_key = model.get_con_nhood(), model.get_con_nhood_key()
+        runs = []
+        for fi_model in (exact_model, model):
+            sim_model = SimModel()
+            sim_model.reset_continuous(1)
+            for _ in range(20):
+                sim_model.update(fi_model.growth_lenia, nhood, 0.1, nhood_key)
+            runs.append(sim_model.get_grid())
+        assert np.max(np.abs(runs[0] - runs[1])) < 20 * 0.1 * LENIA_LUT_ERROR
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import json
+import pstats
+import tracemalloc
+import numpy as np
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC_PATH)
+
+import headless  # pylint: disable=C0413
+from sim.sim_record import read_header  # pylint: disable=C0413
+
+class TestHeadless:
+    def test_discrete_run_writes_results(self, tmp_path):
+        """A discrete run writes the final state, the stats and the config."""
+        result = headless.run(20, width=40, height=30, seed=1, output_dir=str(tmp_path))
+
+        assert len(result['stats']) == 20
+        assert result['grid'].shape == (30, 40)
+        assert np.array_equal(np.load(tmp_path / 'final_state.npy'), result['grid'])
+        with open(tmp_path / 'stats.csv', encoding='utf-8') as file:
+            assert len(file.readlines()) == 21
+        with open(tmp_path / 'run.json', encoding='utf-8') as file:
+            assert json.load(file)['config']['engine'] == 'bitboard'
+
+    def test_seed_is_reproducible(self):
+        """Two runs with the same seed give the same grid, whatever the engine."""
+        first = headless.run(15, seed=7, engine='convolution')
+        second = headless.run(15, seed=7, engine='bitboard')
+        assert np.array_equal(first['grid'], second['grid'])
+
+    def test_continuous_run(self):
+        """A Lenia run keeps its mass statistics."""
+        result = headless.run(5, continuous=True, pattern=1)
+        assert all(row['mass'] > 0 for row in result['stats'])
+
+    def test_named_pattern(self, capsys):
+        """A library pattern is selected by name, and the library can be listed."""
+        args = headless.parse_args(['--pattern', 'glider'])
+        assert args.pattern == 'glider' and headless.parse_args(['--pattern', '1']).pattern == 1
+        result = headless.run(8, width=20, height=20, pattern='glider')
+        assert result['grid'].sum() == 5
+
+        headless.main(['--list-patterns'])
+        assert 'Glider: discrete, 3x3, period 4' in capsys.readouterr().out
+
+    def test_precision(self, tmp_path):
+        """The precision option sets the grid and recording dtypes."""
+        path = str(tmp_path / 'run.traj')
+        result = headless.run(5, continuous=True, pattern=1, precision='float16', record=path)
+        assert result['grid'].dtype == np.float16
+        header, count, _ = read_header(path)
+        assert count == 6 and header['dtype'] == np.dtype(np.float16).str
+        assert header['precision'] == 'float16'
+
+    def test_metrics_export(self, tmp_path):
+        """The phase timings are exported every metrics_every generations and at the end."""
+        path = tmp_path / 'metrics.jsonl'
+        headless.run(25, width=30, height=30, seed=2, engine='convolution',
+                     metrics=str(path), metrics_every=10)
+        lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [line['generation'] for line in lines] == [10, 20, 25]
+        assert lines[-1]['phases']['convolve']['count'] == 25
+        assert lines[-1]['shape'] == [30, 30] and lines[-1]['engine'] == 'convolution'
+
+    def test_profile_capture(self, tmp_path):
+        """The first generations are profiled into files named after the run, then tracing stops."""
+        result = headless.run(12, width=30, height=20, seed=2, profile=5, output_dir=str(tmp_path))
+        paths = result['profile']
+        assert os.path.basename(paths['pstats']).startswith(
+            'profile_discrete_20x30_mu0.5_sigma0.15_gmu0.15_gsigma0.015_')
+        assert pstats.Stats(paths['pstats']).total_calls > 0
+        assert tracemalloc.Snapshot.load(paths['tracemalloc']).traces
+        assert not tracemalloc.is_tracing()
+
+    def test_no_gui_imports(self, tmp_path):
+        """The headless path never imports tkinter or matplotlib."""
+        code = ("import sys, headless; "
+                f"headless.main(['--generations', '3', '--output', {str(tmp_path)!r}]); "
+                "assert 'tkinter' not in sys.modules and 'matplotlib' not in sys.modules")
+        completed = subprocess.run([sys.executable, '-c', code], cwd=SRC_PATH,
+                                   capture_output=True, text=True, check=False)
+        assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,78 @@
+import tracemalloc
+import pytest
+import numpy as np
+from src.sim.sim_model import SimModel
+from src.sim.sim_convolution import FFT_HAS_OUT
+from src.fi.fi_model import FiModel
+
+class TestBufferedEngine:
+    @pytest.fixture
+    def fi_model(self):
+        """Create an instance of FiModel providing the rules."""
+        return FiModel()
+
+    def test_growth_out_matches(self, fi_model):
+        """The in-place growth functions give the same values as the allocating ones."""
+        counts = np.arange(9, dtype=np.float64)
+        assert np.array_equal(fi_model.growth_gol(counts, out=np.empty(9)), fi_model.growth_gol(counts))
+
+        potential = np.linspace(0, 1, 101)
+        out = potential.copy()
+        fi_model.growth_lenia(out, out=out)
+        assert np.allclose(out, fi_model.growth_lenia(potential), atol=1e-15)
+
+    def test_continuous_matches_convolution(self, fi_model):
+        """A Lenia run with buffers matches the convolution engine."""
+        reference = SimModel(conv_method='fft')
+        buffered = SimModel(conv_method='fft')
+        buffered.set_engine('buffered')
+        reference.orbium()
+        buffered.orbium()
+        for _ in range(20):
+            for model in (reference, buffered):
+                model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                             fi_model.get_con_nhood_key())
+        assert np.allclose(reference.get_grid(), buffered.get_grid(), atol=1e-12)
+
+    @pytest.mark.parametrize("method", ['direct', 'fft'])
+    def test_discrete_matches_convolution(self, fi_model, method):
+        """A Game of Life run with buffers gives the same cells."""
+        reference = SimModel()
+        buffered = SimModel(conv_method=method)
+        buffered.set_engine('buffered')
+        np.random.seed(0)
+        reference.random()
+        buffered.grid = reference.get_grid()
+        for _ in range(30):
+            for model in (reference, buffered):
+                model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1)
+        assert np.array_equal(reference.get_grid(), buffered.get_grid())
+
+    def test_double_buffering(self, fi_model):
+        """The model alternates between two grids."""
+        model = SimModel()
+        model.set_engine('buffered')
+        model.orbium()
+        grids = []
+        for _ in range(4):
+            model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1)
+            grids.append(model.get_grid())
+        assert grids[0] is grids[2] and grids[1] is grids[3] and grids[0] is not grids[1]
+
+    @pytest.mark.skipif(not FFT_HAS_OUT, reason="FFT out= requires NumPy >= 2.0")
+    def test_memory_stays_flat(self, fi_model):
+        """Steps on the FFT path allocate no grid-sized array."""
+        model = SimModel(conv_method='fft')
+        model.set_engine('buffered')
+        model.grid = np.random.default_rng(0).random((256, 256))
+        rule = (fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1, fi_model.get_con_nhood_key())
+        model.update(*rule)
+
+        tracemalloc.start()
+        for _ in range(50):
+            model.update(*rule)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # One 256x256 float64 grid is 512 KiB
+        assert peak < 64 * 1024
+        assert current < 16 * 1024
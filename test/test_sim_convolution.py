@@ -0,0 +1,201 @@
+import pytest
+import numpy as np
+from scipy.signal import convolve2d
+from src.sim.sim_convolution import Convolver, kernel_spectrum
+from src.sim.sim_model import SimModel
+from src.fi.fi_model import FiModel
+from src.sim.sim_controller import SimController
+from test.test_sim_worker import StubFiController, StubRoot, StubUsController, StubView
+
+
+class SliderFiController(StubFiController):
+    """Continuous FiController replacement moving the mu slider during the first step."""
+    def __init__(self):
+        super().__init__(0)
+        self.moved = False
+
+    def get_growth_fct(self):
+        return self.model.growth_lenia
+
+    def get_nhood(self):
+        return self.model.get_con_nhood()
+
+    def get_nhood_key(self):
+        return self.model.get_con_nhood_key()
+
+    def get_nhood_with_key(self):
+        return self.model.get_con_nhood_with_key()
+
+    def get_growth_key(self):
+        return ('lenia',) + self.model.get_growth_key()
+
+    def get_step(self):
+        if not self.moved:
+            self.moved = True
+            self.model.set_nhood_params(mu=0.3)
+        return 0.1
+
+
+class TestConvolver:
+    @pytest.fixture
+    def fi_model(self):
+        """Create an instance of FiModel providing the kernels."""
+        return FiModel()
+
+    @pytest.fixture
+    def rng(self):
+        """Create a seeded random generator."""
+        return np.random.default_rng(0)
+
+    def test_fft_matches_direct_continuous(self, fi_model, rng):
+        """The FFT path must match convolve2d for the even-sized Lenia kernel."""
+        grid = rng.random((64, 80))
+        kernel = fi_model.get_con_nhood()
+        expected = convolve2d(grid, kernel, mode='same', boundary='wrap')
+
+        result = Convolver('fft').convolve(grid, kernel, fi_model.get_con_nhood_key())
+        assert np.allclose(result, expected, atol=1e-12)
+
+    def test_fft_matches_direct_discrete(self, fi_model, rng):
+        """Integer grids must give exactly the same neighbor counts and dtype."""
+        grid = (rng.random((50, 70)) < 0.3).astype(np.int8)
+        kernel = fi_model.get_dis_nhood()
+        expected = convolve2d(grid, kernel, mode='same', boundary='wrap')
+
+        result = Convolver('fft').convolve(grid, kernel)
+        assert result.dtype == expected.dtype
+        assert np.array_equal(result, expected)
+
+    def test_integer_kernel_float_grid_not_rounded(self, fi_model, rng):
+        """An integer kernel on a float grid gives the fractional sums of the direct convolution."""
+        grid = rng.random((50, 70))
+        kernel = fi_model.get_dis_nhood()
+        expected = convolve2d(grid, kernel, mode='same', boundary='wrap')
+
+        result = Convolver('fft').convolve(grid, kernel)
+        assert result.dtype == np.float64
+        assert np.allclose(result, expected, atol=1e-12)
+        assert not np.array_equal(result, np.rint(result))
+
+        # Same on the out path used by the buffered engine
+        out = np.empty_like(grid)
+        assert Convolver('fft').convolve(grid, kernel, out=out) is out
+        assert np.allclose(out, expected, atol=1e-12)
+
+    def test_spectrum_cached_until_params_change(self, fi_model, rng):
+        """The kernel spectrum is only rebuilt when the kernel key or grid shape changes."""
+        convolver = Convolver('fft')
+        grid = rng.random((64, 64))
+
+        for _ in range(3):
+            convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 1
+
+        fi_model.set_nhood_params(mu=0.6)
+        convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 2
+
+        convolver.convolve(rng.random((32, 32)), fi_model.get_con_nhood(),
+                           fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 3
+
+    def test_key_reused_for_another_kernel(self, fi_model, rng):
+        """A key given with another kernel rebuilds its spectrum instead of serving a stale one."""
+        convolver = Convolver('fft')
+        grid = rng.random((64, 64))
+        key = fi_model.get_con_nhood_key()
+        convolver.convolve(grid, fi_model.get_con_nhood(), key)
+        other = FiModel(mu=0.3).get_con_nhood()
+        result = convolver.convolve(grid, other, key)
+        assert convolver.key_mismatches == 1 and convolver.spectrum_builds == 2
+        assert convolver.cached_spectra() == 1
+        assert np.allclose(result, convolve2d(grid, other, mode='same', boundary='wrap'))
+        convolver.convolve(grid, other, key)
+        assert convolver.spectrum_builds == 2
+
+    def test_spectrum_lru_reuses_visited_params(self, fi_model, rng):
+        """Coming back to visited kernel parameters reuses their spectrum, within the cache bounds."""
+        convolver = Convolver('fft', cache_size=3)
+        grid = rng.random((64, 64))
+        for mu in (0.4, 0.5, 0.6, 0.5, 0.4):
+            fi_model.set_nhood_params(mu=mu)
+            convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 3
+        assert convolver.cached_spectra() == 3
+
+        # 0.6 is the least recently used: evicted by a fourth value
+        for mu in (0.7, 0.6):
+            fi_model.set_nhood_params(mu=mu)
+            convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 5
+        assert convolver.cached_spectra() == 3
+
+    def test_spectrum_cache_memory_cap(self, fi_model, rng):
+        """The byte cap evicts old spectra but always keeps the one in use."""
+        grid = rng.random((64, 64))
+        spectrum_bytes = kernel_spectrum(fi_model.get_con_nhood(), grid.shape).nbytes
+        convolver = Convolver('fft', cache_bytes=2 * spectrum_bytes)
+        for mu in (0.4, 0.5, 0.6):
+            fi_model.set_nhood_params(mu=mu)
+            convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.cached_spectra() == 2
+
+        convolver = Convolver('fft', cache_bytes=0)
+        result = convolver.convolve(grid, fi_model.get_con_nhood(), fi_model.get_con_nhood_key())
+        assert convolver.cached_spectra() == 1
+        assert np.allclose(result, convolve2d(grid, fi_model.get_con_nhood(), mode='same', boundary='wrap'))
+
+        convolver.clear_cache()
+        assert convolver.cached_spectra() == 0
+
+    def test_auto_selection(self):
+        """Auto mode uses the FFT for large kernels and never for kernels larger than the grid."""
+        convolver = Convolver('auto')
+        assert convolver.use_fft((512, 512), (26, 26))
+        assert not convolver.use_fft((8, 8), (3, 3))
+        assert not convolver.use_fft((16, 16), (26, 26))
+        assert not Convolver('direct').use_fft((512, 512), (26, 26))
+
+    def test_invalid_method(self):
+        """An unknown method is rejected."""
+        with pytest.raises(ValueError):
+            Convolver('spectral')
+
+    def test_kernel_spectrum_identity(self):
+        """A centered unit kernel has a flat spectrum."""
+        kernel = np.zeros((5, 5))
+        kernel[2, 2] = 1
+        assert np.allclose(kernel_spectrum(kernel, (16, 16)), 1)
+
+    def test_sim_model_methods_agree(self, fi_model):
+        """A Lenia run gives the same grid with direct and FFT convolution."""
+        direct = SimModel(conv_method='direct')
+        fft = SimModel(conv_method='fft')
+        direct.orbium()
+        fft.orbium()
+        for _ in range(5):
+            direct.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1)
+            fft.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                       fi_model.get_con_nhood_key())
+        assert np.allclose(direct.get_grid(), fft.get_grid(), atol=1e-9)
+
+
+class TestSliderDuringStep:
+    def test_spectrum_matches_kernel(self):
+        """A slider moved during a step never caches a spectrum under another kernel's key."""
+        us_controller = StubUsController(60.0)
+        us_controller.continuous = True
+        fi_controller = SliderFiController()
+        controller = SimController(StubView(), StubRoot(), us_controller, fi_controller)
+        controller.model.convolver = Convolver('fft')
+        controller.reset()
+        reference = SimModel(conv_method='direct')
+        reference.grid = controller.model.get_grid().copy()
+        kernels = [FiModel(mu=0.5).get_con_nhood(), FiModel(mu=0.3).get_con_nhood()]
+
+        for kernel in kernels + kernels[1:]:
+            controller.step(1)
+            controller.worker.generation += 1
+            reference.update(fi_controller.model.growth_lenia, kernel, 0.1)
+        assert fi_controller.moved
+        assert np.allclose(controller.model.get_grid(), reference.get_grid())
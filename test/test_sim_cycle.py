@@ -0,0 +1,224 @@
+import numpy as np
+import pytest
+from src.sim.sim_cycle import CycleDetector, GridHasher
+from src.sim.sim_model import SimModel
+from src.sim.sim_controller import SimController
+from src.fi.fi_model import FiModel
+from test.test_sim_worker import StubFiController, StubRoot, StubUsController, StubView
+
+
+def pattern_grid(cells, shape=(16, 16)):
+    """Return a uint8 grid with the given live cells."""
+    grid = np.zeros(shape, dtype=np.uint8)
+    for row, col in cells:
+        grid[row, col] = 1
+    return grid
+
+
+BLOCK = [(5, 5), (5, 6), (6, 5), (6, 6)]
+BLINKER = [(5, 4), (5, 5), (5, 6)]
+GLIDER = [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]
+
+
+def observe_run(detector, grid, generations, stride=1):
+    """Step a grid with the bitboard engine, observing every stride generations.
+
+    Returns:
+        int: Generation at which the cycle was confirmed, or None
+    """
+    model = SimModel()
+    model.set_engine('bitboard')
+    model.grid = grid
+    fi_model = FiModel()
+    for generation in range(stride, generations + 1, stride):
+        model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1, generations=stride)
+        if detector.observe(generation, model.get_grid(), 'gol') is not None:
+            return generation
+    return None
+
+
+class TestGridHasher:
+    def test_equal_grids_equal_hashes(self):
+        """Equal grids hash alike, a single flipped cell changes the hash."""
+        hasher = GridHasher()
+        grid = (np.random.default_rng(0).random((100, 130)) < 0.3).astype(np.uint8)
+        assert hasher.hash(grid) == hasher.hash(grid.copy())
+        assert hasher.hash(grid) == hasher.hash(grid.astype(bool))
+        flipped = grid.copy()
+        flipped[57, 101] ^= 1
+        assert hasher.hash(grid) != hasher.hash(flipped)
+
+    def test_shape_and_continuous(self):
+        """Hashes depend on the shape, and on the exact bytes of continuous grids."""
+        hasher = GridHasher()
+        assert hasher.hash(np.zeros((8, 16), dtype=np.uint8)) != hasher.hash(np.zeros((16, 8), dtype=np.uint8))
+        grid = np.random.default_rng(1).random((30, 30))
+        nudged = grid.copy()
+        nudged[3, 4] = np.nextafter(nudged[3, 4], 2)
+        assert hasher.hash(grid) == hasher.hash(grid.copy())
+        assert hasher.hash(grid) != hasher.hash(nudged)
+
+    @pytest.mark.parametrize("shape, dtype", [((200, 130), np.uint8), ((70, 33), np.float64),
+                                              ((130, 20), np.float32)])
+    def test_incremental_matches_full(self, shape, dtype):
+        """Rehashing the changed bands gives the hash of the whole grid."""
+        rng = np.random.default_rng(2)
+        hasher = GridHasher()
+        grid = (rng.random(shape) < 0.3).astype(dtype)
+        hasher.hash(grid)
+        for step in range(10):
+            grid = grid.copy()
+            row, col = rng.integers(0, shape[0]), rng.integers(0, shape[1])
+            grid[row, col] = 1 - grid[row, col]
+            changed_rows = np.arange(shape[0]) == row if step % 2 else None
+            assert hasher.hash(grid, changed_rows) == GridHasher().hash(grid)
+
+    def test_unchanged_bands_not_rehashed(self):
+        """Only the band of a changed cell is rehashed, found by comparison or given."""
+        hasher = GridHasher(band_rows=64)
+        grid = pattern_grid(GLIDER, shape=(256, 100))
+        hasher.hash(grid)
+        assert hasher.bands_hashed == 4
+        assert hasher.hash(grid.copy()) == hasher.hash(grid)
+        assert hasher.bands_hashed == 4
+
+        moved = grid.copy()
+        moved[130, 7] = 1
+        hasher.hash(moved)
+        assert hasher.bands_hashed == 5
+        changed_rows = np.zeros(256, dtype=bool)
+        changed_rows[130] = True
+        hasher.hash(grid, changed_rows)
+        assert hasher.bands_hashed == 6
+        with pytest.raises(ValueError):
+            GridHasher(band_rows=32)
+
+
+class TestCycleDetector:
+    @pytest.mark.parametrize("cells, period, confirmed_at", [(BLOCK, 1, 3), (BLINKER, 2, 5)])
+    def test_still_life_and_oscillator(self, cells, period, confirmed_at):
+        """A cycle is confirmed one period after its first repeat."""
+        detector = CycleDetector()
+        assert observe_run(detector, pattern_grid(cells), 20) == confirmed_at
+        assert detector.period == period
+        assert len(detector.frames) == period
+        assert all(not frame.flags.writeable for frame in detector.frames.values())
+
+    def test_glider_on_torus(self):
+        """A glider comes back after 64 generations on a 16x16 torus, within max_period only."""
+        detector = CycleDetector(max_period=64)
+        assert observe_run(detector, pattern_grid(GLIDER), 200) is not None
+        assert detector.period == 64
+        assert observe_run(CycleDetector(max_period=32), pattern_grid(GLIDER), 200) is None
+
+    def test_frames_follow_the_cycle(self):
+        """The stored frames give the grid of any later generation."""
+        detector = CycleDetector()
+        start = observe_run(detector, pattern_grid(GLIDER), 200)
+        model = SimModel()
+        model.set_engine('bitboard')
+        model.grid = pattern_grid(GLIDER)
+        model.update(None, None, 1, generations=start + 37)
+        assert np.array_equal(detector.frame(start + 37), model.get_grid())
+
+    def test_several_generations_per_observation(self):
+        """With a stride, the period found is a multiple of the true period."""
+        detector = CycleDetector()
+        assert observe_run(detector, pattern_grid(BLINKER), 60, stride=3) is not None
+        assert detector.period % 2 == 0 and detector.period % 3 == 0
+
+    def test_hash_collisions_never_confirm(self):
+        """Equal hashes of different grids are caught by the exact comparison."""
+        detector = CycleDetector()
+        detector.hasher.hash = lambda grid, changed_rows=None: 0
+        assert observe_run(detector, pattern_grid(GLIDER), 40) is None
+
+    def test_rule_change_and_memory_cap(self):
+        """A new rule key restarts the detection, and cycles over max_bytes are ignored."""
+        detector = CycleDetector()
+        grid = pattern_grid(BLOCK)
+        for generation in range(1, 4):
+            detector.observe(generation, grid, 'gol')
+        assert detector.matches('gol')
+        detector.observe(4, grid, 'other')
+        assert not detector.confirmed and detector.key == 'other'
+
+        detector = CycleDetector(max_bytes=grid.nbytes - 1)
+        for generation in range(1, 5):
+            detector.observe(generation, grid, 'gol')
+        assert not detector.confirmed
+
+
+class TestSimControllerCycles:
+    def make_controller(self, cycle_action):
+        """Create a controller stepped by hand, loaded with a blinker."""
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0),
+                                   StubFiController(0), cycle_action=cycle_action)
+        controller.reset()
+        controller.model.grid = pattern_grid(BLINKER)
+        return controller
+
+    def step(self, controller, count, generations=1):
+        """Step the controller like the worker does."""
+        for _ in range(count):
+            controller.step(generations)
+            controller.worker.generation += generations
+
+    def test_replay_serves_stored_frames(self):
+        """Once the blinker is confirmed, frames come from the cycle and match the rule."""
+        controller = self.make_controller('replay')
+        self.step(controller, 5)
+        assert controller.cycles.period == 2
+
+        updates = []
+        update = controller.model.update
+        controller.model.update = lambda *args: updates.append(args) or update(*args)
+        frames = [controller.step(1)]
+        controller.worker.generation += 1
+        frames.append(controller.step(1))
+        assert not updates
+        assert np.array_equal(frames[0], pattern_grid(BLINKER))
+        assert np.array_equal(frames[1], pattern_grid(BLINKER).T)
+
+        # A rule change computes again
+        controller.fi_controller.get_growth_key = lambda: ('other',)
+        controller.step(1)
+        assert len(updates) == 1 and not controller.cycles.confirmed
+
+    def test_pause_and_display(self):
+        """The pause action stops the run once and the period is displayed."""
+        controller = self.make_controller('pause')
+        self.step(controller, 5)
+        controller.update()
+        assert controller.us_controller.running is False
+        assert controller.us_controller.period == 2
+
+        controller.us_controller.running = True
+        controller.update()
+        assert controller.us_controller.running is True
+
+        controller.reset()
+        assert not controller.cycles.confirmed
+
+    def test_tiled_engine_rows(self):
+        """With the 'tiled' engine, only the bands of the changed tiles are rehashed."""
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0),
+                                   StubFiController(0), discrete_engine='tiled')
+        controller.reset()
+        controller.model.grid = pattern_grid(BLINKER, shape=(256, 64))
+        hasher = controller.cycles.hasher
+        given = []
+        changed_bands = hasher._changed_bands
+        hasher._changed_bands = lambda grid, rows: given.append(rows is not None) or changed_bands(grid, rows)
+        self.step(controller, 1)
+        hashed = hasher.bands_hashed
+        self.step(controller, 4)
+        assert controller.cycles.period == 2
+        assert hasher.bands_hashed - hashed == 4 and given == [True] * 4
+        assert controller.model.get_changed_rows()[5] and controller.model.get_changed_rows().sum() == 32
+
+    def test_invalid_action(self):
+        """An unknown cycle action is rejected."""
+        with pytest.raises(ValueError):
+            SimController(StubView(), StubRoot(), StubUsController(60.0),
+                          StubFiController(0), cycle_action='stop')
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from src.sim.sim_ensemble import EnsembleModel, growth_lenia
+from src.sim.sim_model import SimModel
+from src.sim.sim_convolution import Convolver
+from src.fi.fi_model import FiModel
+
+
+class TestEnsembleModel:
+    @pytest.fixture
+    def orbium(self):
+        """Return the initial orbium grid of SimModel."""
+        model = SimModel()
+        model.orbium()
+        return model.get_grid()
+
+    def test_growth_matches_fi_model(self):
+        """The batched growth function gives the FiModel values of each member."""
+        u = np.random.default_rng(0).random((3, 8, 8)) * 0.3
+        mu, sigma = np.array([0.1, 0.15, 0.2]), np.array([0.01, 0.015, 0.03])
+        growth = growth_lenia(u, mu, sigma)
+        for index in range(3):
+            fi_model = FiModel(growth_mu=mu[index], growth_sigma=sigma[index])
+            assert np.allclose(growth[index], fi_model.growth_lenia(u[index]))
+
+    @pytest.mark.parametrize("conv_method", ['direct', 'fft'])
+    def test_members_match_sim_model(self, orbium, conv_method):
+        """Each member evolves like a SimModel with its own growth parameters."""
+        mu = np.array([0.12, 0.15, 0.17, 0.15])
+        sigma = np.array([0.015, 0.015, 0.02, 0.012])
+        ensemble = EnsembleModel.repeat(orbium, 4, growth_mu=mu, growth_sigma=sigma,
+                                        conv_method=conv_method)
+        fi_model = FiModel()
+        ensemble.step(fi_model.get_con_nhood(), fi_model.get_con_nhood_key(), generations=10)
+
+        for index in range(4):
+            fi_model.set_growth_params(mu[index], sigma[index])
+            model = SimModel(conv_method=conv_method)
+            model.grid = orbium
+            for _ in range(10):
+                model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                             fi_model.get_con_nhood_key())
+            assert np.allclose(ensemble.grids[index], model.get_grid(), atol=1e-10)
+
+    def test_batched_convolution(self):
+        """A stack of grids is convolved like each grid on its own."""
+        grids = np.random.default_rng(1).random((5, 40, 30))
+        kernel = FiModel().get_con_nhood()
+        for method in ['direct', 'fft']:
+            convolver = Convolver(method)
+            stacked = convolver.convolve(grids, kernel)
+            out = convolver.convolve(grids, kernel, out=np.empty_like(grids))
+            for index, grid in enumerate(grids):
+                assert np.allclose(stacked[index], convolver.convolve(grid, kernel))
+                assert np.allclose(out[index], stacked[index])
+
+    def test_dead_members_are_masked(self, orbium):
+        """Members that die out stop being computed, the others go on."""
+        # Growth centered far above the potentials: every cell decays
+        ensemble = EnsembleModel.repeat(orbium, 3, growth_mu=[0.15, 0.9, 0.15],
+                                        growth_sigma=0.015)
+        fi_model = FiModel()
+        alive = ensemble.step(fi_model.get_con_nhood(), generations=20)
+        assert list(alive) == [True, False, True]
+        assert ensemble.generations[1] < 20 and ensemble.generations[0] == 20
+        assert ensemble.masses()[1] == 0
+
+        ensemble.set_active([True, False, False])
+        frozen = ensemble.grids[2].copy()
+        ensemble.step(fi_model.get_con_nhood())
+        assert np.array_equal(ensemble.grids[2], frozen)
+        assert list(ensemble.generations) == [21, ensemble.generations[1], 20]
+
+    def test_invalid_input(self, orbium):
+        """Grids must be a 3D stack and the growth widths positive."""
+        with pytest.raises(ValueError):
+            EnsembleModel(orbium)
+        with pytest.raises(ValueError):
+            EnsembleModel.repeat(orbium, 2, growth_sigma=[0.01, 0.0])
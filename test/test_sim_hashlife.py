@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+from src.sim.sim_hashlife import HashLifeEngine
+from src.sim.sim_bitboard import BitboardEngine
+from src.sim.sim_model import SimModel
+
+class TestHashLifeEngine:
+    @pytest.fixture
+    def rng(self):
+        """Create a seeded random generator."""
+        return np.random.default_rng(3)
+
+    @pytest.mark.parametrize("shape", [(16, 16), (64, 64), (32, 128)])
+    def test_torus_matches_bitboard(self, shape, rng):
+        """On power-of-two grids the wrap matches the bitboard engine for any step count."""
+        grid = (rng.random(shape) < 0.3).astype(np.int8)
+        hashlife = HashLifeEngine()
+        bitboard = BitboardEngine()
+        hashlife.load(grid)
+        bitboard.load(grid)
+        assert hashlife.topology == 'torus'
+
+        for generations in [1, 2, 3, 5, 8, 64, 100]:
+            hashlife.step(generations)
+            bitboard.step(generations)
+            assert np.array_equal(hashlife.to_dense(), bitboard.to_dense())
+
+    def test_plane_matches_large_torus(self, rng):
+        """On other grids the pattern evolves in an unbounded plane."""
+        grid = np.zeros((50, 50), dtype=np.int8)
+        grid[20:26, 20:26] = rng.random((6, 6)) < 0.5
+        hashlife = HashLifeEngine()
+        hashlife.load(grid)
+        assert hashlife.topology == 'plane'
+
+        # A torus much larger than the light cone behaves like the plane
+        big = np.zeros((512, 512), dtype=np.int8)
+        big[200:250, 200:250] = grid
+        bitboard = BitboardEngine()
+        bitboard.load(big)
+
+        for generations in [1, 10, 50]:
+            hashlife.step(generations)
+            bitboard.step(generations)
+            assert np.array_equal(hashlife.to_dense(), bitboard.to_dense()[200:250, 200:250])
+
+    def test_glider_gun_fast_forward(self):
+        """The planner glider gun can be advanced a million generations at once."""
+        model = SimModel()
+        model.planner()
+        engine = HashLifeEngine()
+        engine.load(model.get_grid())
+        engine.advance_pow2(20)
+
+        assert engine.generation == 2 ** 20
+        # The gun emits one 5-cell glider every 30 generations
+        assert engine.population() > 5 * 2 ** 20 // 30
+        # The gun itself is still intact in the original window
+        assert 36 <= engine.to_dense().sum() <= 100
+
+    def test_bounded_cache(self, rng):
+        """Evicting the node cache keeps the results correct and the cache bounded."""
+        grid = (rng.random((64, 64)) < 0.3).astype(np.int8)
+        hashlife = HashLifeEngine(max_nodes=2000)
+        bitboard = BitboardEngine()
+        hashlife.load(grid)
+        bitboard.load(grid)
+        hashlife.step(100)
+        bitboard.step(100)
+
+        assert hashlife.evictions > 0
+        assert hashlife.node_count() <= 2000
+        assert np.array_equal(hashlife.to_dense(), bitboard.to_dense())
+
+    def test_invalid_torus(self):
+        """The torus topology is refused for non power-of-two grids."""
+        with pytest.raises(ValueError):
+            HashLifeEngine().load(np.zeros((100, 100)), topology='torus')
+
+    def test_sim_model_fast_forward(self):
+        """SimModel.fast_forward keeps the grid shape and dtype."""
+        model = SimModel(width=64, height=64)
+        model.random()
+        model.fast_forward(1000)
+        assert model.get_grid().shape == (64, 64)
+        assert model.get_grid().dtype == SimModel.DISCRETE_DTYPE
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+from src.sim.sim_history import LEVELS, History
+from src.sim.sim_model import SimModel
+from src.sim.sim_controller import SimController
+from src.fi.fi_model import FiModel
+from test.test_sim_worker import StubFiController, StubRoot, StubUsController, StubView
+
+
+def gol_run(generations, shape=(64, 64), seed=0):
+    """Return the grids of a Game of Life run, initial grid included."""
+    fi_model = FiModel()
+    model = SimModel()
+    model.set_engine('bitboard')
+    model.grid = (np.random.default_rng(seed).random(shape) < 0.3).astype(np.int8)
+    grids = [model.get_grid().copy()]
+    for _ in range(generations):
+        model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1)
+        grids.append(model.get_grid().copy())
+    return grids
+
+
+class TestHistory:
+    def test_discrete_round_trip(self):
+        """Every stored Game of Life generation is rebuilt exactly."""
+        grids = gol_run(100)
+        history = History(keyframe_interval=16)
+        for generation, grid in enumerate(grids):
+            history.push(generation, grid, discrete=True)
+        assert len(history) == 101
+        for generation in [0, 1, 15, 16, 17, 57, 100]:
+            stored, grid = history.get(generation)
+            assert stored == generation
+            assert grid.dtype == np.int8 and np.array_equal(grid, grids[generation])
+
+    def test_deltas_are_smaller_than_frames(self):
+        """A discrete run takes a fraction of the memory of its frames, even bit-packed."""
+        grids = gol_run(300, shape=(256, 256))[200:]
+        history = History()
+        for generation, grid in enumerate(grids):
+            history.push(generation, grid, discrete=True)
+        assert history.nbytes < sum(grid.nbytes for grid in grids) / 10
+        assert history.nbytes < sum(grid.size for grid in grids) / 8 / 2
+
+    def test_continuous_quantized(self):
+        """Lenia states are rebuilt up to the quantization step, without drift."""
+        fi_model = FiModel()
+        model = SimModel()
+        model.orbium()
+        history = History(keyframe_interval=8)
+        grids = []
+        for generation in range(30):
+            grids.append(model.get_grid().copy())
+            history.push(generation, model.get_grid(), discrete=False)
+            model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1)
+        for generation in [0, 7, 8, 29]:
+            stored, grid = history.get(generation)
+            assert stored == generation
+            assert np.abs(grid - grids[generation]).max() <= 0.5 / LEVELS + 1e-12
+
+    def test_keyframe_interval_bounds_seek(self):
+        """A keyframe starts every keyframe_interval + 1 states at most."""
+        history = History(keyframe_interval=5)
+        for generation, grid in enumerate(gol_run(40)):
+            history.push(generation, grid, discrete=True)
+        assert all(len(segment.deltas) <= 5 for segment in history.segments)
+        assert len(history.segments) >= 7
+
+    def test_memory_cap_evicts_oldest(self):
+        """Over the memory cap the oldest segments are dropped."""
+        grids = gol_run(200)
+        history = History(max_bytes=2000, keyframe_interval=10)
+        for generation, grid in enumerate(grids):
+            history.push(generation, grid, discrete=True)
+            assert history.nbytes <= 2000 or len(history.segments) == 1
+        assert history.first_generation > 0 and history.last_generation == 200
+        assert history.get(history.first_generation - 1) is None
+        assert np.array_equal(history.get(200)[1], grids[200])
+
+    def test_navigation_and_truncate(self):
+        """Stored generations can be walked and the future dropped."""
+        grids = gol_run(30)
+        history = History(keyframe_interval=4)
+        for generation in range(0, 31, 3):
+            history.push(generation, grids[generation], discrete=True)
+        assert history.previous(9) == 6 and history.next(9) == 12
+        assert history.get(10)[0] == 9
+        assert history.previous(0) is None and history.next(30) is None
+
+        history.truncate(13)
+        assert history.last_generation == 12
+        history.push(13, grids[13], discrete=True)
+        assert np.array_equal(history.get(13)[1], grids[13])
+        assert np.array_equal(history.get(12)[1], grids[12])
+
+    def test_disabled(self):
+        """A zero memory cap stores nothing."""
+        history = History(max_bytes=0)
+        history.push(0, np.zeros((4, 4)), discrete=True)
+        assert len(history) == 0 and history.get(0) is None
+
+
+class TestSimControllerHistory:
+    @pytest.fixture
+    def controller(self):
+        """Create a controller stepped by hand, without the worker thread."""
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0),
+                                   StubFiController(0), discrete_engine='bitboard')
+        controller.reset()
+        for _ in range(10):
+            controller.step(2)
+            controller.worker.generation += 2
+        return controller
+
+    def test_step_back_and_seek(self, controller):
+        """Stepping back restores the previous frame, seeking any stored one."""
+        grid = controller.model.get_grid().copy()
+        controller.seek('step', -1)
+        assert controller.worker.generation == 18
+        controller.seek('step', 1)
+        assert controller.worker.generation == 20
+        assert np.array_equal(controller.model.get_grid(), grid)
+
+        controller.us_controller.model.seek_request = ('generation', 7)
+        controller.update()
+        assert controller.worker.generation == 6
+        assert controller.us_controller.generation == 6
+        assert np.array_equal(controller.view.frames[-1], controller.history.get(6)[1])
+
+    def test_resume_after_seek(self, controller):
+        """Stepping from a restored frame replaces the later history."""
+        reference = controller.history.get(12)[1]
+        controller.seek('generation', 8)
+        controller.step(4)
+        controller.worker.generation += 4
+        assert controller.history.last_generation == 12
+        assert np.array_equal(controller.model.get_grid(), reference)
@@ -0,0 +1,136 @@
+import json
+import time
+import numpy as np
+import pytest
+from src.sim.sim_metrics import Metrics, PhaseTimes, format_overlay
+from src.sim.sim_model import SimModel
+from src.sim.sim_controller import SimController
+from src.fi.fi_model import FiModel
+from test.test_sim_worker import StubFiController, StubRoot, StubUsController, StubView
+
+
+class ShownUsController(StubUsController):
+    """UsController replacement with the metrics overlay shown."""
+    def is_metrics_shown(self):
+        return True
+
+
+class TestMetrics:
+    def test_phase_summary(self):
+        """Percentiles and maximum are taken over the rolling window."""
+        times = PhaseTimes(window=100)
+        for value in range(1, 101):
+            times.add(value / 1000)
+        summary = times.summary()
+        assert summary['count'] == 100 and summary['max_ms'] == pytest.approx(100)
+        assert summary['p50_ms'] == pytest.approx(50.5) and summary['p95_ms'] == pytest.approx(95.05)
+        for _ in range(100):
+            times.add(0.001)
+        assert times.summary()['max_ms'] == pytest.approx(1) and times.summary()['count'] == 200
+
+    def test_disabled_hooks(self):
+        """Disabled metrics share one no-op context and record nothing."""
+        metrics = Metrics()
+        assert metrics.phase('convolve') is metrics.phase('growth')
+        with metrics.phase('convolve'):
+            pass
+        assert metrics.timed('draw', lambda x: x + 1)(1) == 2
+        metrics.count_generations(10)
+        snapshot = metrics.snapshot()
+        assert snapshot['phases'] == {} and snapshot['generations_per_second'] == 0
+
+    def test_enabled_hooks(self):
+        """Enabled metrics time blocks and wrapped calls, and count generations."""
+        metrics = Metrics(enabled=True)
+        with metrics.phase('custom'):
+            time.sleep(0.002)
+        metrics.timed('draw', time.sleep)(0.001)
+        metrics.count_generations(5)
+        time.sleep(0.05)
+        metrics.count_generations(5)
+        snapshot = metrics.snapshot(generation=10, shape=(np.int64(4), 4))
+        assert set(snapshot['phases']) == {'custom', 'draw'}
+        assert snapshot['phases']['custom']['p50_ms'] >= 2
+        assert 0 < snapshot['generations_per_second'] <= 10 / 0.05
+        assert snapshot['generation'] == 10
+        text = format_overlay(snapshot, speed=60)
+        assert text.splitlines()[0].endswith("gen/s (set 60)") and 'custom: ' in text
+
+        metrics.reset()
+        assert metrics.snapshot()['phases'] == {}
+
+    def test_export_json_lines(self, tmp_path):
+        """Each export appends one JSON line."""
+        metrics = Metrics(enabled=True)
+        with metrics.phase('step'):
+            pass
+        path = tmp_path / 'metrics.jsonl'
+        with open(path, 'w', encoding='utf-8') as file:
+            metrics.export(file, generation=np.int64(1))
+            metrics.export(file, generation=2)
+        lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [line['generation'] for line in lines] == [1, 2]
+        assert lines[1]['phases']['step']['count'] == 1
+
+
+class TestSimModelMetrics:
+    @pytest.mark.parametrize("engine, timed", [('convolution', True), ('buffered', True),
+                                               ('bitboard', False)])
+    def test_engine_phases(self, engine, timed):
+        """The convolution engines time their convolution, growth and clipping."""
+        fi_model = FiModel()
+        model = SimModel(metrics=Metrics(enabled=True))
+        model.set_engine(engine)
+        model.random()
+        for _ in range(3):
+            model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1)
+        phases = model.metrics.snapshot()['phases']
+        if timed:
+            assert all(phases[name]['count'] == 3 for name in ('convolve', 'growth', 'clip'))
+        else:
+            assert phases == {}
+
+
+class TestSimControllerMetrics:
+    def step(self, controller, count):
+        """Step the controller like the worker does."""
+        for _ in range(count):
+            controller.step(1)
+            controller.worker.generation += 1
+
+    def test_overlay(self):
+        """The overlay switches the timings on and shows the rate and phases."""
+        us_controller = ShownUsController(60.0)
+        controller = SimController(StubView(), StubRoot(), us_controller, StubFiController(0))
+        controller.reset()
+        controller.update()
+        assert controller.metrics.enabled
+        self.step(controller, 3)
+        controller._metrics_time = 0.0
+        controller.update()
+        assert 'gen/s (set 60)' in us_controller.metrics_text
+        assert 'step: ' in us_controller.metrics_text and 'convolve: ' in us_controller.metrics_text
+
+    def test_hidden_overlay_records_nothing(self):
+        """Without the overlay or an export, nothing is recorded."""
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0), StubFiController(0))
+        controller.reset()
+        controller.update()
+        self.step(controller, 3)
+        assert not controller.metrics.enabled
+        assert controller.metrics.snapshot()['phases'] == {}
+
+    def test_export(self, tmp_path):
+        """An export file records the metrics without the overlay."""
+        path = tmp_path / 'metrics.jsonl'
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0), StubFiController(0),
+                                   metrics_path=str(path))
+        controller.reset()
+        controller.update()
+        self.step(controller, 2)
+        controller._metrics_time = 0.0
+        controller.update()
+        controller.stop()
+        lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert lines[-1]['generation'] == 2 and lines[-1]['mode'] == 'discrete'
+        assert lines[-1]['phases']['step']['count'] == 2
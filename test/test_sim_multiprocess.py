@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from src.sim.sim_multiprocess import MultiprocessEngine
+from src.sim.sim_model import SimModel
+from src.fi.fi_model import FiModel
+
+
+def failing_growth(u):
+    """Growth function raising in the worker processes."""
+    raise ArithmeticError("growth failed")
+
+
+@pytest.fixture(scope='module')
+def engine():
+    """Start one engine for the module, workers are slow to spawn."""
+    engine = MultiprocessEngine(workers=3, conv_method='direct')
+    yield engine
+    engine.close()
+
+
+class TestMultiprocessEngine:
+    @pytest.fixture
+    def fi_model(self):
+        """Create an instance of FiModel providing the rules."""
+        return FiModel()
+
+    def test_discrete_matches_convolution(self, engine, fi_model):
+        """Game of Life steps are exact, including the wrap between bands."""
+        reference = SimModel()
+        reference.grid = (np.random.default_rng(5).random((60, 90)) < 0.3).astype(np.int8)
+        grid = reference.get_grid()
+        for _ in range(30):
+            reference.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1)
+            grid = engine.advance(grid, fi_model.growth_gol, fi_model.get_dis_nhood(), 1,
+                                  fi_model.get_dis_nhood_key(), ('gol',))
+            assert np.array_equal(reference.get_grid(), grid)
+        assert grid.dtype == np.int8
+
+    def test_continuous_matches_convolution(self, engine, fi_model):
+        """Lenia generations run in one batch are bit-identical to single steps."""
+        reference = SimModel(conv_method='direct')
+        reference.orbium()
+        grid = reference.get_grid()
+        for _ in range(6):
+            reference.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1)
+        grid = engine.advance(grid, fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                              fi_model.get_con_nhood_key(), fi_model.get_growth_key(), generations=6)
+        assert np.array_equal(reference.get_grid(), grid)
+
+    def test_rule_change_reaches_workers(self, engine, fi_model):
+        """New growth parameters are sent to the workers."""
+        reference = SimModel(conv_method='direct')
+        reference.orbium()
+        grid = reference.get_grid()
+        for g_mu in (0.15, 0.2):
+            fi_model.set_growth_params(g_mu=g_mu)
+            reference.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1)
+            grid = engine.advance(grid, fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                                  fi_model.get_con_nhood_key(), fi_model.get_growth_key())
+        assert np.array_equal(reference.get_grid(), grid)
+
+    def test_worker_times(self, engine, fi_model):
+        """Each band reports its compute and barrier wait time."""
+        grid = np.zeros((128, 227))
+        engine.advance(grid, fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1, generations=2)
+        times = engine.worker_times()
+        assert [entry['rows'] for entry in times] == [(0, 42), (42, 85), (85, 128)]
+        assert all(entry['compute'] > 0 and entry['wait'] >= 0 for entry in times)
+
+    def test_worker_failure(self, fi_model):
+        """An exception in a worker is reported instead of hanging."""
+        engine = MultiprocessEngine(workers=2)
+        with pytest.raises(RuntimeError):
+            engine.advance(np.zeros((20, 20)), failing_growth, fi_model.get_dis_nhood(), 1)
+        assert engine.worker_times() == []
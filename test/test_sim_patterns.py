@@ -0,0 +1,147 @@
+import json
+import numpy as np
+import pytest
+from src.sim.sim_model import SimModel
+from src.sim.sim_patterns import (PatternLibrary, _RleDecoder, encode_rle, load_pattern,
+                                  measure_period, read_info)
+
+GLIDER_RLE = "#N Glider\n#C Period: 4\nx = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n"
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+
+
+def write(path, text):
+    """Write a text file and return its path as a string."""
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+class TestLoaders:
+    def test_rle(self, tmp_path):
+        """An RLE file is read with its header and comments, into a new or given grid."""
+        path = write(tmp_path / 'glider.rle', GLIDER_RLE)
+        grid, info = load_pattern(path)
+        assert np.array_equal(grid, GLIDER) and grid.dtype == np.uint8
+        assert info['name'] == 'Glider' and info['period'] == 4 and info['rule'] == 'B3/S23'
+
+        grid = np.full((10, 12), 7, dtype=np.int16)
+        load_pattern(path, grid, (4, 5))
+        assert np.array_equal(grid[4:7, 5:8], np.where(GLIDER == 1, 1, 7))
+        assert (grid[:4] == 7).all()
+
+    def test_rle_chunk_boundaries(self):
+        """Counts and two-letter states cut between chunks are carried over."""
+        body = "12bo$3o2b10o$pA2yO!"
+        whole = _RleDecoder(np.zeros((3, 16)), lenia=True)
+        whole.feed(body)
+        for size in (1, 2, 3):
+            chunked = _RleDecoder(np.zeros((3, 16)), lenia=True)
+            for start in range(0, len(body), size):
+                chunked.feed(body[start:start + size])
+            assert chunked.close() == (3, 15)
+            assert np.array_equal(chunked.target, whole.target)
+        assert whole.target[2, 0] == 25 / 255 and whole.target[2, 2] == 1
+
+    def test_rle_errors(self, tmp_path):
+        """Invalid data, overflowing patterns and missing headers are rejected."""
+        with pytest.raises(ValueError):
+            load_pattern(write(tmp_path / 'bad.rle', "x = 3, y = 1\n3o#!\n"))
+        with pytest.raises(ValueError):
+            load_pattern(write(tmp_path / 'wide.rle', "x = 2, y = 1\n3o!\n"))
+        with pytest.raises(ValueError):
+            load_pattern(write(tmp_path / 'none.rle', "#C no header\n"))
+        with pytest.raises(ValueError):
+            load_pattern(write(tmp_path / 'glider.rle', GLIDER_RLE), np.zeros((4, 4)), (2, 2))
+
+    def test_plaintext(self, tmp_path):
+        """A plaintext file matches the same pattern in RLE."""
+        path = write(tmp_path / 'glider.cells', "!Name: Glider\n!\n.O\n..O\nOOO\n")
+        grid, info = load_pattern(path)
+        assert info['name'] == 'Glider' and (info['width'], info['height']) == (3, 3)
+        assert np.array_equal(grid, GLIDER)
+
+    def test_lenia_json(self, tmp_path):
+        """A Lenia pattern gives its parameters and cell values, encoded back losslessly."""
+        cells = np.array([[0, 0.5, 1], [0.2, 0, 0]])
+        data = {'name': 'Test', 'params': {'R': 13, 'm': 0.15, 's': 0.015}, 'cells': encode_rle(cells, lenia=True)}
+        path = write(tmp_path / 'test.json', json.dumps(data))
+        grid, info = load_pattern(path, dtype=np.float32)
+        assert info['kind'] == 'continuous' and info['params']['m'] == 0.15
+        assert grid.dtype == np.float32 and grid.shape == (2, 3)
+        assert np.allclose(grid, cells, atol=0.5 / 255)
+        assert encode_rle(grid, lenia=True) == data['cells']
+
+
+class TestPatternLibrary:
+    @pytest.fixture
+    def library(self):
+        """Open the pattern library shipped with the simulation."""
+        return PatternLibrary()
+
+    def test_index_matches_files(self, library, tmp_path):
+        """The shipped index is up to date, and a missing index is built in memory."""
+        shipped = library.index
+        for name in library.names():
+            info = read_info(f"{library.path}/{shipped[name]['file']}")
+            assert info['width'] == shipped[name]['width'] and info['height'] == shipped[name]['height']
+
+        copy = tmp_path / 'library'
+        copy.mkdir()
+        for name in ('Blinker', 'Glider', 'Orbium'):
+            file_name = shipped[name]['file']
+            (copy / file_name).write_bytes(open(f"{library.path}/{file_name}", 'rb').read())
+        other = PatternLibrary(str(copy))
+        assert other.names() == ['Blinker', 'Glider', 'Orbium']
+        assert other.names('continuous') == ['Orbium']
+        assert not (copy / 'index.json').exists()
+        other.build_index()
+        assert PatternLibrary(str(copy)).info('blinker')['period'] == 2
+
+    @pytest.mark.parametrize("name, period", [('Block', 1), ('Blinker', 2), ('Pulsar', 3),
+                                              ('Pentadecathlon', 15), ('R-pentomino', None)])
+    def test_measured_periods(self, library, name, period):
+        """Still lifes and oscillators get their period, other patterns none."""
+        assert measure_period(f"{library.path}/{library.info(name)['file']}") == period
+        assert library.info(name)['period'] == period
+
+    def test_gun_matches_planner(self, library):
+        """The library glider gun is the pattern of SimModel.planner."""
+        model = SimModel()
+        model.planner()
+        rows, cols = np.nonzero(model.get_grid())
+        box = model.get_grid()[rows.min():rows.max() + 1, cols.min():cols.max() + 1]
+        assert np.array_equal(library.load('Gosper glider gun'), box.T)
+
+    def test_unknown_pattern(self, library):
+        """An unknown name is rejected."""
+        with pytest.raises(ValueError):
+            library.info('no such pattern')
+
+
+class TestSimModelPatterns:
+    def test_load_by_name(self):
+        """Named patterns are centered in the model grid, in the dtype of their kind."""
+        model = SimModel(width=40, height=30, precision='float32')
+        model.reset_discrete('glider')
+        grid = model.get_grid()
+        assert grid.shape == (30, 40) and grid.dtype == np.uint8
+        assert np.array_equal(grid[13:16, 18:21], GLIDER) and grid.sum() == 5
+        assert model.pattern['name'] == 'Glider'
+
+        model.reset_continuous('orbium')
+        assert model.get_grid().dtype == np.float32 and model.pattern['kind'] == 'continuous'
+
+    def test_grid_enlarged(self):
+        """A pattern larger than the model grid enlarges it."""
+        model = SimModel(width=10, height=10)
+        model.reset_discrete('Gosper glider gun')
+        assert model.get_grid().shape == (11, 38)
+        assert model.get_grid().sum() == 36
+
+    def test_glider_runs(self):
+        """A loaded glider moves one cell diagonally every 4 generations."""
+        model = SimModel(width=20, height=20)
+        model.set_engine('bitboard')
+        model.reset_discrete('glider')
+        start = model.get_grid().copy()
+        model.update(None, None, 1, generations=4)
+        assert np.array_equal(model.get_grid(), np.roll(start, (1, 1), axis=(0, 1)))
@@ -0,0 +1,124 @@
+import pytest
+import numpy as np
+from src.sim.sim_model import SimModel
+from src.sim.sim_convolution import Convolver, kernel_spectrum
+from src.fi.fi_model import FiModel
+
+GENERATIONS = 50
+
+class TestPrecisionPolicy:
+    @pytest.fixture
+    def fi_model(self):
+        """Create an instance of FiModel providing the kernels and growth functions."""
+        return FiModel()
+
+    def run_lenia(self, fi_model, precision, engine='convolution'):
+        """Return the orbium grid after GENERATIONS steps in a precision."""
+        model = SimModel(precision=precision)
+        model.set_engine(engine)
+        model.reset_continuous(1)
+        for _ in range(GENERATIONS):
+            model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                         fi_model.get_con_nhood_key(), ('lenia',) + fi_model.get_growth_key())
+        model.close()
+        return model.get_grid()
+
+    def test_pattern_dtypes(self):
+        """Discrete patterns are uint8, continuous patterns use the storage dtype."""
+        for precision, (storage, _) in SimModel.PRECISIONS.items():
+            model = SimModel(precision=precision)
+            model.random()
+            assert model.get_grid().dtype == np.uint8
+            model.planner()
+            assert model.get_grid().dtype == np.uint8
+            for pattern in (0, 1):
+                model.reset_continuous(pattern)
+                assert model.get_grid().dtype == storage
+
+    def test_invalid_precision(self):
+        """An unknown precision is rejected."""
+        with pytest.raises(ValueError):
+            SimModel(precision='float8')
+
+    def test_set_precision_converts_grid(self):
+        """A loaded continuous grid is converted, a discrete grid is left as is."""
+        model = SimModel()
+        model.reset_continuous(1)
+        model.set_precision('float16')
+        assert model.get_grid().dtype == np.float16
+        model.random()
+        model.set_precision('float32')
+        assert model.get_grid().dtype == np.uint8
+
+    @pytest.mark.parametrize("engine", ['convolution', 'buffered', 'tiled', 'parallel'])
+    @pytest.mark.parametrize("precision", ['float32', 'float16'])
+    def test_continuous_divergence_bounded(self, fi_model, engine, precision):
+        """Reduced precision stays close to the float64 reference and keeps its dtype."""
+        reference = self.run_lenia(fi_model, 'float64', engine)
+        grid = self.run_lenia(fi_model, precision, engine)
+        assert grid.dtype == SimModel.PRECISIONS[precision][0]
+
+        error = np.max(np.abs(grid.astype(np.float64) - reference))
+        mass_error = abs(float(grid.sum(dtype=np.float64)) - reference.sum()) / reference.sum()
+        if precision == 'float32':
+            assert error < 1e-4 and mass_error < 1e-5
+        else:
+            # float16 keeps 11 significant bits, the error stays near its resolution
+            assert error < 2e-2 and mass_error < 1e-3
+
+    @pytest.mark.parametrize("engine", ['convolution', 'buffered', 'tiled', 'parallel'])
+    def test_discrete_exact(self, fi_model, engine):
+        """Discrete grids stay in their integer dtype and match the bitboard engine exactly."""
+        rng = np.random.default_rng(3)
+        for dtype in (np.uint8, np.int8, bool):
+            grid = rng.random((64, 96)) < 0.3
+            reference = SimModel()
+            reference.set_engine('bitboard')
+            reference.grid = grid.astype(np.uint8)
+            model = SimModel(precision='float16')
+            model.set_engine(engine)
+            model.grid = grid.astype(dtype)
+            for _ in range(10):
+                reference.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1)
+                model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1,
+                             fi_model.get_dis_nhood_key(), ('gol',))
+            model.close()
+            assert model.get_grid().dtype == dtype
+            assert np.array_equal(model.get_grid(), reference.get_grid())
+
+    @pytest.mark.parametrize("engine", ['convolution', 'buffered'])
+    def test_discrete_grid_lenia(self, fi_model, engine):
+        """A uint8 grid stepped with the Lenia rule is promoted and evolves like a float grid."""
+        grid = (np.random.default_rng(5).random((64, 96)) < 0.3).astype(np.uint8)
+        model = SimModel()
+        model.set_engine(engine)
+        model.grid = grid
+        reference = SimModel()
+        reference.grid = grid.astype(np.float64)
+        for _ in range(10):
+            for sim in (model, reference):
+                sim.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                           fi_model.get_con_nhood_key(), ('lenia',) + fi_model.get_growth_key())
+        model.close()
+        assert model.get_grid().dtype == np.float64
+        assert not np.array_equal(model.get_grid(), grid)
+        assert np.allclose(model.get_grid(), reference.get_grid())
+
+    def test_single_precision_convolution(self, fi_model):
+        """Single precision kernels give a single precision spectrum and result."""
+        kernel = fi_model.get_con_nhood().astype(np.float32)
+        assert kernel_spectrum(kernel, (64, 64)).dtype == np.complex64
+        grid = np.random.default_rng(4).random((64, 64)).astype(np.float32)
+        convolver = Convolver('fft')
+        result = convolver.convolve(grid, kernel, fi_model.get_con_nhood_key())
+        assert result.dtype == np.float32
+
+        # Same key, other dtype: a separate spectrum
+        expected = convolver.convolve(grid.astype(np.float64), fi_model.get_con_nhood(),
+                                      fi_model.get_con_nhood_key())
+        assert convolver.spectrum_builds == 2
+        assert np.allclose(result, expected, atol=1e-5)
+
+        out = np.empty_like(grid)
+        convolver.convolve(grid, kernel, fi_model.get_con_nhood_key(), out=out)
+        assert np.allclose(out, result, atol=1e-6)
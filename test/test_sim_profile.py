@@ -0,0 +1,112 @@
+import pstats
+import threading
+import tracemalloc
+import pytest
+from src.sim.sim_profile import ProfileCapture, capture_name
+from src.sim.sim_controller import SimController
+from test.test_sim_worker import StubFiController, StubRoot, StubUsController, StubView
+
+
+def profiled_calls(path, name):
+    """Return the number of calls of the functions called name in a pstats file."""
+    return sum(value[1] for key, value in pstats.Stats(str(path)).stats.items() if key[2] == name)
+
+
+def work(size):
+    return [0] * size
+
+
+def display(size):
+    return [1] * size
+
+
+class TestProfileCapture:
+    def test_capture_name(self):
+        """The name holds the mode, the grid size and the parameters, and is file-safe."""
+        name = capture_name('continuous', (64, 128), {'mu': 0.5, 'sigma': 0.15})
+        assert name.startswith('profile_continuous_64x128_mu0.5_sigma0.15_')
+        assert capture_name('discrete', None, {'mu': -1.0}).startswith('profile_discrete_empty_mu-1_')
+        assert '/' not in capture_name('a/b', None, {})
+
+    def test_captures_the_next_calls(self, tmp_path):
+        """Only the counted calls finish the capture, and later calls run unprofiled."""
+        capture = ProfileCapture(3, str(tmp_path), 'run')
+        assert tracemalloc.is_tracing()
+        for _ in range(3):
+            assert not capture.finished
+            capture.call(display, 10, counted=False)
+            assert capture.call(work, 10) == [0] * 10
+        assert capture.finished and not tracemalloc.is_tracing()
+        capture.call(work, 10)
+        paths = capture.save()
+        assert profiled_calls(paths['pstats'], 'work') == 3
+        assert profiled_calls(paths['pstats'], 'display') == 3
+        assert tracemalloc.Snapshot.load(paths['tracemalloc']).traces
+        assert capture.peak > 0
+
+    def test_threads_are_merged(self, tmp_path):
+        """The calls of each thread are profiled and saved in one file."""
+        capture = ProfileCapture(2, str(tmp_path), 'threads')
+        thread = threading.Thread(target=capture.call, args=(display, 10), kwargs={'counted': False})
+        thread.start()
+        thread.join()
+        capture.call(work, 10)
+        capture.call(work, 10)
+        paths = capture.save()
+        assert profiled_calls(paths['pstats'], 'display') == 1
+        assert profiled_calls(paths['pstats'], 'work') == 2
+
+    def test_tracing_left_on(self, tmp_path):
+        """Tracing started before the capture is not stopped by it."""
+        tracemalloc.start()
+        try:
+            capture = ProfileCapture(1, str(tmp_path), 'traced')
+            capture.call(work, 10)
+            assert capture.finished and tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_invalid(self, tmp_path):
+        """A capture needs one call before it can be saved."""
+        with pytest.raises(ValueError):
+            ProfileCapture(0)
+        capture = ProfileCapture(1, str(tmp_path))
+        with pytest.raises(ValueError):
+            capture.save()
+        capture.finish()
+        with pytest.raises(ValueError):
+            capture.save()
+        assert not tracemalloc.is_tracing()
+
+
+class TestSimControllerProfile:
+    def test_requested_capture(self, tmp_path):
+        """A requested capture profiles the next steps and displays, then turns off."""
+        us_controller = StubUsController(60.0)
+        controller = SimController(StubView(), StubRoot(), us_controller, StubFiController(0),
+                                   profile_dir=str(tmp_path))
+        controller.reset()
+        us_controller.model.profile_request = 2
+        controller.update()
+        assert controller.profile is not None and us_controller.profile_text.startswith("Profiling")
+        for _ in range(3):
+            controller.step(1)
+            controller.worker.generation += 1
+            controller.update()
+        assert controller.profile is None and not tracemalloc.is_tracing()
+        pstats_files = list(tmp_path.glob('profile_discrete_*.pstats'))
+        assert len(pstats_files) == 1 and len(list(tmp_path.glob('*.tracemalloc'))) == 1
+        assert profiled_calls(pstats_files[0], '_step') == 2
+        assert profiled_calls(pstats_files[0], 'update_display') >= 1
+        assert str(pstats_files[0]) in us_controller.profile_text
+
+    def test_stop_cancels_capture(self, tmp_path):
+        """Stopping the controller during a capture turns it off without files."""
+        controller = SimController(StubView(), StubRoot(), StubUsController(60.0), StubFiController(0),
+                                   profile_dir=str(tmp_path))
+        controller.reset()
+        controller.start_profile(5)
+        controller.step(1)
+        controller.stop()
+        assert controller.profile is None and not tracemalloc.is_tracing()
+        assert not list(tmp_path.iterdir())
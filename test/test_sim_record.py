@@ -0,0 +1,180 @@
+import os
+import sys
+import numpy as np
+import pytest
+from src.sim.sim_record import TrajectoryRecorder, TrajectoryReplayer, read_header
+from src.sim.sim_replay import ReplayController
+from src.sim.sim_model import SimModel
+from src.fi.fi_model import FiModel
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC_PATH)
+
+import headless  # pylint: disable=C0413
+
+
+class StubRoot:
+    """Tk root replacement recording the scheduled delays."""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(delay)
+        return len(self.scheduled)
+
+    def after_cancel(self, timer):
+        pass
+
+
+class StubView:
+    """SimView replacement recording the displayed grids."""
+    def __init__(self):
+        self.frames = []
+
+    def update_display(self, grid, pooling=None):
+        self.frames.append(np.array(grid))
+
+
+def record_frames(path, count, shape=(6, 8), **kwargs):
+    """Record count frames filled with their index."""
+    with TrajectoryRecorder(str(path), shape, **kwargs) as recorder:
+        for index in range(count):
+            recorder.append(np.full(shape, index))
+
+
+class TestTrajectoryRecorder:
+    def test_round_trip(self, tmp_path):
+        """Frames and metadata are read back as written."""
+        path = tmp_path / 'run.traj'
+        grids = np.random.default_rng(0).random((5, 12, 9))
+        with TrajectoryRecorder(str(path), (12, 9), metadata={'mode': 'continuous', 'fi': {'mu': 0.5}}) as recorder:
+            for grid in grids:
+                recorder.append(grid)
+
+        with TrajectoryReplayer(str(path)) as replayer:
+            assert len(replayer) == 5 and replayer.shape == (12, 9)
+            assert replayer.metadata == {'mode': 'continuous', 'fi': {'mu': 0.5}}
+            assert isinstance(replayer.frame(2), np.memmap)
+            assert np.array_equal(replayer[-1], grids[-1])
+            assert np.array_equal(np.stack(list(replayer.frames())), grids)
+            with pytest.raises(IndexError):
+                replayer.frame(5)
+
+    def test_file_grows_and_is_truncated(self, tmp_path):
+        """The preallocated file doubles when full and keeps only the recorded frames."""
+        path = tmp_path / 'run.traj'
+        record_frames(path, 11, dtype=np.uint8, capacity=4)
+        _, count, offset = read_header(str(path))
+        assert count == 11
+        assert os.path.getsize(path) == offset + 11 * 6 * 8
+        replayer = TrajectoryReplayer(str(path))
+        assert [frame[0, 0] for frame in replayer.frames(1, None, 3)] == [1, 4, 7, 10]
+
+    def test_every_kth_generation(self, tmp_path):
+        """Only the generations multiple of every are stored."""
+        path = tmp_path / 'run.traj'
+        recorder = TrajectoryRecorder(str(path), (2, 2), every=3)
+        stored = [recorder.record(np.full((2, 2), generation)) for generation in range(1, 10)]
+        assert stored == [False, False, True] * 3
+        assert recorder.pending() == 3
+        recorder.close()
+        replayer = TrajectoryReplayer(str(path))
+        assert [frame[0, 0] for frame in replayer.frames()] == [3, 6, 9]
+        assert replayer.generation(2) == 6
+
+    def test_recording_in_progress_is_readable(self, tmp_path):
+        """A replayer sees the frames recorded so far, and the new ones after refresh."""
+        path = tmp_path / 'run.traj'
+        recorder = TrajectoryRecorder(str(path), (3, 3), capacity=2)
+        recorder.append(np.zeros((3, 3)))
+        replayer = TrajectoryReplayer(str(path))
+        assert len(replayer) == 1
+        recorder.append(np.ones((3, 3)))
+        recorder.append(np.ones((3, 3)))
+        assert replayer.refresh() == 3
+        recorder.close()
+
+    def test_invalid_input(self, tmp_path):
+        """Wrong shapes, settings and files are rejected."""
+        recorder = TrajectoryRecorder(str(tmp_path / 'run.traj'), (3, 3))
+        with pytest.raises(ValueError):
+            recorder.append(np.zeros((3, 4)))
+        recorder.close()
+        with pytest.raises(ValueError):
+            recorder.append(np.zeros((3, 3)))
+        with pytest.raises(ValueError):
+            TrajectoryRecorder(str(tmp_path / 'other.traj'), (3, 3), every=0)
+        (tmp_path / 'bad.traj').write_bytes(b'not a trajectory')
+        with pytest.raises(ValueError):
+            TrajectoryReplayer(str(tmp_path / 'bad.traj'))
+
+
+class TestSimModelRecording:
+    @pytest.mark.parametrize("engine", ['convolution', 'bitboard'])
+    def test_batched_generations_are_recorded(self, tmp_path, engine):
+        """Generations computed in one batch are all recorded, as discrete uint8 frames."""
+        fi_model = FiModel()
+        args = (fi_model.growth_gol, fi_model.get_dis_nhood(), 1, fi_model.get_dis_nhood_key(), ('gol',))
+        grid = (np.random.default_rng(1).random((32, 32)) < 0.3).astype(np.int8)
+        reference, recorded = SimModel(), SimModel()
+        recorded.set_engine(engine)
+        reference.grid, recorded.grid = grid, grid
+
+        recorded.start_recording(str(tmp_path / 'run.traj'), every=4)
+        recorded.update(*args, generations=13)
+        recorded.stop_recording()
+
+        replayer = TrajectoryReplayer(str(tmp_path / 'run.traj'))
+        assert len(replayer) == 4 and replayer.dtype == np.uint8
+        for index, frame in enumerate(replayer.frames()):
+            assert np.array_equal(frame, reference.get_grid())
+            for _ in range(4):
+                reference.update(*args)
+
+    def test_headless_record(self, tmp_path):
+        """The headless runner records the run with its parameters."""
+        path = str(tmp_path / 'run.traj')
+        result = headless.run(10, continuous=True, pattern=1, record=path, record_every=5)
+        replayer = TrajectoryReplayer(path)
+        assert len(replayer) == 3 and replayer.dtype == np.float64
+        assert replayer.metadata['mode'] == 'continuous'
+        assert replayer.metadata['fi']['growth_mu'] == 0.15
+        assert np.array_equal(replayer[-1], result['grid'])
+
+
+class TestReplayController:
+    @pytest.fixture
+    def replayer(self, tmp_path):
+        """Create a trajectory of 10 frames filled with their index."""
+        record_frames(tmp_path / 'run.traj', 10, dtype=np.uint8)
+        return TrajectoryReplayer(str(tmp_path / 'run.traj'))
+
+    def test_stride_and_rate(self, replayer):
+        """Frames are shown every stride at the requested rate, then playback stops."""
+        root, view = StubRoot(), StubView()
+        controller = ReplayController(view, root, replayer, fps=50, stride=4)
+        controller.run()
+        for _ in range(5):
+            controller.update()
+        assert [frame[0, 0] for frame in view.frames] == [0, 4, 8]
+        assert controller.paused
+        assert set(root.scheduled) == {20}
+
+    def test_loop_backwards(self, replayer):
+        """A negative stride plays backwards and wraps around when looping."""
+        view = StubView()
+        controller = ReplayController(view, StubRoot(), replayer, stride=-3, loop=True)
+        controller.seek(1)
+        for _ in range(3):
+            controller.update()
+        assert [frame[0, 0] for frame in view.frames] == [1, 8, 5, 2]
+
+    def test_pause_and_seek(self, replayer):
+        """A paused playback stays on its frame, seek is clamped to the recording."""
+        view = StubView()
+        controller = ReplayController(view, StubRoot(), replayer)
+        controller.toggle_pause()
+        controller.update()
+        assert not view.frames
+        controller.seek(42)
+        assert controller.index == 9 and view.frames[-1][0, 0] == 9
@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+from matplotlib import colormaps
+from src.sim.sim_render import RasterRenderer, colormap_lut, downsample, fit_size, to_ppm
+
+class TestRasterRenderer:
+    @pytest.fixture
+    def renderer(self):
+        """Create a renderer with the colors of SimView."""
+        return RasterRenderer('inferno', vmin=0, vmax=1)
+
+    def test_lut(self):
+        """The lookup table holds the 256 colors of the colormap."""
+        lut = colormap_lut('inferno')
+        assert lut.shape == (256, 3) and lut.dtype == np.uint8
+        assert np.array_equal(lut[-1], np.round(np.array(colormaps['inferno'](1.0)[:3]) * 255))
+
+    def test_matches_matplotlib_colors(self, renderer):
+        """Every cell gets the color imshow would give it, row 0 at the bottom."""
+        grid = np.random.default_rng(0).random((40, 60))
+        grid[0, 0], grid[1, 1], grid[2, 2] = -0.5, 1.0, 2.0
+        image = renderer.render(grid, (60, 40))
+        expected = np.round(colormaps['inferno'](np.clip(grid, 0, 1))[::-1, :, :3] * 255)
+        assert np.array_equal(image, expected)
+
+    def test_discrete_grid(self, renderer):
+        """Dead and alive cells of an int8 grid map to the ends of the colormap."""
+        grid = np.array([[0, 1]], dtype=np.int8)
+        image = renderer.render(grid, (2, 1))
+        assert np.array_equal(image[0], renderer.lut[[0, 255]])
+
+    def test_upscale_is_nearest(self, renderer):
+        """Zooming turns every cell into a block of identical pixels."""
+        grid = np.random.default_rng(1).random((5, 7))
+        image = renderer.render(grid, (21, 15)).copy()
+        small = renderer.render(grid, (7, 5))
+        assert np.array_equal(image, small.repeat(3, axis=0).repeat(3, axis=1))
+
+    def test_fit_size(self):
+        """The image keeps the grid aspect ratio inside the canvas."""
+        assert fit_size((100, 100), (800, 600)) == (600, 600)
+        assert fit_size((50, 200), (800, 600)) == (800, 200)
+        assert fit_size((1000, 10), (5, 5)) == (1, 5)
+
+    def test_ppm(self):
+        """The PPM header is followed by the raw RGB bytes."""
+        rgb = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+        assert to_ppm(rgb) == b"P6 3 2 255 " + rgb.tobytes()
+
+
+class TestLevelOfDetail:
+    @pytest.fixture
+    def renderer(self):
+        """Create a renderer with the colors of SimView."""
+        return RasterRenderer('inferno', vmin=0, vmax=1)
+
+    @pytest.mark.parametrize("pooling, reduce", [('max', np.max), ('mean', np.mean)])
+    @pytest.mark.parametrize("shape, out_shape", [((64, 96), (16, 24)), ((100, 70), (30, 33))])
+    def test_downsample_blocks(self, pooling, reduce, shape, out_shape):
+        """Each output cell pools one block, even for non-integer ratios."""
+        grid = np.random.default_rng(2).random(shape)
+        pooled = downsample(grid, out_shape, pooling)
+        assert pooled.shape == out_shape
+        row_edges = np.append(np.arange(out_shape[0]) * shape[0] // out_shape[0], shape[0])
+        col_edges = np.append(np.arange(out_shape[1]) * shape[1] // out_shape[1], shape[1])
+        for i in range(out_shape[0]):
+            for j in range(out_shape[1]):
+                block = grid[row_edges[i]:row_edges[i + 1], col_edges[j]:col_edges[j + 1]]
+                assert pooled[i, j] == pytest.approx(reduce(block))
+
+    def test_max_keeps_single_cells(self, renderer):
+        """A lone live cell of a large discrete grid is still drawn."""
+        grid = np.zeros((1024, 1024), dtype=np.int8)
+        grid[500, 700] = 1
+        pooled = renderer.pool(grid, (128, 128))
+        assert pooled.shape == (128, 128) and pooled.sum() == 1
+        assert renderer.pool(grid.astype(float), (128, 128)).max() == pytest.approx(1 / 64)
+
+    def test_small_grid_is_not_pooled(self, renderer):
+        """Grids that fit the viewport are drawn as they are."""
+        grid = np.random.default_rng(3).random((50, 80))
+        assert renderer.pool(grid, (80, 50)) is grid
+        assert renderer.pool(grid, (60, 200)).shape == (50, 60)
+
+    def test_cache_per_viewport(self, renderer):
+        """The same grid and viewport reuse the pooled grid and the image."""
+        grid = np.random.default_rng(4).random((512, 512))
+        first = renderer.pool(grid, (100, 100))
+        assert renderer.pool(grid, (100, 100)) is first
+        assert renderer.pool(grid, (120, 100)) is not first
+        assert renderer.pool(grid.copy(), (120, 100)) is not first
+
+        image = renderer.render(grid, (64, 64)).copy()
+        renderer._levels[...] = 0   # A cache hit does not recompute the image
+        assert np.array_equal(renderer.render(grid, (64, 64)), image)
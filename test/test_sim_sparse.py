@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from src.sim.sim_sparse import SparseEngine
+from src.sim.sim_hashlife import HashLifeEngine
+from src.sim.sim_model import SimModel
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+
+
+class TestSparseEngine:
+    @pytest.fixture
+    def soup(self):
+        """Return a random soup in the middle of an empty grid."""
+        grid = np.zeros((120, 150), dtype=np.uint8)
+        grid[40:80, 50:100] = np.random.default_rng(2).random((40, 50)) < 0.35
+        return grid
+
+    @pytest.mark.parametrize("chunk_size", [8, 16, 64])
+    def test_matches_hashlife_plane(self, soup, chunk_size):
+        """The plane evolves like the HashLife plane topology, across chunk borders."""
+        sparse, hashlife = SparseEngine(chunk_size), HashLifeEngine()
+        sparse.load(soup, -21, -35)
+        hashlife.load(soup, 'plane')
+        for generations in (1, 7, 40):
+            sparse.step(generations)
+            hashlife.step(generations)
+            assert np.array_equal(sparse.window(-21, -35, *soup.shape), hashlife.to_dense())
+            assert sparse.population() == hashlife.population()
+
+    def test_glider_memory_follows_population(self):
+        """A glider far from the origin keeps a single chunk, the empty ones are freed."""
+        sparse = SparseEngine(32)
+        sparse.load(GLIDER)
+        sparse.step(4 * 500)
+        assert sparse.bounding_box() == (500, 500, 3, 3)
+        assert len(sparse.chunks) <= 4 and sparse.nbytes() <= 4 * 32 * 32
+        assert np.array_equal(sparse.window(500, 500, 3, 3), GLIDER)
+
+    def test_dying_pattern_frees_chunks(self):
+        """A pattern that dies leaves an empty plane."""
+        sparse = SparseEngine(4)
+        grid = np.zeros((4, 8), dtype=np.uint8)
+        grid[1, 3:5] = 1
+        sparse.load(grid)
+        assert len(sparse.chunks) == 2
+        sparse.step()
+        assert sparse.chunks == {} and sparse.bounding_box() is None
+        sparse.step(3)
+        assert sparse.generation == 4
+
+    def test_paste_and_window(self):
+        """Pasting overwrites a rectangle, windows read anywhere, with negative coordinates."""
+        sparse = SparseEngine(8)
+        sparse.paste(np.ones((5, 5), dtype=np.uint8), -3, -3)
+        assert len(sparse.chunks) == 4 and sparse.population() == 25
+        sparse.paste(np.zeros((3, 3), dtype=np.uint8), -3, -3)
+        assert len(sparse.chunks) == 3 and sparse.population() == 16
+        window = sparse.window(-4, -4, 8, 8, np.int8)
+        assert window.dtype == np.int8 and window.sum() == 16
+        assert not window[:4, :4].any() and window[4:6, 4:6].all()
+
+
+class TestSimModelSparse:
+    def test_gun_is_not_destroyed(self):
+        """Gliders leave the viewport of the sparse engine instead of wrapping onto the gun."""
+        model = SimModel(width=60, height=60)
+        model.planner()
+        model.set_engine('sparse')
+        gun = model.get_grid().copy()
+        model.update(None, None, 1, generations=600)
+        # The gun has period 30: the grid near the gun is back to its initial state
+        assert np.array_equal(model.get_grid()[:30, :30], gun[:30, :30])
+        assert model.sparse.population() > gun.sum() + 15 * 5
+        assert model.get_grid().shape == gun.shape and model.get_grid().dtype == gun.dtype
+
+    def test_window_and_viewport(self):
+        """Windows come from the plane with the sparse engine and wrap with the others."""
+        model = SimModel(width=20, height=20)
+        model.reset_discrete('glider')
+        start = model.get_grid().copy()
+        assert np.array_equal(model.get_window(-5, -5, 10, 10), np.roll(start, (5, 5), axis=(0, 1))[:10, :10])
+
+        model.set_engine('sparse')
+        model.update(None, None, 1, generations=4 * 30)
+        assert model.get_grid().sum() == 0
+        assert model.get_window(38, 38, 3, 3).sum() == 5
+        model.set_viewport(30, 30)
+        assert model.get_grid().shape == (20, 20) and model.get_grid().sum() == 5
+        model.update(None, None, 1, generations=4)
+        assert np.array_equal(model.get_window(39, 39, 3, 3), GLIDER)
+        model.set_engine('bitboard')
+        with pytest.raises(ValueError):
+            model.set_viewport(0, 0)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from src.sim.sim_tiles import TiledEngine
+from src.sim.sim_model import SimModel
+from src.fi.fi_model import FiModel
+
+class TestTiledEngine:
+    @pytest.fixture
+    def fi_model(self):
+        """Create an instance of FiModel providing the rules."""
+        return FiModel()
+
+    @pytest.mark.parametrize("shape, tile_size", [((100, 100), 32), ((64, 48), 16), ((30, 70), 8)])
+    def test_discrete_matches_convolution(self, shape, tile_size, fi_model):
+        """The tiled engine is exact for the Game of Life, including the wrap."""
+        grid = (np.random.default_rng(4).random(shape) < 0.3).astype(np.int8)
+        reference = SimModel()
+        reference.grid = grid
+        tiled = SimModel(tile_size=tile_size)
+        tiled.set_engine('tiled')
+        tiled.grid = grid
+
+        for _ in range(80):
+            for model in (reference, tiled):
+                model.update(fi_model.growth_gol, fi_model.get_dis_nhood(), 1,
+                             fi_model.get_dis_nhood_key(), ('gol',))
+            assert np.array_equal(reference.get_grid(), tiled.get_grid())
+
+    def test_stable_regions_are_skipped(self, fi_model):
+        """Tiles far from any change are not recomputed."""
+        grid = np.zeros((128, 128), dtype=np.int8)
+        grid[10, 10:13] = 1          # Blinker, period 2
+        grid[100:102, 100:102] = 1   # Block, still life
+        engine = TiledEngine(tile_size=16)
+
+        for _ in range(5):
+            grid = engine.advance(grid, fi_model.growth_gol, fi_model.get_dis_nhood(), 1, 'gol')
+        assert engine.total_tiles == 64
+        # Only the blinker's tile and its neighbors stay active
+        assert engine.active_tiles == 9
+
+    def test_continuous_matches_convolution(self, fi_model):
+        """Lenia steps with the wide kernel match the convolution engine."""
+        reference = SimModel()
+        tiled = SimModel(tile_size=24)
+        tiled.set_engine('tiled')
+        reference.orbium()
+        tiled.orbium()
+        key = fi_model.get_con_nhood_key()
+        for _ in range(10):
+            for model in (reference, tiled):
+                model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                             key, fi_model.get_growth_key())
+        assert np.allclose(reference.get_grid(), tiled.get_grid(), atol=1e-9)
+        active, total = tiled.get_active_tiles()
+        assert 0 < active < total
+
+    def test_rule_change_activates_all_tiles(self, fi_model):
+        """Changing the growth parameters recomputes every tile."""
+        model = SimModel(tile_size=16)
+        model.set_engine('tiled')
+        model.orbium()
+        for _ in range(3):
+            model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                         fi_model.get_con_nhood_key(), fi_model.get_growth_key())
+        fi_model.set_growth_params(g_mu=0.2)
+        model.update(fi_model.growth_lenia, fi_model.get_con_nhood(), 0.1,
+                     fi_model.get_con_nhood_key(), fi_model.get_growth_key())
+        active, total = model.get_active_tiles()
+        assert active == total
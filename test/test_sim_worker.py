@@ -0,0 +1,238 @@
+import time
+import pytest
+import numpy as np
+from src.sim.sim_worker import MAX_GENERATIONS, FrameSlot, SimWorker
+from src.sim.sim_controller import SimController
+from src.sim.sim_model import SimModel
+from src.fi.fi_model import FiModel
+
+
+class StubRoot:
+    """Tk root replacement recording the scheduled callbacks."""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(delay)
+        return len(self.scheduled)
+
+    def after_cancel(self, timer):
+        pass
+
+
+class StubView:
+    """SimView replacement recording the displayed grids."""
+    def __init__(self):
+        self.frames = []
+
+    def update_display(self, grid, pooling=None):
+        self.frames.append(grid)
+
+
+class StubUsModel:
+    def __init__(self):
+        self.needs_reset = False
+        self.seek_request = None
+        self.profile_request = None
+
+    def acknowledge_reset(self):
+        was_reset, self.needs_reset = self.needs_reset, False
+        return was_reset
+
+    def acknowledge_seek(self):
+        request, self.seek_request = self.seek_request, None
+        return request
+
+    def acknowledge_profile(self):
+        request, self.profile_request = self.profile_request, None
+        return request
+
+
+class StubUsController:
+    """UsController replacement without widgets."""
+    def __init__(self, speed):
+        self.model = StubUsModel()
+        self.speed = speed
+        self.running = True
+        self.continuous = False
+        self.generation = None
+
+    def get_speed(self):
+        return self.speed
+
+    def is_running(self):
+        return self.running
+
+    def is_mode_continuous(self):
+        return self.continuous
+
+    def show_generation(self, generation, period=None):
+        self.generation = generation
+        self.period = period
+
+    def pause(self):
+        self.running = False
+
+    def get_numeric_value(self):
+        return 0
+
+    def get_generations_per_frame(self):
+        return 1
+
+    def is_adaptive_generations(self):
+        return False
+
+    def is_metrics_shown(self):
+        return False
+
+    def show_metrics(self, text):
+        self.metrics_text = text
+
+    def show_profile(self, text):
+        self.profile_text = text
+
+
+class StubFiController:
+    """FiController replacement with a slow Game of Life rule."""
+    def __init__(self, delay):
+        self.model = FiModel()
+        self.delay = delay
+
+    def get_growth_fct(self):
+        def slow_growth(u):
+            time.sleep(self.delay)
+            return self.model.growth_gol(u)
+        return slow_growth
+
+    def get_nhood(self):
+        return self.model.get_dis_nhood()
+
+    def get_nhood_key(self):
+        return self.model.get_dis_nhood_key()
+
+    def get_nhood_with_key(self):
+        return self.get_nhood(), self.get_nhood_key()
+
+    def get_growth_key(self):
+        return ('gol',)
+
+    def get_step(self):
+        return 1
+
+
+class TestFrameSlot:
+    def test_latest_frame_wins(self):
+        """Only the newest frame is taken, older ones are counted as dropped."""
+        slot = FrameSlot()
+        assert slot.take() is None
+        for generation in range(1, 4):
+            slot.publish(np.full(2, generation), generation)
+        generation, frame = slot.take()
+        assert generation == 3 and frame[0] == 3
+        assert slot.take() is None
+        assert slot.published == 3 and slot.dropped == 2
+
+
+class TestSimWorker:
+    def test_rate_follows_speed(self):
+        """The worker steps at the requested rate, independently of the consumer."""
+        counter = iter(range(1, 10**6))
+        worker = SimWorker(lambda generations: np.array([next(counter)]), lambda: 50.0, lambda: True)
+        worker.start()
+        time.sleep(0.4)
+        worker.stop()
+        # 20 generations expected in 0.4 s at 50 gen/s
+        assert 12 <= worker.generation <= 24
+        assert worker.slot.take()[0] == worker.generation
+
+    def test_paused_worker_does_not_step(self):
+        """No generation is computed while the simulation is stopped."""
+        worker = SimWorker(lambda generations: np.zeros(1), lambda: 1000.0, lambda: False)
+        worker.start()
+        time.sleep(0.05)
+        worker.stop()
+        assert worker.generation == 0
+        assert worker.slot.take() is None
+
+    def test_restart_publishes_generation_zero(self):
+        """A reset grid replaces the pending frame as generation 0."""
+        worker = SimWorker(lambda generations: np.zeros(1), lambda: 60.0, lambda: True)
+        worker.generation = 7
+        worker.slot.publish(np.zeros(1), 7)
+        worker.restart(np.ones(1))
+        generation, frame = worker.slot.take()
+        assert generation == 0 and frame[0] == 1 and worker.generation == 0
+
+
+class TestGenerationsPerFrame:
+    def test_fixed_batch(self):
+        """Each frame carries the requested number of generations."""
+        batches = []
+        def step(generations):
+            batches.append(generations)
+            return np.zeros(1)
+        worker = SimWorker(step, lambda: 100.0, lambda: True, lambda: 25)
+        worker.start()
+        time.sleep(0.1)
+        worker.stop()
+        assert batches and set(batches) == {25}
+        assert worker.generation == 25 * len(batches)
+        assert worker.slot.take()[0] == worker.generation
+
+    def test_adaptive_batch_fills_frame(self):
+        """In adaptive mode the batch fits the frame time from the measured step time."""
+        def step(generations):
+            time.sleep(generations * 0.0002)
+            return np.zeros(1)
+        worker = SimWorker(step, lambda: 20.0, lambda: True, lambda: 1, lambda: True)
+        worker.start()
+        time.sleep(0.5)
+        worker.stop()
+        # 0.8 * 50 ms frame / 0.2 ms per generation = 200 generations
+        assert 100 <= worker.last_generations <= 220
+        assert worker.step_time == pytest.approx(0.0002, rel=0.5)
+
+    def test_adaptive_batch_size(self):
+        """The batch is at least one generation and at most MAX_GENERATIONS."""
+        worker = SimWorker(lambda generations: np.zeros(1), lambda: 60.0, lambda: True,
+                           lambda: 5, lambda: True)
+        assert worker.batch_size(60.0) == 1
+        worker.step_time = 1.0
+        assert worker.batch_size(60.0) == 1
+        worker.step_time = 1e-12
+        assert worker.batch_size(60.0) == MAX_GENERATIONS
+        worker.step_time = 1e-4
+        assert worker.batch_size(10.0) == 800
+
+    @pytest.mark.parametrize("engine", ['convolution', 'bitboard', 'hashlife', 'tiled', 'buffered'])
+    def test_model_batch_matches_single_steps(self, engine):
+        """Advancing n generations at once gives the grid of n single updates."""
+        fi_model = FiModel()
+        grid = (np.random.default_rng(5).random((64, 64)) < 0.3).astype(np.int8)
+        reference, batched = SimModel(), SimModel()
+        batched.set_engine(engine)
+        reference.grid, batched.grid = grid, grid
+        args = (fi_model.growth_gol, fi_model.get_dis_nhood(), 1, fi_model.get_dis_nhood_key(), ('gol',))
+        for _ in range(13):
+            reference.update(*args)
+        batched.update(*args, generations=13)
+        assert np.array_equal(reference.get_grid(), batched.get_grid())
+
+
+class TestSimControllerWorker:
+    def test_slow_step_does_not_block_display(self):
+        """The display callback returns at once while slow steps run in the background."""
+        root, view = StubRoot(), StubView()
+        controller = SimController(view, root, StubUsController(120.0), StubFiController(0.05))
+        controller.run()
+        try:
+            time.sleep(0.3)
+            start = time.perf_counter()
+            controller.update()
+            assert time.perf_counter() - start < 0.04
+        finally:
+            controller.stop()
+        # About 6 steps of 50 ms were computed, each shown at most once
+        assert 0 < controller.worker.generation < 10
+        assert all(delay == controller.min_delay for delay in root.scheduled)
+        assert len(view.frames) == 2   # Reset grid, then the latest generation
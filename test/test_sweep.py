@@ -0,0 +1,73 @@
+import csv
+import os
+import sys
+import numpy as np
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC_PATH)
+
+import sweep  # pylint: disable=C0413
+
+
+def read_rows(path):
+    """Return the rows of a result file."""
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+class TestSweep:
+    def test_parameter_grid(self):
+        """The grid holds every combination, with defaults for missing parameters."""
+        points = sweep.parameter_grid({'growth_mu': [0.1, 0.2], 'growth_sigma': [0.01, 0.02, 0.03]})
+        assert len(points) == 6
+        assert all(point['mu'] == 0.5 and point['sigma'] == 0.15 for point in points)
+        assert {(point['growth_mu'], point['growth_sigma']) for point in points} == \
+            {(mu, sigma) for mu in [0.1, 0.2] for sigma in [0.01, 0.02, 0.03]}
+
+    def test_random_sample(self):
+        """Samples stay in their ranges and are reproducible with a seed."""
+        points = sweep.random_sample({'mu': [0.4, 0.6], 'sigma': [0.1]}, 50, seed=2)
+        assert len(points) == 50
+        assert all(0.4 <= point['mu'] <= 0.6 and point['sigma'] == 0.1 for point in points)
+        assert points == sweep.random_sample({'mu': [0.4, 0.6], 'sigma': [0.1]}, 50, seed=2)
+        with pytest.raises(ValueError):
+            sweep.random_sample({'mu': [0.1, 0.2, 0.3]}, 5)
+
+    def test_centroid_wraps(self):
+        """A pattern across the border has its centroid on the border."""
+        grid = np.zeros((20, 30))
+        grid[0, 5] = grid[19, 5] = 1
+        grid[10, 0] = grid[10, 29] = 0   # No effect on the mass
+        row, col = sweep.centroid(grid)
+        assert min(row, 20 - row) == pytest.approx(0.5)
+        assert col == pytest.approx(5)
+
+    def test_run_point_statuses(self):
+        """Runs stop early when the mass dies out or explodes."""
+        point = dict(sweep.DEFAULTS)
+        alive = sweep.run_point(point, generations=30)
+        assert alive['status'] == 'alive' and alive['survival'] == 30
+        assert 0.5 < alive['mass_ratio'] < 2 and alive['drift'] > 0
+
+        died = sweep.run_point(dict(point, growth_mu=0.6), generations=100)
+        assert died['status'] == 'died' and died['survival'] < 100
+
+        exploded = sweep.run_point(dict(point, growth_mu=0.5, growth_sigma=1.0), generations=200)
+        assert exploded['status'] == 'exploded' and exploded['survival'] < 200
+
+    def test_resume(self, tmp_path):
+        """A sweep streams one row per point and skips the points already done."""
+        output = str(tmp_path / 'sweep.csv')
+        points = sweep.parameter_grid({'growth_mu': [0.14, 0.15, 0.16]})
+        first = sweep.sweep(points[:2], output, workers=2, generations=5)
+        assert len(first) == 2 and len(read_rows(output)) == 2
+
+        # An interrupted write leaves a partial row, dropped on resume
+        with open(output, 'a', encoding='utf-8') as file:
+            file.write(sweep.point_key(points[2], 1) + ',1,0.5')
+        second = sweep.sweep(points, output, workers=2, generations=5)
+        assert [row['key'] for row in second] == [sweep.point_key(points[2], 1)]
+        rows = read_rows(output)
+        assert sorted(row['key'] for row in rows) == sorted(sweep.point_key(point, 1) for point in points)
+        assert sweep.sweep(points, output, workers=2, generations=5) == []
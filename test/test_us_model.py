@@ -137,4 +137,45 @@ class TestUsModel:
         assert model.needs_reset == False
         
         # A second call should return False
-        assert model.acknowledge_reset() == False 
\ No newline at end of file
+        assert model.acknowledge_reset() == False 
+    def test_generations_per_frame(self, model):
+        """Test the generations per frame setting and the adaptive switch."""
+        assert model.get_generations_per_frame() == 1
+        assert model.adaptive_generations == False
+
+        model.set_generations_per_frame("25")
+        assert model.get_generations_per_frame() == 25
+        model.set_generations_per_frame(4.0)
+        assert model.get_generations_per_frame() == 4
+
+        # Invalid and non-positive values are ignored
+        for value in ["abc", "", None, 0, -3]:
+            model.set_generations_per_frame(value)
+            assert model.get_generations_per_frame() == 4
+
+        model.toggle_adaptive_generations()
+        assert model.adaptive_generations == True
+        model.toggle_adaptive_generations()
+        assert model.adaptive_generations == False
+
+    def test_seek_request(self, model):
+        """Test the history seek request and its acknowledgement."""
+        assert model.acknowledge_seek() is None
+
+        model.request_seek('step', -1)
+        assert model.acknowledge_seek() == ('step', -1)
+        assert model.acknowledge_seek() is None
+
+        model.request_seek('generation', "120")
+        model.request_seek('generation', "abc")  # Invalid, keeps the request
+        assert model.acknowledge_seek() == ('generation', 120)
+
+    def test_profile_request(self, model):
+        """Test the profile capture request and its acknowledgement."""
+        assert model.acknowledge_profile() is None
+
+        model.request_profile("50")
+        model.request_profile("abc")  # Invalid, keeps the request
+        model.request_profile(0)      # Below 1, keeps the request
+        assert model.acknowledge_profile() == 50
+        assert model.acknowledge_profile() is None